@@ -6,7 +6,17 @@ import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv, find_dotenv
 from backend.auth import ensure_session, login, register, logout
-from backend.db import supa
+from backend.db import DatabaseUnavailable, read, read_all
+from backend.cache import cached
+from backend.changefeed import change_feed
+from backend.sessions import prewarm, save_warm_keys
+from backend.picksync import pick_sync
+from backend.profiler import profile_run, profiling_enabled
+from backend.frames import PICKS_DTYPES, RESULTS_DTYPES, SPREADS_DTYPES, compact, session_view
+from backend.consensus import consensus_label, fetch_consensus
+from backend.grid import fetch_grid, grid_styles
+from backend.records import fetch_team_records
+from backend.projection import SEASON_WEEKS, default_workers, load_week_inputs, simulate
 from supabase import create_client
 
 # ---------- Page setup ----------
@@ -24,6 +34,12 @@ if missing:
 # Initialize session keys
 ensure_session()
 
+# Subscribe to table changes once per process so cached reads stay fresh
+change_feed()
+
+# Warm this replica's cache with the reads other replicas had warm
+prewarm()
+
 # ---------- Auth UI ----------
 def auth_ui():
     login_tab, register_tab = st.tabs(["Login", "Register"])
@@ -69,58 +85,55 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # ---------- Helpers ----------
+@cached("spreads", week_arg=None)
 def get_max_available_week():
-    resp = supabase.table("spreads").select("nfl_week").execute()
-    if not resp.data:
-        return 1
-    weeks = [row["nfl_week"] for row in resp.data if row.get("nfl_week")]
-    return max(weeks) if weeks else 1
+    resp = read(
+        supabase.table("spreads").select("nfl_week")
+        .not_.is_("nfl_week", "null")
+        .order("nfl_week", desc=True).limit(1)
+    )
+    return resp.data[0]["nfl_week"] if resp.data else 1
 
+@cached("spreads")
 def fetch_spreads(week):
-    data = (
+    data = read(
         supabase.table("spreads")
-        .select("date, time, away_team, spread, home_team, over_under")
+        .select("game_id, season_year, date, time, away_team, spread, home_team, over_under, underdog, underdog_points, lock_at")
         .eq("nfl_week", week)
         .order("date", desc=False)
         .order("time", desc=False)
-        .execute()
+        .order("game_id")  # same tie order as the week_grid RPC
     )
     return data.data or []
 
+@cached("spreads")
+def fetch_spreads_frame(week):
+    return compact(fetch_spreads(week), SPREADS_DTYPES)
+
+@cached("users")
 def fetch_users():
-    resp = supabase.table("users").select("id, entry_abbreviation").order("entry_abbreviation").execute()
+    resp = read(supabase.table("users").select("id, entry_abbreviation").order("entry_abbreviation"))
     return {u["id"]: u["entry_abbreviation"] for u in resp.data} if resp.data else {}
 
 
+@cached("picks", week_arg=None)  # every week's picks; a change-feed miss reads only what changed
 def fetch_picks_for_week(week):
-    resp = (
-        supabase.table("picks")
-        .select("user_id, type, selection, game_id, submitted_at, over_under_pick, is_double, underdog_points, correct")
-        .order("submitted_at", desc=False)
-        .execute()
-    )
-    cols = ["user_id", "type", "selection", "game_id", "submitted_at", "over_under_pick", "is_double", "underdog_points", "correct"]
-    if not resp.data:
-        return pd.DataFrame(columns=cols)
-    return pd.DataFrame(resp.data)
+    rows = pick_sync("user_id, type, selection, game_id, submitted_at, over_under_pick, is_double, underdog_points, correct").refresh()
+    return compact(rows, PICKS_DTYPES)
 
+@cached("results")
 def fetch_results():
-    resp = supabase.table("results").select("game_id, ml_winner, ats_winner, ou_result").execute()
-    if not resp.data:
-        return pd.DataFrame()
-    return pd.DataFrame(resp.data)
+    rows = read_all("results", "game_id, home_score, away_score, ml_winner, ats_winner, ou_result")
+    return compact(rows, RESULTS_DTYPES)
 
+@cached("weekly_standings")
 def get_available_weeks():
-    resp = supabase.table("weekly_standings").select("week_start").order("week_start").execute()
-    if resp.error:
-        st.error(f"Supabase error: {resp.error}")
-        return []
+    resp = read(supabase.table("weekly_standings").select("week_start").order("week_start"))
     return sorted({row["week_start"] for row in resp.data})
+
+@cached("weekly_standings", week_arg="week_start")
 def fetch_standings(week_start):
-    resp = supabase.table("weekly_standings").select("*").eq("week_start", week_start).execute()
-    if resp.error:
-        st.error(f"Supabase error: {resp.error}")
-        return pd.DataFrame()
+    resp = read(supabase.table("weekly_standings").select("*").eq("week_start", week_start))
     return pd.DataFrame(resp.data)
 
 def convert_to_est(date_str, time_str):
@@ -152,8 +165,25 @@ def render_home():
     with sub_tabs[0]:
         spreads = fetch_spreads(selected_week)
         if spreads:
-            df = pd.DataFrame(spreads)
+            df = session_view(fetch_spreads_frame(selected_week))
             df["Time (EST)"] = df.apply(lambda row: convert_to_est(row["date"], row["time"]), axis=1)
+            try:
+                consensus = fetch_consensus(selected_week)
+            except DatabaseUnavailable:
+                consensus = {}
+            df["Pool"] = [
+                consensus_label(
+                    consensus.get(g["game_id"]), g["away_team"], g["home_team"],
+                    float(g["spread"]) if g.get("spread") is not None else None,
+                )
+                for g in spreads
+            ]
+            try:
+                records = fetch_team_records(spreads[0]["season_year"])
+            except DatabaseUnavailable:
+                records = {}
+            df["Away Record"] = df["away_team"].astype(str).map(records).fillna("")
+            df["Home Record"] = df["home_team"].astype(str).map(records).fillna("")
             df.rename(columns={
                 "away_team": "Away",
                 "spread": "Spread",
@@ -162,90 +192,17 @@ def render_home():
                 "date": "Date"
             }, inplace=True)
             df = df.sort_values(by=["Date", "Time (EST)"], ascending=[True, True])
-            df = df[["Date", "Time (EST)", "Away", "Spread", "Home", "O/U"]]
+            df = df[["Date", "Time (EST)", "Away", "Away Record", "Spread", "Home", "Home Record", "O/U", "Pool"]]
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
             st.warning(f"No spreads found for week {selected_week}.")
 
     # --- Grid tab ---
     with sub_tabs[1]:
-        user_map = fetch_users()
-        if user_map:
-            users = sorted(user_map.values())
-            grid_cols = ["Entry", "BB"] + [str(i) for i in range(1, 6)] \
-                        + [f"O/U {i}" for i in range(1, 4)] + ["SD", "UD", "Comments"]
-            grid_df = pd.DataFrame(columns=grid_cols)
-            grid_df["Entry"] = users
-
-            picks_df = fetch_picks_for_week(selected_week)
-            results_df = fetch_results()
-            if not results_df.empty:
-                results_df = results_df.set_index("game_id")
-            else:
-                results_df = pd.DataFrame()  # keep empty df
-
-            # fill picks into grid
-            for user_id, abbrev in user_map.items():
-                user_picks = picks_df[picks_df["user_id"] == user_id].sort_values("submitted_at")
-                ats_count, ou_count = 0, 0
-                for _, row in user_picks.iterrows():
-                    sel = row["selection"]
-                    if row["type"] == "BB":
-                        grid_df.loc[grid_df["Entry"] == abbrev, "BB"] = sel
-                    elif row["type"] == "SD":
-                        grid_df.loc[grid_df["Entry"] == abbrev, "SD"] = sel
-                    elif row["type"] == "UD":
-                        grid_df.loc[grid_df["Entry"] == abbrev, "UD"] = sel
-                    elif row["type"] == "ATS" and ats_count < 5:
-                        col = str(ats_count + 1)
-                        grid_df.loc[grid_df["Entry"] == abbrev, col] = sel
-                        ats_count += 1
-                    elif row["type"] == "OU" and ou_count < 3:
-                        col = f"O/U {ou_count + 1}"
-                        grid_df.loc[grid_df["Entry"] == abbrev, col] = row["over_under_pick"]
-                        ou_count += 1
-
-            # shading
-            def highlight(val, col_name, game_id):
-                if pd.isna(val) or val == "":
-                    return ""
-                if game_id not in results_df.index:
-                    return ""
-                result = results_df.loc[game_id]
-                if col_name.startswith("O/U"):
-                    return "background-color: #d4edda" if val == result["ou_result"] else "background-color: #f8d7da"
-                elif col_name in ["SD", "UD"]:
-                    return "background-color: #d4edda" if val == result["ml_winner"] else "background-color: #f8d7da"
-                else:  # ATS/BB
-                    return "background-color: #d4edda" if val == result["ats_winner"] else "background-color: #f8d7da"
-
-            styles = pd.DataFrame("", index=grid_df.index, columns=grid_df.columns)
-            for _, row in picks_df.iterrows():
-                abbrev = user_map.get(row["user_id"])
-                if not abbrev:
-                    continue
-                col_name = None
-                if row["type"] == "BB":
-                    col_name = "BB"
-                elif row["type"] == "SD":
-                    col_name = "SD"
-                elif row["type"] == "UD":
-                    col_name = "UD"
-                elif row["type"] == "ATS":
-                    for i in range(1, 5 + 1):
-                        if grid_df.loc[grid_df["Entry"] == abbrev, str(i)].values[0] == row["selection"]:
-                            col_name = str(i)
-                            break
-                elif row["type"] == "OU":
-                    for i in range(1, 3 + 1):
-                        if grid_df.loc[grid_df["Entry"] == abbrev, f"O/U {i}"].values[0] == row["over_under_pick"]:
-                            col_name = f"O/U {i}"
-                            break
-                if col_name:
-                    idx = grid_df.index[grid_df["Entry"] == abbrev][0]
-                    styles.loc[idx, col_name] = highlight(grid_df.loc[idx, col_name], col_name, row["game_id"])
-
-            st.dataframe(grid_df.style.apply(lambda _: styles, axis=None), use_container_width=True, hide_index=True)
+        grid_df, status_df = fetch_grid(selected_week)
+        if not grid_df.empty:
+            st.dataframe(grid_df.style.apply(lambda _: grid_styles(status_df), axis=None),
+                         use_container_width=True, hide_index=True)
         else:
             st.info("No registered users yet.")
 
@@ -272,6 +229,39 @@ def render_standings():
     else:
         st.info(f"No standings available for {selected_week}.")
 
+def render_projections():
+    st.subheader("🎲 Projections")
+    week = get_max_available_week()
+    scenarios = st.select_slider("Scenarios", [5000, 20000, 50000], value=20000)
+    if not st.button(f"Simulate Week {week}"):
+        return
+
+    from views.standings import fetch_season_standings
+
+    results_df = session_view(fetch_results())
+    results = results_df.set_index("game_id").to_dict("index") if not results_df.empty else {}
+    inputs = load_week_inputs(
+        fetch_spreads(week),
+        fetch_picks_for_week(week).to_dict("records"),
+        results,
+        fetch_users(),
+        fetch_season_standings(),
+    )
+    with st.spinner("Simulating remaining games..."):
+        report = simulate(inputs, scenarios=scenarios, remaining_weeks=SEASON_WEEKS - week,
+                          workers=default_workers())
+    if not report:
+        st.info("No entries to project.")
+        return
+    df = pd.DataFrame(report).rename(columns={
+        "entry": "Entry",
+        "week_win_pct": "Win Week %",
+        "season_win_pct": "Win Season %",
+        "expected_wins": "Exp. Wins",
+    })
+    df[["Win Week %", "Win Season %"]] *= 100
+    st.dataframe(df.round(1), use_container_width=True, hide_index=True)
+
 # ---------- Tabs ----------
 tabs = ["Home", "Standings", "Rules", "Profile"]
 if st.session_state.get("is_admin", False):
@@ -280,21 +270,30 @@ if st.session_state.get("is_admin", False):
 
 tab_objs = st.tabs(tabs)
 
-for i, tab_name in enumerate(tabs):
-    with tab_objs[i]:
-        if tab_name == "Home":
-            render_home()
-        elif tab_name == "Make Picks":
-            from views import make_picks
-            make_picks.render()
-        elif tab_name == "Standings":
-            render_standings()
-        elif tab_name == "Rules":
-            from views import rules
-            rules.render()
-        elif tab_name == "Profile":
-            from views import profile
-            profile.render()
-        elif tab_name == "Admin":
-            from views import admin
-            admin.render()
+# Opt-in sampling profiler (admin toggle or PROFILE_SAMPLE_RATE)
+with profile_run("Home.py", enabled=profiling_enabled(st.session_state)):
+    for i, tab_name in enumerate(tabs):
+        with tab_objs[i]:
+            try:
+                if tab_name == "Home":
+                    render_home()
+                elif tab_name == "Make Picks":
+                    from views import make_picks
+                    make_picks.render()
+                elif tab_name == "Standings":
+                    render_standings()
+                    render_projections()
+                elif tab_name == "Rules":
+                    from views import rules
+                    rules.render()
+                elif tab_name == "Profile":
+                    from views import profile
+                    profile.render()
+                elif tab_name == "Admin":
+                    from views import admin
+                    admin.render()
+            except DatabaseUnavailable as e:
+                st.error(f"The database is not responding right now; try again shortly. ({e})")
+
+# Share this replica's warm reads with the others
+save_warm_keys()
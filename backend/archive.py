@@ -0,0 +1,191 @@
+# backend/archive.py
+import collections
+import datetime
+import hashlib
+import json
+import os
+
+from backend.db import PAGE_SIZE, iter_pages, supa
+from backend.export import table_schema, write_parquet
+from backend.season import season_bounds
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+MANIFEST = "manifest.json"
+ID_CHUNK = 200  # game ids per `in` filter, to keep request URLs short
+
+# How each hot table is cut by season. "games" rows are selected by the
+# season's game ids; "dates" by week_start inside the season window; "year"
+# by season_year. season_standings is one running table for the latest
+# season, which is never the one being archived, so it is rebuilt from the
+# archived season's weekly standings and picks and never deleted here.
+ARCHIVE_TABLES = {
+    "nfl_games": {"by": "year"},
+    "picks": {"by": "dates"},
+    "results": {"by": "games"},
+    "weekly_standings": {"by": "dates"},
+    "team_records": {"by": "year"},
+    "season_standings": {"by": "rebuilt", "delete": False},
+}
+# weekly_standings columns that add up to the season's
+SEASON_TOTALS = ("wins", "losses", "pushes", "ats_wins", "ou_wins", "ud_points")
+
+
+def season_game_ids(season: int) -> list:
+    return [
+        r["game_id"]
+        for rows in iter_pages("nfl_games", "game_id", filters=[("eq", "season_year", season)])
+        for r in rows
+    ]
+
+
+def _filter_sets(spec, season, game_ids):
+    """One or more filter lists that together select the season's rows of a table."""
+    if spec["by"] == "year":
+        return [[("eq", "season_year", season)]]
+    if spec["by"] == "dates":
+        start, end = season_bounds(season)
+        return [[("gte", "week_start", start), ("lt", "week_start", end)]]
+    if spec["by"] == "games":
+        return [[("in_", "game_id", game_ids[i:i + ID_CHUNK])] for i in range(0, len(game_ids), ID_CHUNK)]
+    return [[]]
+
+
+def season_standings_rows(season: int) -> list[dict]:
+    """season_standings rows for a past season, summed from its weekly_standings.
+
+    sd_picks counts the entry's Sudden Death picks; rk ranks by wins, ties
+    sharing a rank.
+    """
+    start, end = season_bounds(season)
+    window = [("gte", "week_start", start), ("lt", "week_start", end)]
+    totals = {}
+    for rows in iter_pages("weekly_standings", "entry_abbreviation, " + ", ".join(SEASON_TOTALS), filters=window):
+        for r in rows:
+            entry = totals.setdefault(r["entry_abbreviation"], dict.fromkeys(SEASON_TOTALS, 0))
+            for col in SEASON_TOTALS:
+                entry[col] += r.get(col) or 0
+
+    abbrevs = {u["id"]: u["entry_abbreviation"] for rows in iter_pages("users", "id, entry_abbreviation") for u in rows}
+    sd_picks = collections.Counter(
+        abbrevs.get(r["user_id"])
+        for rows in iter_pages("picks", "user_id", filters=window + [("eq", "type", "SD")])
+        for r in rows
+    )
+
+    out = []
+    for abbrev, entry in totals.items():
+        decided = entry["wins"] + entry["losses"]
+        out.append({
+            "entry_abbreviation": abbrev,
+            **entry,
+            "win_pct": round(entry["wins"] / decided, 3) if decided else None,
+            "sd_picks": sd_picks[abbrev],
+        })
+    out.sort(key=lambda r: -r["wins"])
+    for i, row in enumerate(out):
+        row["rk"] = out[i - 1]["rk"] if i and row["wins"] == out[i - 1]["wins"] else i + 1
+    return out
+
+
+def _season_dir(table, season):
+    return os.path.join(ARCHIVE_DIR, table, f"season={season}")
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict:
+    try:
+        with open(os.path.join(ARCHIVE_DIR, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"seasons": {}}
+
+
+def _save_manifest(manifest):
+    path = os.path.join(ARCHIVE_DIR, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def archive_season(season: int, delete: bool = True, page_size: int = PAGE_SIZE) -> dict:
+    """Copy a season's rows to zstd Parquet under ARCHIVE_DIR, then drop them from the hot tables.
+
+    Files land at <table>/season=<year>/part-NNNN.parquet (one part per
+    filter chunk) and are read back and counted before the manifest is
+    written; rows are deleted only after that. Returns {table: rows}.
+    """
+    import pyarrow.parquet as pq
+
+    game_ids = season_game_ids(season)
+    manifest = load_manifest()
+    entry = {"archived_at": datetime.datetime.now(datetime.timezone.utc).isoformat(), "tables": {}}
+    counts = {}
+
+    for table, spec in ARCHIVE_TABLES.items():
+        filter_sets = _filter_sets(spec, season, game_ids)
+        out_dir = _season_dir(table, season)
+        os.makedirs(out_dir, exist_ok=True)
+        files, total = [], 0
+        for n, filters in enumerate(filter_sets):
+            path = os.path.join(out_dir, f"part-{n:04d}.parquet")
+            if spec["by"] == "rebuilt":
+                pages = iter([season_standings_rows(season)])
+            else:
+                pages = iter_pages(table, filters=filters, page_size=page_size, prefetch=True)
+            with open(path + ".tmp", "wb") as f:
+                rows = write_parquet(pages, f, table_schema(table))
+            if not rows:
+                os.remove(path + ".tmp")
+                continue
+            if pq.read_metadata(path + ".tmp").num_rows != rows:
+                raise RuntimeError(f"{table}: archived row count does not match what was read.")
+            os.replace(path + ".tmp", path)
+            files.append({"path": os.path.relpath(path, ARCHIVE_DIR), "rows": rows, "sha256": _sha256(path)})
+            total += rows
+        entry["tables"][table] = {"rows": total, "files": files, "deleted": False}
+        counts[table] = total
+
+    manifest["seasons"][str(season)] = entry
+    _save_manifest(manifest)
+
+    if delete:
+        # Children before nfl_games, which picks and results refer to.
+        for table, spec in reversed(ARCHIVE_TABLES.items()):
+            if not spec.get("delete", True) or not counts[table]:
+                continue
+            for filters in _filter_sets(spec, season, game_ids):
+                q = supa().table(table).delete()
+                for op, col, value in filters:
+                    q = getattr(q, op)(col, value)
+                q.execute()
+            entry["tables"][table]["deleted"] = True
+        _save_manifest(manifest)
+    return counts
+
+
+# ---------- Read API ----------
+def archived_seasons() -> list[int]:
+    return sorted((int(s) for s in load_manifest()["seasons"]), reverse=True)
+
+
+def read_archive(table: str, season: int, columns=None, filters=None):
+    """An archived table for one season as a DataFrame; never touches the database.
+
+    `filters` uses pyarrow's [(column, op, value)] form, e.g.
+    [("week_start", "=", "2024-10-03")].
+    """
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    entry = load_manifest()["seasons"].get(str(season), {}).get("tables", {}).get(table)
+    if not entry or not entry["files"]:
+        return pd.DataFrame(columns=columns or [])
+    paths = [os.path.join(ARCHIVE_DIR, f["path"]) for f in entry["files"]]
+    return pq.ParquetDataset(paths, filters=filters).read(columns=columns).to_pandas()
@@ -1,10 +1,100 @@
+import json
+import os
+import time
+
 import streamlit as st
-from backend.db import supa
+from backend.changefeed import change_feed
+from backend.db import read, supa
+from backend.sessions import ADMIN_SESSION_TTL, SESSION_TTL, new_session_id, session_store, sign_token, verify_token
+
+COOKIE_NAME = "nfl_pool_session"
+LEGACY_TOKEN_PARAM = "session"  # tokens used to ride in the URL; scrubbed on sight
+ADMIN_RECHECK = 300  # seconds between re-reads of users.is_admin
+
+def _session_cookie():
+    """The signed token from the browser's cookie, as sent when this session connected."""
+    try:
+        return st.context.cookies.get(COOKIE_NAME)
+    except AttributeError:  # Streamlit without st.context
+        return None
+
+def _queue_cookie(token, max_age):
+    """Set (or with token None, clear) the session cookie on the next render; see _emit_cookie."""
+    st.session_state["pending_cookie"] = (token or "", max_age if token else 0)
+
+def _emit_cookie():
+    """Write a queued cookie from the browser; Streamlit has no server-side Set-Cookie."""
+    pending = st.session_state.pop("pending_cookie", None)
+    if pending is None:
+        return
+    import streamlit.components.v1 as components
+
+    token, max_age = pending
+    cookie = f"{COOKIE_NAME}={token}; Path=/; Max-Age={int(max_age)}; SameSite=Strict"
+    components.html(
+        f"<script>parent.document.cookie = {json.dumps(cookie)}"
+        " + (parent.location.protocol === 'https:' ? '; Secure' : '');</script>",
+        height=0,
+    )
+
+def _recheck_admin():
+    """Re-read the signed-in user's admin flag every ADMIN_RECHECK seconds, failing closed."""
+    user = st.session_state.get("user")
+    if not user or time.time() - st.session_state.get("admin_checked_at", 0) < ADMIN_RECHECK:
+        return
+    try:
+        rows = read(supa().table("users").select("is_admin").eq("id", user["id"])).data or []
+        is_admin = bool(rows and rows[0].get("is_admin"))
+    except Exception as e:
+        print(f"Admin re-check failed: {e}")
+        is_admin = False
+    st.session_state["admin_checked_at"] = time.time()
+    if is_admin != st.session_state["is_admin"]:
+        st.session_state["is_admin"] = is_admin
+        save_session()
 
 def ensure_session():
-    """Initialize session keys once."""
+    """Initialize session keys once, restoring a signed-in user from the shared store.
+
+    The signed token is kept in a cookie, so a reload or a request landing
+    on another replica picks the login back up without signing in again.
+    The admin flag is re-read from users every ADMIN_RECHECK seconds.
+    """
     st.session_state.setdefault("user", None)
     st.session_state.setdefault("is_admin", False)
+    if LEGACY_TOKEN_PARAM in st.query_params:
+        del st.query_params[LEGACY_TOKEN_PARAM]
+    store = session_store()
+    token = _session_cookie()
+    if not st.session_state["user"] and store is not None and token and not st.session_state.get("cookie_checked"):
+        # Cookies only change when the browser reconnects, so look once per session.
+        st.session_state["cookie_checked"] = True
+        sid = verify_token(token, os.environ["APP_SECRET"])
+        data = store.get(sid) if sid else None
+        if data:
+            st.session_state["sid"] = sid
+            st.session_state["user"] = data["user"]
+            st.session_state["is_admin"] = bool(data.get("is_admin"))
+            st.session_state["admin_checked_at"] = 0
+        else:
+            _queue_cookie(None, 0)
+    _recheck_admin()
+    _emit_cookie()
+
+def save_session():
+    """Write the session's user and admin flag to the shared store, starting a session if needed.
+
+    Admin sessions expire after ADMIN_SESSION_TTL instead of SESSION_TTL.
+    """
+    store = session_store()
+    if store is None or not st.session_state.get("user"):
+        return
+    ttl = ADMIN_SESSION_TTL if st.session_state["is_admin"] else SESSION_TTL
+    sid = st.session_state.get("sid")
+    if not sid:
+        sid = st.session_state["sid"] = new_session_id()
+        _queue_cookie(sign_token(sid, os.environ["APP_SECRET"], ttl), ttl)
+    store.put(sid, {"user": st.session_state["user"], "is_admin": st.session_state["is_admin"]}, ttl)
 
 def register(name, email, password, entry_abbreviation):
     client = supa()
@@ -19,6 +109,7 @@ def register(name, email, password, entry_abbreviation):
             "email": email,
             "entry_abbreviation": abbrev
         }).execute()
+        change_feed().publish("users", op="INSERT")
         return True, "Registered."
     return False, "Registration failed."
 
@@ -30,9 +121,16 @@ def login(email, password):
         user = row[0] if row else {"id": r.user.id, "email": email, "name": email}
         st.session_state["user"] = user
         st.session_state["is_admin"] = bool(user.get("is_admin"))
+        st.session_state["admin_checked_at"] = time.time()
+        save_session()
         return True, "Logged in."
     return False, "Login failed."
 
 def logout():
+    store = session_store()
+    sid = st.session_state.pop("sid", None)
+    if store is not None and sid:
+        store.delete(sid)
+    _queue_cookie(None, 0)
     st.session_state["user"] = None
     st.session_state["is_admin"] = False
@@ -0,0 +1,234 @@
+# backend/cache.py
+import collections
+import functools
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Long TTLs are safe while the change feed is running; they only bound how
+# stale data can get if a notification is ever missed.
+DEFAULT_TTL = 6 * 3600
+# After its TTL an entry is still served for this long while one background
+# refresh replaces it. Change-feed invalidations skip this: a write always
+# forces a fresh read.
+STALE_GRACE = 3600
+# Last good values kept for serving while the database is down, least recently stored dropped first.
+LAST_GOOD_MAX = 1024
+
+stats = collections.Counter()
+
+
+class WeekCache:
+    """Process-wide cache whose entries are tagged by (table, week).
+
+    Entries are invalidated by table and week when the change feed reports
+    a write, instead of waiting for their TTL to expire.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}    # key -> (expires_at, value)
+        self._tags = {}       # key -> set of (table, week)
+        self._last_good = collections.OrderedDict()  # key -> last value stored; survives expiry and invalidation
+        self._epochs = collections.Counter()  # table -> invalidation count; None counts clear()
+
+    def get(self, key):
+        """(expires_at, value) if the entry is fresh; expired ones are kept for peek()."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry
+
+    def peek(self, key, grace=STALE_GRACE):
+        """(expires_at, value) even if expired, up to `grace` seconds past its TTL."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] + grace < time.monotonic():
+                self._drop(key)
+                return None
+            return entry
+
+    def epoch(self, tables):
+        """Token that changes whenever any of `tables` is invalidated; see set()."""
+        with self._lock:
+            return (self._epochs[None],) + tuple(self._epochs[t] for t in tables)
+
+    def set(self, key, value, tables, week=None, ttl=DEFAULT_TTL, epoch=None):
+        """Store `value`; skipped if `epoch` (taken before the read) shows a write since."""
+        with self._lock:
+            if epoch is not None and epoch != (self._epochs[None],) + tuple(self._epochs[t] for t in tables):
+                return False
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._tags[key] = {(t, week) for t in tables}
+            self._last_good[key] = value
+            self._last_good.move_to_end(key)
+            while len(self._last_good) > LAST_GOOD_MAX:
+                self._last_good.popitem(last=False)
+            return True
+
+    def last_good(self, key):
+        """The most recent value stored under `key`, even if expired or invalidated."""
+        with self._lock:
+            return self._last_good.get(key)
+
+    def invalidate(self, table, week=None):
+        """Drop entries for `table`.
+
+        With a week (nfl_week number or week_start date string) only entries
+        for that week, plus entries not scoped to any week, are dropped.
+        """
+        with self._lock:
+            self._epochs[table] += 1
+            doomed = [
+                key for key, tags in self._tags.items()
+                if any(t == table and (week is None or w is None or w == week) for t, w in tags)
+            ]
+            for key in doomed:
+                self._drop(key)
+            return len(doomed)
+
+    def items(self):
+        """Snapshot of live (key, value) pairs."""
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v) for k, (exp, v) in self._entries.items() if exp >= now]
+
+    def clear(self):
+        with self._lock:
+            self._epochs[None] += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self._tags.pop(key, None)
+
+
+week_cache = WeekCache()
+
+
+# ---------- Single flight ----------
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_flights = {}            # key -> _Flight for reads in progress
+_refreshing = set()      # keys with a background refresh queued or running
+_flights_lock = threading.Lock()
+_refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+
+def single_flight(key, load):
+    """Run `load()` once per key at a time; concurrent callers wait and share its result or error."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        stats["coalesced"] += 1
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+    try:
+        flight.value = load()
+        return flight.value
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _refresh(key, load):
+    try:
+        single_flight(key, load)
+        stats["refreshed"] += 1
+    except Exception as e:
+        print(f"Background refresh of {key[1]} failed: {e}")
+    finally:
+        with _flights_lock:
+            _refreshing.discard(key)
+
+
+def refresh_in_background(key, load):
+    """Queue one refresh of `key` unless one is already queued or a read is in flight."""
+    with _flights_lock:
+        if key in _refreshing or key in _flights:
+            return
+        _refreshing.add(key)
+    _refresher.submit(_refresh, key, load)
+
+
+_readers = {}  # (module, qualname) -> wrapper, for every reader decorated with @cached
+
+
+def registered_reader(module, qualname):
+    """The @cached reader defined as module.qualname in this process, or None."""
+    return _readers.get((module, qualname))
+
+
+def cached(*tables, week_arg="week", ttl=DEFAULT_TTL):
+    """Cache a reader in `week_cache`, tagged with the tables it reads.
+
+    The value of the `week_arg` parameter (if the function has one) scopes
+    the entry so a change to one week leaves the others cached. Like
+    st.cache_data, parameters starting with an underscore are not hashed.
+    Concurrent misses for the same call share one read. An entry past its
+    TTL is returned as is while one background read refreshes it. If the
+    reader raises, the last good value for the same call is served instead
+    (while the database is degraded); failures are never cached.
+    """
+    def decorator(fn):
+        sig = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = tuple(
+                (name, value) for name, value in bound.arguments.items()
+                if not name.startswith("_")
+            )
+            key = (fn.__module__, fn.__qualname__, params)
+            week = bound.arguments.get(week_arg)
+
+            def load():
+                epoch = week_cache.epoch(tables)
+                value = fn(*args, **kwargs)
+                week_cache.set(key, value, tables, week=week, ttl=ttl, epoch=epoch)
+                return value
+
+            hit = week_cache.get(key)
+            if hit is not None:
+                return hit[1]
+            stale = week_cache.peek(key)
+            if stale is not None:
+                stats["stale_while_revalidate"] += 1
+                refresh_in_background(key, load)
+                return stale[1]
+            try:
+                return single_flight(key, load)
+            except Exception as e:
+                stale = week_cache.last_good(key)
+                if stale is None:
+                    raise
+                stats["served_stale"] += 1
+                print(f"{fn.__qualname__} failed ({e}); serving last good value")
+                return stale
+
+        _readers[(fn.__module__, fn.__qualname__)] = wrapper
+        return wrapper
+    return decorator
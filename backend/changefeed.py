@@ -0,0 +1,116 @@
+# backend/changefeed.py
+import datetime
+import json
+import os
+import threading
+
+from backend.cache import week_cache
+from backend.season import calendar, season_of
+
+CHANNEL = "pool_changes"
+WATCHED_TABLES = ("spreads", "picks", "results", "weekly_standings", "season_standings", "team_records", "users",
+                  "weekly_entries")
+
+
+def apply_change(event: dict):
+    """Invalidate the cache entries touched by one change event.
+
+    Events look like {"table": "picks", "week": 3, "week_start": "2025-09-18"};
+    both week fields are optional and a missing scope drops the whole table.
+    A week_start alone (weekly_entries has no nfl_week) also drops entries
+    keyed by that week's number.
+    """
+    table = event.get("table")
+    if table not in WATCHED_TABLES:
+        return 0
+    week = event.get("week")
+    week_start = event.get("week_start")
+    if week is None and week_start is None:
+        return week_cache.invalidate(table)
+    if week is None:
+        start = datetime.date.fromisoformat(str(week_start)[:10])
+        week = calendar(season_of(start)).week_for_start(start)
+    dropped = 0
+    if week is not None:
+        dropped += week_cache.invalidate(table, int(week))
+    if week_start is not None:
+        dropped += week_cache.invalidate(table, str(week_start))
+    return dropped
+
+
+class LocalChangeFeed:
+    """In-process feed: writers publish directly, no database needed.
+
+    Used when DATABASE_URL is not set (local dev, tests) and by the app's own
+    writes so the writing process sees its change before the round trip.
+    """
+
+    def __init__(self):
+        self._listeners = [apply_change]
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def publish(self, table, week=None, week_start=None, op="UPDATE"):
+        event = {"table": table, "op": op, "week": week, "week_start": week_start}
+        for listener in list(self._listeners):
+            listener(event)
+
+    def stop(self):
+        pass
+
+
+class PostgresChangeFeed(LocalChangeFeed):
+    """LISTENs on the `pool_changes` channel fed by sql/migrations/0011_change_feed.sql triggers."""
+
+    def __init__(self, dsn: str):
+        super().__init__()
+        self._dsn = dsn
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pool-change-feed", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            import psycopg
+        except ImportError:
+            print("psycopg not installed; change feed disabled, falling back to TTL expiry.")
+            return
+
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self._dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    # A reconnect may have missed events, so start from a clean slate.
+                    week_cache.clear()
+                    while not self._stop.is_set():
+                        for note in conn.notifies(timeout=5.0):
+                            self._dispatch(note.payload)
+            except Exception as e:
+                print(f"Change feed connection lost: {e}")
+                self._stop.wait(5.0)
+
+    def _dispatch(self, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        for listener in list(self._listeners):
+            listener(event)
+
+    def stop(self):
+        self._stop.set()
+
+
+_feed: LocalChangeFeed | None = None
+_feed_lock = threading.Lock()
+
+
+def change_feed() -> LocalChangeFeed:
+    """Start the change-feed subscriber once per process."""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            dsn = os.getenv("DATABASE_URL")
+            _feed = PostgresChangeFeed(dsn) if dsn else LocalChangeFeed()
+    return _feed
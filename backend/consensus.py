@@ -0,0 +1,42 @@
+# backend/consensus.py
+from backend.cache import cached
+from backend.db import read, supa
+
+CONSENSUS_COLUMNS = (
+    "game_id, ats_away, ats_home, bb_away, bb_home, "
+    "ou_over, ou_under, sd_away, sd_home, ud"
+)
+
+
+@cached("picks", "spreads")
+def fetch_consensus(week: int):
+    """Per-game pick counts for a week from the `pick_consensus` view, keyed by game_id."""
+    rows = read(
+        supa().table("pick_consensus").select(CONSENSUS_COLUMNS).eq("nfl_week", week)
+    ).data or []
+    return {row["game_id"]: row for row in rows}
+
+
+def _split(a, b):
+    total = (a or 0) + (b or 0)
+    return (a or 0) / total if total else None
+
+
+def consensus_label(row, away, home, spread=None):
+    """Short board label, e.g. "KC -3 62% · O 80%"; empty when nobody picked the game."""
+    if not row:
+        return ""
+    parts = []
+    away_share = _split((row["ats_away"] or 0) + (row["bb_away"] or 0),
+                        (row["ats_home"] or 0) + (row["bb_home"] or 0))
+    if away_share is not None:
+        if away_share >= 0.5:
+            line = f" {spread:+g}" if spread is not None else ""
+            parts.append(f"{away}{line} {away_share:.0%}")
+        else:
+            line = f" {-spread:+g}" if spread is not None else ""
+            parts.append(f"{home}{line} {1 - away_share:.0%}")
+    over_share = _split(row["ou_over"], row["ou_under"])
+    if over_share is not None:
+        parts.append(f"O {over_share:.0%}" if over_share >= 0.5 else f"U {1 - over_share:.0%}")
+    return " · ".join(parts)
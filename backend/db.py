@@ -1,6 +1,12 @@
 # backend/db.py
+import collections
 import os
-from supabase import create_client, Client
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from supabase import ClientOptions, create_client, Client
 
 _supa: Client | None = None
 
@@ -19,5 +25,260 @@ def supa() -> Client:
     if _supa is None:
         url = _require_env("SUPABASE_URL")
         key = _require_env("SUPABASE_KEY")
-        _supa = create_client(url, key)
+        _supa = create_client(url, key, options=ClientOptions(postgrest_client_timeout=READ_TIMEOUT))
     return _supa
+
+# ---------- Resilient reads ----------
+READ_TIMEOUT = float(os.getenv("DB_READ_TIMEOUT", "5"))      # seconds per attempt
+READ_DEADLINE = float(os.getenv("DB_READ_DEADLINE", "12"))   # seconds for the whole call, retries included
+READ_WORKERS = int(os.getenv("DB_READ_WORKERS", "32"))        # threads serving every session's reads
+QUEUE_TIMEOUT = float(os.getenv("DB_READ_QUEUE_TIMEOUT", "10"))  # seconds a read may wait for a free thread
+READ_RETRIES = 2
+BACKOFF = 0.2                  # base of the jittered exponential backoff, seconds
+HEDGE_PERCENTILE = 0.95        # a second request goes out once an attempt is slower than this...
+HEDGE_MIN_DELAY = 0.25         # ...but never sooner than this
+HEDGE_MIN_SAMPLES = 20
+BREAKER_FAILURES = 5           # consecutive failed calls that open the breaker
+BREAKER_COOLDOWN = 30          # seconds before a trial call is let through
+
+counters = collections.Counter()
+_latencies = collections.deque(maxlen=500)
+_lock = threading.Lock()
+_pool = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="db-read")
+_breaker = {"failures": 0, "open_until": 0.0}
+
+
+class DatabaseUnavailable(RuntimeError):
+    """A read failed every attempt before its deadline, or the breaker is open."""
+
+
+def _hedge_delay():
+    with _lock:
+        if len(_latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(_latencies)
+    return max(HEDGE_MIN_DELAY, ordered[int(HEDGE_PERCENTILE * (len(ordered) - 1))])
+
+
+class ReadQueueTimeout(TimeoutError):
+    """No read thread was free within QUEUE_TIMEOUT; this process is busy, not the database."""
+
+
+def _start(query):
+    """Submit one execute and wait for a thread to pick it up; returns (future, start time).
+
+    Time spent queued behind other sessions' reads is local load, so
+    timeouts and deadlines run from the start time, not from submission.
+    """
+    started = threading.Event()
+    at = []
+
+    def run():
+        at.append(time.monotonic())
+        started.set()
+        return query.execute()
+
+    future = _pool.submit(run)
+    if not started.wait(QUEUE_TIMEOUT):
+        if future.cancel():
+            counters["queue_timeouts"] += 1
+            raise ReadQueueTimeout(f"no read thread free within {QUEUE_TIMEOUT:.1f}s")
+        started.wait()
+    return future, at[0]
+
+
+def _attempt(query, timeout, waits):
+    """One attempt, hedged: a duplicate request races the first if it runs long.
+
+    The time spent waiting for a thread is appended to `waits`.
+    """
+    submitted = time.monotonic()
+    first, started = _start(query)
+    waits.append(started - submitted)
+    futures = {first}
+    delay = _hedge_delay()
+    if delay is not None and delay < timeout:
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            counters["hedged"] += 1
+            futures.add(_pool.submit(query.execute))
+    remaining = timeout - (time.monotonic() - started)
+    while futures and remaining > 0:
+        done, futures = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                with _lock:
+                    _latencies.append(time.monotonic() - started)
+                return future.result()
+            error = future.exception()
+        remaining = timeout - (time.monotonic() - started)
+    if futures:
+        counters["timeouts"] += 1
+        raise TimeoutError(f"no response within {timeout:.1f}s")
+    raise error
+
+
+def read(query, deadline: float = READ_DEADLINE):
+    """Execute an idempotent PostgREST read with a deadline, retries, hedging and a breaker.
+
+    Pass the built query without calling `.execute()`; the response is
+    returned as `.execute()` would. Raises DatabaseUnavailable instead of
+    returning empty data, so a failure is never cached as "no rows". Writes
+    should keep calling `.execute()` directly; they are not safe to repeat.
+    """
+    now = time.monotonic()
+    with _lock:
+        if _breaker["open_until"] > now:
+            counters["short_circuited"] += 1
+            raise DatabaseUnavailable("database reads are paused after repeated failures")
+    counters["reads"] += 1
+    stop = now + deadline
+    waits = []  # seconds spent queued for a thread; they extend the deadline
+    error = None
+    for n in range(READ_RETRIES + 1):
+        left = stop + sum(waits) - time.monotonic()
+        if left <= 0:
+            break
+        if n:
+            counters["retries"] += 1
+            time.sleep(min(left, random.uniform(0, BACKOFF * 2 ** n)))
+            left = stop + sum(waits) - time.monotonic()
+            if left <= 0:
+                break
+        try:
+            response = _attempt(query, min(READ_TIMEOUT, left), waits)
+        except Exception as e:
+            error = e
+            continue
+        with _lock:
+            _breaker["failures"] = 0
+        return response
+    counters["failures"] += 1
+    if isinstance(error, ReadQueueTimeout):
+        # Local overload says nothing about the database; leave the breaker alone.
+        raise DatabaseUnavailable(f"read failed: {error}") from error
+    with _lock:
+        _breaker["failures"] += 1
+        if _breaker["failures"] >= BREAKER_FAILURES:
+            if _breaker["open_until"] <= time.monotonic():
+                counters["breaker_opened"] += 1
+            _breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+    raise DatabaseUnavailable(f"read failed: {error}") from error
+
+
+def read_health() -> dict:
+    """Counters plus breaker state and read latency percentiles, for the admin page."""
+    with _lock:
+        ordered = sorted(_latencies)
+        open_for = max(0.0, _breaker["open_until"] - time.monotonic())
+    pct = lambda q: round(ordered[int(q * (len(ordered) - 1))] * 1000) if ordered else None
+    return {
+        **counters,
+        "breaker_open_seconds": round(open_for, 1),
+        "p50_ms": pct(0.5),
+        "p95_ms": pct(0.95),
+    }
+
+# ---------- Keyset-paginated reads ----------
+PAGE_SIZE = 1000
+
+# Unique, non-null column sets that give each table a stable keyset order.
+TABLE_KEYS = {
+    "picks": ("user_id", "game_id", "type", "submitted_at"),
+    "results": ("game_id",),
+    "spreads": ("game_id",),
+    "nfl_games": ("game_id",),
+    "weekly_standings": ("week_start", "entry_abbreviation"),
+    "season_standings": ("entry_abbreviation",),
+    "team_records": ("season_year", "team"),
+}
+
+
+def _quote(value) -> str:
+    """PostgREST filter literal; double quotes keep commas and parens intact."""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _after(key, last):
+    """PostgREST `or` filter for rows strictly after `last` in (key...) order."""
+    clauses = []
+    for i, col in enumerate(key):
+        terms = [f"{k}.eq.{_quote(last[k])}" for k in key[:i]] + [f"{col}.gt.{_quote(last[col])}"]
+        clauses.append(terms[0] if len(terms) == 1 else f"and({','.join(terms)})")
+    return ",".join(clauses)
+
+
+def _fetch_page(table, columns, key, filters, page_size, last):
+    q = supa().table(table).select(columns)
+    for op, col, value in filters:
+        q = getattr(q, op)(col, value)
+    if last is not None:
+        q = q.or_(_after(key, last))
+    for col in key:
+        q = q.order(col)
+    return read(q.limit(page_size)).data or []
+
+
+def iter_pages(table: str, columns: str = "*", key=None, filters=(), page_size: int = PAGE_SIZE,
+               prefetch: bool = False):
+    """Walk a table in keyset order, yielding one list of rows per page.
+
+    `key` must be unique and non-null (composite keys are fine); it defaults
+    to the table's TABLE_KEYS entry and is added to `columns` if missing. `filters` are (method, column, value) tuples,
+    e.g. ("eq", "nfl_week", 3). Unlike one `.select().execute()`, this is
+    not truncated at PostgREST's row cap and holds one page at a time. With
+    `prefetch` the next page is requested while the caller handles this one.
+    """
+    key = tuple(key or TABLE_KEYS.get(table, ("id",)))
+    if columns != "*":
+        selected = [c.strip() for c in columns.split(",")]
+        columns = ", ".join(selected + [k for k in key if k not in selected])
+    fetch = lambda last: _fetch_page(table, columns, key, filters, page_size, last)
+
+    if not prefetch:
+        last = None
+        while True:
+            rows = fetch(last)
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            last = rows[-1]
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(fetch, None)
+        while True:
+            rows = pending.result()
+            more = len(rows) == page_size
+            if more:
+                pending = pool.submit(fetch, rows[-1])
+            if rows:
+                yield rows
+            if not more:
+                return
+
+
+def iter_table(table: str, columns: str = "*", key=None, filters=(), page_size: int = PAGE_SIZE,
+               prefetch: bool = False):
+    """Yield a table's rows one at a time, reading page by page."""
+    for rows in iter_pages(table, columns, key, filters, page_size, prefetch):
+        yield from rows
+
+
+def iter_frames(table: str, columns: str = "*", key=None, filters=(), page_size: int = PAGE_SIZE,
+                prefetch: bool = True, kind: str = "pandas"):
+    """Yield each page as a pandas DataFrame or, with kind="arrow", a pyarrow Table."""
+    if kind == "arrow":
+        import pyarrow as pa
+        convert = pa.Table.from_pylist
+    else:
+        import pandas as pd
+        convert = pd.DataFrame
+    for rows in iter_pages(table, columns, key, filters, page_size, prefetch):
+        yield convert(rows)
+
+
+def read_all(table: str, columns: str = "*", key=None, filters=(), page_size: int = PAGE_SIZE):
+    """Every matching row as one list, read in pipelined keyset pages."""
+    return list(iter_table(table, columns, key, filters, page_size, prefetch=True))
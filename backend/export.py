@@ -0,0 +1,124 @@
+# backend/export.py
+import csv
+import functools
+import io
+import os
+import tempfile
+import zipfile
+
+import requests
+
+from backend.db import PAGE_SIZE, READ_TIMEOUT, TABLE_KEYS, _require_env, iter_pages
+
+# Tables in a season export; each is paged in its TABLE_KEYS order.
+EXPORT_TABLES = {table: TABLE_KEYS[table] for table in (
+    "picks", "results", "spreads", "weekly_standings", "season_standings",
+)}
+
+
+# PostgREST column formats -> Arrow type names. Dates, times, uuids and
+# anything unlisted stay as the strings PostgREST returns.
+ARROW_TYPES = {
+    "smallint": "int16",
+    "integer": "int32",
+    "bigint": "int64",
+    "real": "float32",
+    "double precision": "float64",
+    "numeric": "float64",
+    "boolean": "bool",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def declared_columns() -> dict:
+    """table or view -> [(column, declared type)] from PostgREST's OpenAPI description."""
+    key = _require_env("SUPABASE_KEY")
+    resp = requests.get(
+        _require_env("SUPABASE_URL").rstrip("/") + "/rest/v1/",
+        headers={"apikey": key, "Authorization": f"Bearer {key}", "Accept": "application/openapi+json"},
+        timeout=READ_TIMEOUT,
+    )
+    resp.raise_for_status()
+    return {
+        name: [(col, spec.get("format", "")) for col, spec in definition.get("properties", {}).items()]
+        for name, definition in resp.json().get("definitions", {}).items()
+    }
+
+
+def table_schema(table: str):
+    """Arrow schema for `table` from its declared column types, so every page writes the same types."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow. Install it with `pip install pyarrow`.")
+
+    columns = declared_columns().get(table)
+    if not columns:
+        raise RuntimeError(f"No column types found for {table}.")
+    return pa.schema([(col, pa.type_for_alias(ARROW_TYPES.get(fmt, "string"))) for col, fmt in columns])
+
+
+def write_csv(pages, fileobj):
+    """Stream pages of dict rows into a binary file as UTF-8 CSV; returns the row count."""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    writer = None
+    count = 0
+    for rows in pages:
+        if writer is None:
+            writer = csv.DictWriter(text, fieldnames=list(rows[0].keys()), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerows(rows)
+        count += len(rows)
+    text.flush()
+    text.detach()
+    return count
+
+
+def write_parquet(pages, fileobj, schema):
+    """Stream pages into a Parquet file, one row group per page; returns the row count.
+
+    `schema` (see table_schema) is fixed up front: inferring it from the
+    first page would type a column that is all null there as null and
+    fail on the next page.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    count = 0
+    for rows in pages:
+        if writer is None:
+            writer = pq.ParquetWriter(fileobj, schema, compression="zstd")
+        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+        count += len(rows)
+    if writer is not None:
+        writer.close()
+    return count
+
+
+def export_season(fmt: str = "csv", tables=None, page_size: int = PAGE_SIZE):
+    """Build a zip with one CSV or Parquet file per table.
+
+    Rows go straight from each page into the writer, so memory stays at
+    one page no matter how large the league is. Returns (path, row counts);
+    the caller owns the temp file.
+    """
+    tables = tables or EXPORT_TABLES
+    fd, path = tempfile.mkstemp(prefix="nfl_pool_export_", suffix=".zip")
+    os.close(fd)
+    counts = {}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for table, order in tables.items():
+            pages = iter_pages(table, key=order, page_size=page_size, prefetch=True)
+            if fmt == "parquet":
+                # Parquet needs a seekable target, so spool to disk first.
+                with tempfile.TemporaryFile() as tmp:
+                    counts[table] = write_parquet(pages, tmp, table_schema(table))
+                    tmp.seek(0)
+                    with zf.open(f"{table}.parquet", "w") as member:
+                        while chunk := tmp.read(1 << 20):
+                            member.write(chunk)
+            else:
+                with zf.open(f"{table}.csv", "w") as member:
+                    counts[table] = write_csv(pages, member)
+    return path, counts
@@ -0,0 +1,141 @@
+# backend/frames.py
+import numpy as np
+import pandas as pd
+
+from backend.cache import week_cache
+
+# Frames built here live in the process-wide cache and are shared by every
+# session, so they are never modified in place: pages take a session_view()
+# before adding or changing columns.
+
+PICK_TYPES = pd.CategoricalDtype(["BB", "ATS", "OU", "O/U", "SD", "UD"])
+OU_SIDES = pd.CategoricalDtype(["O", "U", "Push"])
+
+SPREADS_DTYPES = {
+    "game_id": "category",
+    "nfl_week": "Int8",
+    "date": "category",
+    "time": "category",
+    "away_team": "category",
+    "home_team": "category",
+    "spread": "float32",
+    "over_under": "float32",
+}
+
+PICKS_DTYPES = {
+    "user_id": "category",
+    "type": PICK_TYPES,
+    "selection": "category",
+    "game_id": "category",
+    "submitted_at": "datetime64[ns, UTC]",
+    "over_under_pick": OU_SIDES,
+    "is_double": "boolean",
+    "underdog_points": "float32",
+    "correct": "boolean",
+}
+
+RESULTS_DTYPES = {
+    "game_id": "category",
+    "home_score": "Int16",
+    "away_score": "Int16",
+    "ml_winner": "category",
+    "ats_winner": "category",
+    "ou_result": OU_SIDES,
+}
+
+
+def compact(rows, dtypes: dict) -> pd.DataFrame:
+    """Build a frame from API rows with categorical strings and narrow numbers.
+
+    Columns in `dtypes` that the rows lack are created empty so callers can
+    rely on the schema; extra columns are kept as returned.
+    """
+    df = pd.DataFrame(rows)
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            df[col] = pd.Series(index=df.index, dtype=object)
+        if str(dtype).startswith("datetime64"):
+            df[col] = pd.to_datetime(df[col], utc=True, errors="coerce", format="ISO8601")
+        elif dtype in ("float32", "Int8", "Int16"):
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def session_view(df: pd.DataFrame) -> pd.DataFrame:
+    """A shallow copy-on-write view of a shared frame for one render.
+
+    It shares the frame's column buffers; a column the page adds or replaces
+    belongs to the view alone, and under copy-on-write (always on from
+    pandas 3) a write into a shared column copies that column first.
+    """
+    with pd.option_context("mode.copy_on_write", True):
+        return df.copy(deep=False)
+
+
+def _buffer(col: pd.Series):
+    """The numpy array behind a column's values, or None if it has none."""
+    arr = col.array
+    if isinstance(arr, pd.Categorical):
+        return arr.codes
+    # Datetime arrays keep their values in _ndarray, nullable Int/boolean in _data.
+    for attr in ("_ndarray", "_data"):
+        values = getattr(arr, attr, None)
+        if isinstance(values, np.ndarray):
+            return values
+    return None
+
+
+def _shares_data(a: pd.Series, b: pd.Series) -> bool:
+    """Whether two columns are backed by the same values."""
+    a_buf, b_buf = _buffer(a), _buffer(b)
+    if a_buf is None or b_buf is None:
+        return a.array is b.array
+    return np.shares_memory(a_buf, b_buf)
+
+
+def session_bytes(view: pd.DataFrame, shared: pd.DataFrame) -> int:
+    """Bytes a session's view holds that are not shared with the cached frame."""
+    usage = view.memory_usage(deep=True, index=False)
+    own = sum(int(usage[col]) for col in view.columns
+              if col not in shared.columns or not _shares_data(view[col], shared[col]))
+    if view.index is not shared.index:
+        own += int(view.index.memory_usage(deep=True))
+    return own
+
+
+def memory_report(frames: dict, sessions: int = 1) -> pd.DataFrame:
+    """Bytes per frame as object-dtype per-session copies vs one shared compact frame.
+
+    `frames` maps a label to a cached compact frame. "Before" is what each
+    session used to build for itself; "after" is the shared frame once plus
+    what each session's session_view() holds on its own.
+    """
+    rows = []
+    for label, df in frames.items():
+        if df is None:
+            continue
+        before = int(df.astype(object).memory_usage(deep=True).sum())
+        shared = int(df.memory_usage(deep=True).sum())
+        per_session = session_bytes(session_view(df), df)
+        rows.append({
+            "frame": label,
+            "rows": len(df),
+            "bytes_per_session_before": before,
+            "bytes_shared_after": shared,
+            "bytes_per_session_after": per_session,
+            f"total_before_{sessions}_sessions": before * sessions,
+            f"total_after_{sessions}_sessions": shared + per_session * sessions,
+        })
+    return pd.DataFrame(rows)
+
+
+def cached_frames() -> dict:
+    """Every DataFrame currently in the shared cache, labelled by reader and arguments."""
+    frames = {}
+    for (_, qualname, params), value in week_cache.items():
+        if isinstance(value, pd.DataFrame):
+            args = ", ".join(f"{k}={v}" for k, v in params)
+            frames[f"{qualname}({args})"] = value
+    return frames
@@ -0,0 +1,159 @@
+# backend/freeze.py
+import contextlib
+import datetime
+import glob
+import json
+import os
+import time
+
+import pandas as pd
+
+from backend.changefeed import change_feed
+from backend.db import read, supa
+from backend.odds import apply_game_diff, diff_games, fetch_odds_raw, fetch_team_map, game_rows_from_odds
+
+REPORT_DIR = os.getenv("FREEZE_REPORT_DIR", ".freeze_runs")
+
+
+def _size(obj) -> int:
+    return len(json.dumps(obj, default=str).encode())
+
+
+class FreezeRun:
+    """Timings and row/byte counts for one freeze, one entry per stage."""
+
+    def __init__(self, week: int, source: str):
+        self.week = week
+        self.source = source
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.stages = []
+        self.errors = []
+        self.quota_remaining = None
+        self.counts = {"changed": 0, "removed": 0, "unchanged": 0}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block; the block fills in rows_in, rows_out and bytes."""
+        entry = {"stage": name, "ms": 0.0, "rows_in": None, "rows_out": None, "bytes": None}
+        started = time.perf_counter()
+        try:
+            yield entry
+        except Exception as e:
+            entry["error"] = str(e)
+            self.errors.append(f"{name}: {e}")
+            raise
+        finally:
+            entry["ms"] = round((time.perf_counter() - started) * 1000, 1)
+            entry["quota_remaining"] = self.quota_remaining
+            self.stages.append(entry)
+
+    def report(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "week": self.week,
+            "source": self.source,
+            "total_ms": round(sum(s["ms"] for s in self.stages), 1),
+            "quota_remaining": self.quota_remaining,
+            **self.counts,
+            "stages": self.stages,
+            "errors": self.errors,
+        }
+
+
+def run_freeze(week: int, source: str = "admin", fetch=fetch_odds_raw, week_of=None, prune: bool = False):
+    """Fetch, decode, build, diff and write one week's lines, timing each stage.
+
+    `fetch` returns (body bytes, remaining credits). With `prune`, games that
+    are missing from the feed and have not kicked off are deleted (see
+    diff_games). The run report is saved (see save_report) even if a stage
+    fails, then returned or re-raised.
+    """
+    run = FreezeRun(week, source)
+    try:
+        _run_stages(run, week, fetch, week_of, prune)
+    finally:
+        report = run.report()
+        save_report(report)
+    return report
+
+
+def _run_stages(run: FreezeRun, week: int, fetch, week_of, prune: bool):
+    with run.stage("fetch") as s:
+        body, run.quota_remaining = fetch()
+        s["bytes"] = len(body)
+        s["quota_remaining"] = run.quota_remaining
+
+    with run.stage("decode") as s:
+        games = json.loads(body)
+        s["bytes"] = len(body)
+        s["rows_out"] = len(games)
+
+    with run.stage("consensus") as s:
+        s["rows_in"] = len(games)
+        rows = game_rows_from_odds(games, week, fetch_team_map(), week_of=week_of, errors=run.errors)
+        s["rows_out"] = len(rows)
+
+    if not rows:
+        # An empty feed, or every game already started: leave the week as it is.
+        print(f"No lines for week {week}; nothing written.")
+        return
+
+    with run.stage("diff") as s:
+        s["rows_in"] = len(rows)
+        changed, gone, existing = diff_games(rows, week, prune)
+        s["bytes"] = _size(existing)
+        s["rows_out"] = len(changed) + len(gone)
+
+    with run.stage("write") as s:
+        s["rows_in"] = len(changed) + len(gone)
+        apply_game_diff(changed, gone)
+        s["bytes"] = _size(changed) + _size(gone) if changed or gone else 0
+        s["rows_out"] = len(changed) + len(gone)
+        run.counts = {"changed": len(changed), "removed": len(gone), "unchanged": len(rows) - len(changed)}
+
+    with run.stage("spreads_refresh") as s:
+        # spreads is a view over nfl_games: tell other processes, then read it back.
+        change_feed().publish("spreads", week=week)
+        fresh = read(supa().table("spreads").select("game_id").eq("nfl_week", week)).data or []
+        s["rows_in"] = len(rows)
+        s["rows_out"] = len(fresh)
+
+
+def save_report(report: dict):
+    """Print the run report as JSON, keep a copy in REPORT_DIR and, with FREEZE_RUNS_TABLE=1, in freeze_runs."""
+    print(json.dumps(report))
+    try:
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        stamp = report["started_at"].replace(":", "").replace("+0000", "Z")
+        with open(os.path.join(REPORT_DIR, f"{stamp}-week{report['week']}.json"), "w") as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        print(f"Could not write freeze report: {e}")
+    if os.getenv("FREEZE_RUNS_TABLE") == "1":
+        try:
+            supa().table("freeze_runs").insert(report).execute()
+        except Exception as e:
+            print(f"Could not record freeze run: {e}")
+
+
+def recent_runs(limit: int = 50) -> list[dict]:
+    """Latest run reports, newest first: from freeze_runs when enabled, else REPORT_DIR."""
+    if os.getenv("FREEZE_RUNS_TABLE") == "1":
+        return read(supa().table("freeze_runs").select("*").order("started_at", desc=True).limit(limit)).data or []
+    runs = []
+    for path in sorted(glob.glob(os.path.join(REPORT_DIR, "*.json")), reverse=True)[:limit]:
+        with open(path) as f:
+            runs.append(json.load(f))
+    return runs
+
+
+def stage_trends(runs) -> pd.DataFrame:
+    """One row per run (oldest first) with total and per-stage milliseconds."""
+    rows = []
+    for run in reversed(runs):
+        row = {"started_at": run["started_at"], "total_ms": run["total_ms"],
+               "quota_remaining": run.get("quota_remaining")}
+        for stage in run.get("stages") or []:
+            row[f"{stage['stage']}_ms"] = stage["ms"]
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,119 @@
+# backend/grading.py
+import io
+
+import numpy as np
+import pandas as pd
+
+from backend.db import read, supa
+from backend.records import update_team_records
+
+RESULT_COLUMNS = ["game_id", "home_score", "away_score", "ml_winner", "ats_winner", "ou_result"]
+
+
+def parse_scores_csv(text: str) -> pd.DataFrame:
+    """Parse pasted scores.
+
+    Needs away_score and home_score plus either game_id or away_team and
+    home_team columns, e.g. "away_team,home_team,away_score,home_score".
+    """
+    df = pd.read_csv(io.StringIO(text.strip()), skipinitialspace=True)
+    df.columns = [c.strip().lower() for c in df.columns]
+    if not {"away_score", "home_score"} <= set(df.columns):
+        raise ValueError("CSV needs away_score and home_score columns.")
+    if "game_id" not in df.columns and not {"away_team", "home_team"} <= set(df.columns):
+        raise ValueError("CSV needs a game_id column or away_team and home_team columns.")
+    return df
+
+
+def merge_scores(games: pd.DataFrame, scores: pd.DataFrame) -> pd.DataFrame:
+    """Attach pasted scores to the week's games by game_id or by matchup."""
+    games = games.drop(columns=["away_score", "home_score"], errors="ignore")
+    if "game_id" in scores.columns:
+        keyed = scores[["game_id", "away_score", "home_score"]]
+        return games.merge(keyed, on="game_id", how="left")
+    keyed = scores[["away_team", "home_team", "away_score", "home_score"]]
+    return games.merge(keyed, on=["away_team", "home_team"], how="left")
+
+
+def validate_scores(df: pd.DataFrame) -> list[str]:
+    """Check every entered score at once; rows with both scores blank are skipped."""
+    errors = []
+    away = pd.to_numeric(df["away_score"], errors="coerce")
+    home = pd.to_numeric(df["home_score"], errors="coerce")
+    entered = df["away_score"].notna() | df["home_score"].notna()
+    label = df["away_team"].astype(str) + " @ " + df["home_team"].astype(str)
+
+    for name in label[entered & (away.isna() | home.isna())]:
+        errors.append(f"{name}: both scores are required.")
+    both = entered & away.notna() & home.notna()
+    for name in label[both & ((away < 0) | (home < 0))]:
+        errors.append(f"{name}: scores cannot be negative.")
+    for name in label[both & ((away % 1 != 0) | (home % 1 != 0))]:
+        errors.append(f"{name}: scores must be whole numbers.")
+    return errors
+
+
+def grade_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute ML, ATS and O/U outcomes for every scored game in one pass.
+
+    `df` has game_id, away_team, home_team, spread, over_under, away_score and
+    home_score. The spread is the away team's line (away +3 = home favored
+    by 3), matching how the odds ingest stores it.
+    """
+    scored = df[df["away_score"].notna() & df["home_score"].notna()]
+    away = scored["away_score"].astype(int).to_numpy()
+    home = scored["home_score"].astype(int).to_numpy()
+    spread = pd.to_numeric(scored["spread"], errors="coerce").to_numpy(dtype=float)
+    line = pd.to_numeric(scored["over_under"], errors="coerce").to_numpy(dtype=float)
+    away_team = scored["away_team"].to_numpy(dtype=object)
+    home_team = scored["home_team"].to_numpy(dtype=object)
+
+    ml = np.where(away > home, away_team, np.where(home > away, home_team, None))
+
+    cover = np.sign(away + spread - home)
+    ats = np.where(cover > 0, away_team, np.where(cover < 0, home_team, "push"))
+    ats = np.where(np.isnan(spread), None, ats)
+
+    points = away + home
+    ou = np.where(points > line, "O", np.where(points < line, "U", "Push"))
+    ou = np.where(np.isnan(line), None, ou)
+
+    return pd.DataFrame({
+        "game_id": scored["game_id"].to_numpy(),
+        "home_score": home,
+        "away_score": away,
+        "ml_winner": ml,
+        "ats_winner": ats,
+        "ou_result": ou,
+    }, columns=RESULT_COLUMNS)
+
+
+def save_results(results: pd.DataFrame, games: pd.DataFrame = None) -> list:
+    """Write every results row in one upsert, then grade their picks in one call.
+
+    With `games` (the scored week, as passed to grade_results plus
+    season_year) the teams' season records move by the change in score.
+    """
+    if results.empty:
+        return []
+    rows = results.astype(object).where(results.notna(), None).to_dict("records")
+    for row in rows:
+        row["home_score"] = int(row["home_score"])
+        row["away_score"] = int(row["away_score"])
+    client = supa()
+    game_ids = [row["game_id"] for row in rows]
+    if games is not None:
+        previous = read(client.table("results").select("game_id, away_score, home_score")
+                        .in_("game_id", game_ids)).data
+        previous = pd.DataFrame(previous, columns=["game_id", "away_score", "home_score"])
+    client.table("results").upsert(rows, on_conflict="game_id").execute()
+    grade_picks(game_ids)
+    if games is not None:
+        update_team_records(games[games["game_id"].isin(game_ids)], previous)
+    return game_ids
+
+
+def grade_picks(game_ids):
+    """Mark picks.correct for the given games with the grade_picks RPC (sql/migrations/0005_grade_picks.sql)."""
+    if game_ids:
+        supa().rpc("grade_picks", {"game_ids": list(game_ids)}).execute()
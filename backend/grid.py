@@ -0,0 +1,99 @@
+# backend/grid.py
+import pandas as pd
+
+from backend.cache import cached
+from backend.db import read, supa
+from backend.slate import PickSlate
+
+CELL_COLUMNS = ["BB"] + [str(i) for i in range(1, 6)] + [f"O/U {i}" for i in range(1, 4)] + ["SD", "UD"]
+GRID_COLUMNS = ["Entry"] + CELL_COLUMNS + ["Comments"]
+# week_grid (sql/migrations/0013_week_grid.sql) columns, in CELL_COLUMNS order
+RPC_CELLS = ["bb"] + [f"ats_{i}" for i in range(1, 6)] + [f"ou_{i}" for i in range(1, 4)] + ["sd", "ud"]
+
+STATUS_STYLES = {
+    "W": "background-color: #d4edda",
+    "L": "background-color: #f8d7da",
+    "P": "background-color: #e2e3e5",
+}
+
+
+def _missing(value) -> bool:
+    return value is None or (not isinstance(value, str) and pd.isna(value))
+
+
+def cell_status(column, value, result) -> str:
+    """W, L or P for one grid cell against its game's results row, "" while ungraded.
+
+    Same rules as grade_picks: pushes are P, Sudden Death survives a tie and
+    Underdog must win outright.
+    """
+    if _missing(value) or result is None:
+        return ""
+    ml = result.get("ml_winner")
+    if column == "SD":
+        return "W" if _missing(ml) or value == ml else "L"
+    if column == "UD":
+        return "" if _missing(ml) else "W" if value == ml else "L"
+    outcome = result.get("ou_result") if column.startswith("O/U") else result.get("ats_winner")
+    if _missing(outcome):
+        return ""
+    if outcome in ("push", "Push"):
+        return "P"
+    return "W" if value == outcome else "L"
+
+
+def pivot_grid(users, picks, results, games, comments=None):
+    """Build a week's grid in Python from full reads; returns (grid, status) frames.
+
+    `users` maps user_id to entry abbreviation, `picks` are picks rows (any
+    weeks), `results` maps game_id to its results row, `games` are the
+    week's spreads rows in board order and `comments` maps user_id to the
+    weekly comment. This is the reference week_grid is checked against.
+    """
+    comments = comments or {}
+    by_user = {}
+    for row in picks:
+        by_user.setdefault(row["user_id"], []).append(row)
+
+    grid, status = [], []
+    for user_id, abbrev in sorted(((u, a) for u, a in users.items() if a), key=lambda item: (item[1], str(item[0]))):
+        slate = PickSlate.from_rows(games, by_user.get(user_id, []))
+        cells, codes = dict.fromkeys(CELL_COLUMNS), dict.fromkeys(CELL_COLUMNS, "")
+        ats_col, ou_col = 1, 1
+        for game_idx, pick_type, sel in slate.picks():
+            if pick_type == "ATS":
+                col, ats_col = str(ats_col), ats_col + 1
+            elif pick_type == "OU":
+                col, ou_col = f"O/U {ou_col}", ou_col + 1
+            else:
+                col = pick_type
+            if col not in cells:
+                continue
+            cells[col] = sel
+            codes[col] = cell_status(col, sel, results.get(slate.games[game_idx].game_id))
+        grid.append({"Entry": abbrev, **cells, "Comments": comments.get(user_id)})
+        status.append({"Entry": "", **codes, "Comments": ""})
+    return pd.DataFrame(grid, columns=GRID_COLUMNS), pd.DataFrame(status, columns=GRID_COLUMNS)
+
+
+def grid_from_rows(rows):
+    """(grid, status) frames from week_grid rows."""
+    grid, status = [], []
+    for row in rows:
+        grid.append({"Entry": row["entry"], **{col: row[rpc] for col, rpc in zip(CELL_COLUMNS, RPC_CELLS)},
+                     "Comments": row.get("comment")})
+        codes = (row.get("status") or "").ljust(len(CELL_COLUMNS), "-")
+        status.append({"Entry": "", **{col: "" if code == "-" else code for col, code in zip(CELL_COLUMNS, codes)},
+                       "Comments": ""})
+    return pd.DataFrame(grid, columns=GRID_COLUMNS), pd.DataFrame(status, columns=GRID_COLUMNS)
+
+
+@cached("picks", "results", "spreads", "users", "weekly_entries")
+def fetch_grid(week: int):
+    """The week's grid in one round trip through the week_grid RPC."""
+    return grid_from_rows(read(supa().rpc("week_grid", {"week": week})).data or [])
+
+
+def grid_styles(status: pd.DataFrame) -> pd.DataFrame:
+    """CSS per cell for Styler.apply(axis=None)."""
+    return status.apply(lambda col: col.map(lambda code: STATUS_STYLES.get(code, "")))
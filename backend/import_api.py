@@ -0,0 +1,93 @@
+# backend/import_api.py
+"""Minimal ASGI endpoint for bulk pick imports; serve with any ASGI server, e.g.
+
+    uvicorn backend.import_api:app --port 8502
+
+POST /picks/import?week=3[&dry_run=1] with a JSON or text/csv body (the
+formats in backend/imports.py) and `Authorization: Bearer $IMPORT_TOKEN`.
+The response is the import report as JSON.
+"""
+import asyncio
+import hmac
+import json
+import os
+from urllib.parse import parse_qs
+
+from backend.imports import import_picks, parse_csv, parse_json
+
+MAX_BODY = 5 * 1024 * 1024
+
+
+async def _respond(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _authorized(headers):
+    token = os.getenv("IMPORT_TOKEN")
+    given = headers.get(b"authorization", b"").decode()
+    return bool(token) and hmac.compare_digest(given, f"Bearer {token}")
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    if scope["path"] == "/health":
+        return await _respond(send, 200, {"ok": True})
+    if scope["path"] != "/picks/import":
+        return await _respond(send, 404, {"error": "Not found."})
+    if scope["method"] != "POST":
+        return await _respond(send, 405, {"error": "Use POST."})
+
+    headers = dict(scope["headers"])
+    if not _authorized(headers):
+        return await _respond(send, 401, {"error": "Missing or wrong bearer token."})
+
+    query = parse_qs(scope.get("query_string", b"").decode())
+    try:
+        week = int(query["week"][0])
+    except (KeyError, ValueError):
+        return await _respond(send, 400, {"error": "week query parameter is required."})
+    dry_run = query.get("dry_run", ["0"])[0] in ("1", "true")
+
+    body = await _read_body(receive)
+    if body is None:
+        return await _respond(send, 413, {"error": f"Body over {MAX_BODY} bytes."})
+    try:
+        if b"csv" in headers.get(b"content-type", b""):
+            rows = parse_csv(body.decode("utf-8"))
+        else:
+            rows = parse_json(body)
+    except (ValueError, TypeError, AttributeError) as e:
+        return await _respond(send, 400, {"error": f"Could not parse body: {e}"})
+
+    # Validation and batched writes are blocking; keep the event loop free.
+    report = await asyncio.to_thread(import_picks, rows, week, None, dry_run)
+    await _respond(send, 200, report)
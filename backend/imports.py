@@ -0,0 +1,146 @@
+# backend/imports.py
+import csv
+import datetime
+import io
+import json
+import time
+
+from backend.changefeed import change_feed
+from backend.db import read, read_all, supa
+from backend.season import calendar, season_of
+from backend.slate import TYPE_ALIASES, PickSlate, SlateGame
+
+BATCH_SIZE = 500  # picks rows per upsert request
+USER_CHUNK = 100  # user ids per cleanup delete, to keep request URLs short
+
+SELECTION_ALIASES = {"OVER": "O", "UNDER": "U"}
+
+
+def parse_csv(text: str) -> list[dict]:
+    """CSV with a header row: entry (or user_id), type, selection and optionally game_id or game."""
+    reader = csv.DictReader(io.StringIO(text.strip()), skipinitialspace=True)
+    return [{(k or "").strip().lower(): (v or "").strip() for k, v in row.items()} for row in reader]
+
+
+def parse_json(body) -> list[dict]:
+    """A list of pick objects, or {"picks": [...]}; also accepts {entry: [picks...]} slates."""
+    data = json.loads(body) if isinstance(body, (str, bytes)) else body
+    if isinstance(data, dict) and "picks" in data:
+        data = data["picks"]
+    if isinstance(data, dict):
+        data = [{**pick, "entry": entry} for entry, picks in data.items() for pick in picks]
+    return [{str(k).lower(): v for k, v in row.items()} for row in data]
+
+
+def _game_index(slate, row, pick_type, selection):
+    """Resolve a row to a game: by game_id, by a `game` team or AWAY@HOME, or by the picked team."""
+    if row.get("game_id"):
+        return slate.index_of(row["game_id"])
+    team = str(row.get("game") or "").split("@")[0].strip().upper()
+    if not team and pick_type != "OU":
+        team = selection
+    for idx, game in enumerate(slate.games):
+        if team in (game.away, game.home):
+            return idx
+    return None
+
+
+def validate_slates(rows, games, users, now=None, existing=None):
+    """Build one PickSlate per entry from import rows and check every rule in memory.
+
+    `users` maps entry abbreviation (upper case) and user id to user id.
+    `existing` maps user id to the picks rows the import cannot replace
+    (picks on locked games); each slate starts from them, so the limits
+    count them. Returns ({user_id: slate}, errors) where errors is a list
+    of {"row", "entry", "error"}; rejected rows leave the slate unchanged.
+    """
+    games = [g if isinstance(g, SlateGame) else SlateGame(g) for g in games]
+    existing = existing or {}
+    slates, errors, accepted = {}, [], set()
+    for n, row in enumerate(rows, start=1):
+        entry = str(row.get("entry") or row.get("user_id") or "").strip()
+        user_id = users.get(entry.upper()) or users.get(entry)
+        if not user_id:
+            errors.append({"row": n, "entry": entry, "error": f"Unknown entry {entry!r}."})
+            continue
+        raw_type = str(row.get("type") or "").strip().upper()
+        pick_type = TYPE_ALIASES.get(raw_type, raw_type)
+        selection = str(row.get("selection") or "").strip().upper()
+        selection = SELECTION_ALIASES.get(selection, selection)
+
+        slate = slates.get(user_id)
+        if slate is None:
+            slate = slates[user_id] = PickSlate.from_rows(games, existing.get(user_id, []))
+        idx = _game_index(slate, row, pick_type, selection)
+        if idx is None:
+            errors.append({"row": n, "entry": entry, "error": "No game this week matches that row."})
+            continue
+        ok, msg = slate.add(pick_type, idx, selection, now=now)
+        if ok:
+            accepted.add(user_id)
+        else:
+            errors.append({"row": n, "entry": entry, "error": msg})
+    # An entry with no accepted rows keeps its existing picks.
+    return {u: s for u, s in slates.items() if u in accepted}, errors
+
+
+def import_picks(rows, week: int, now=None, dry_run: bool = False) -> dict:
+    """Validate many entries' slates for a week and write the accepted picks in batches.
+
+    Each entry in the import replaces that entry's picks for the week,
+    except picks on games that have already locked. Returns a report with
+    counts, per-row errors and elapsed milliseconds.
+    """
+    started = time.perf_counter()
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    games = [SlateGame(g) for g in read_all(
+        "spreads",
+        "game_id, date, time, away_team, home_team, spread, over_under, underdog, underdog_points, lock_at",
+        filters=[("eq", "nfl_week", week)],
+    )]
+    users = {}
+    for u in read(supa().table("users").select("id, entry_abbreviation")).data or []:
+        users[u["id"]] = u["id"]
+        if u.get("entry_abbreviation"):
+            users[u["entry_abbreviation"].upper()] = u["id"]
+
+    # Picks on locked games stay; they count toward each entry's limits.
+    locked = [g.game_id for g in games if g.lock_at and now >= g.lock_at]
+    existing = {}
+    if locked:
+        for r in read_all("picks", "user_id, game_id, type, selection, over_under_pick, is_double, submitted_at",
+                          filters=[("in_", "game_id", locked)]):
+            existing.setdefault(r["user_id"], []).append(r)
+
+    slates, errors = validate_slates(rows, games, users, now=now, existing=existing)
+    week_start = calendar(season_of(now.date())).week_start(week).isoformat()
+    stamp = now.isoformat()
+    picks = [r for user_id, slate in slates.items() for r in slate.to_rows(user_id, week_start, stamp)
+             if r["game_id"] not in locked]
+
+    if picks and not dry_run:
+        client = supa()
+        for i in range(0, len(picks), BATCH_SIZE):
+            client.table("picks").upsert(picks[i:i + BATCH_SIZE], on_conflict="user_id,game_id,type").execute()
+        # Drop the entries' older picks for the week that the import did not repeat.
+        user_ids = list(slates)
+        for i in range(0, len(user_ids), USER_CHUNK):
+            stale = client.table("picks").delete() \
+                .in_("user_id", user_ids[i:i + USER_CHUNK]) \
+                .eq("week_start", week_start) \
+                .lt("submitted_at", stamp)
+            if locked:
+                stale = stale.not_.in_("game_id", locked)
+            stale.execute()
+        change_feed().publish("picks", week=week, week_start=week_start)
+
+    return {
+        "week": week,
+        "week_start": week_start,
+        "entries": len(slates),
+        "accepted": len(picks),
+        "rejected": len(errors),
+        "dry_run": dry_run,
+        "ms": round((time.perf_counter() - started) * 1000, 1),
+        "errors": errors,
+    }
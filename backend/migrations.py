@@ -0,0 +1,89 @@
+# backend/migrations.py
+import glob
+import hashlib
+import os
+import re
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql", "migrations")
+FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+
+def migration_files() -> list[tuple[str, str, str]]:
+    """(version, name, path) for every file in sql/migrations, in version order."""
+    found = []
+    for path in sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql"))):
+        match = FILE_PATTERN.match(os.path.basename(path))
+        if match:
+            found.append((match.group(1), match.group(2), path))
+    return found
+
+
+def checksum(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def connect(dsn: str = None):
+    """Autocommit psycopg connection to DATABASE_URL (or `dsn`)."""
+    import psycopg
+
+    dsn = dsn or os.getenv("DATABASE_URL")
+    if not dsn:
+        raise RuntimeError("Set DATABASE_URL to a Postgres connection string.")
+    return psycopg.connect(dsn, autocommit=True)
+
+
+def applied(conn) -> dict:
+    """version -> checksum of migrations already recorded in schema_migrations."""
+    conn.execute(
+        "create table if not exists schema_migrations ("
+        "version text primary key, name text not null, checksum text not null, "
+        "applied_at timestamptz not null default now())"
+    )
+    return dict(conn.execute("select version, checksum from schema_migrations").fetchall())
+
+
+def pending(conn) -> list[tuple[str, str, str]]:
+    done = applied(conn)
+    for version, name, path in migration_files():
+        if version in done and done[version] != checksum(path):
+            print(f"Warning: {version}_{name}.sql changed after it was applied.")
+    return [m for m in migration_files() if m[0] not in done]
+
+
+def _record(conn, version, name, path):
+    conn.execute(
+        "insert into schema_migrations (version, name, checksum) values (%s, %s, %s)",
+        (version, name, checksum(path)),
+    )
+
+
+def migrate(conn, target: str = None) -> list[str]:
+    """Apply pending migrations up to `target`, each in its own transaction."""
+    done = []
+    for version, name, path in pending(conn):
+        if target and version > target:
+            break
+        with open(path) as f:
+            sql = f.read()
+        with conn.transaction():
+            conn.execute(sql)
+            _record(conn, version, name, path)
+        print(f"Applied {version}_{name}")
+        done.append(version)
+    return done
+
+
+def baseline(conn, through: str) -> list[str]:
+    """Record migrations up to `through` as applied without running them.
+
+    For existing databases, which already hold the base schema (0001) but
+    none of the later migrations: baseline through 0001, then migrate.
+    """
+    done = []
+    for version, name, path in pending(conn):
+        if version > through:
+            break
+        _record(conn, version, name, path)
+        done.append(version)
+    return done
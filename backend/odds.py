@@ -4,55 +4,34 @@ import json
 import requests
 import datetime
 import pytz
-import streamlit as st
-from backend.db import supa
+from backend.db import read, supa
+from backend.cache import cached
+from backend import season
 from collections import Counter
 
 class NFLDataService:
     def __init__(self):
         self.odds_api_key = os.getenv("ODDS_API_KEY")
         
-    @st.cache_data(ttl=3600)  # Cache for 1 hour
+    @cached("spreads")  # Invalidated by the change feed
     def get_spreads_for_week(_self, week: int):
-        """Get spreads from database with caching"""
-        try:
-            client = supa()
-            data = client.table("spreads") \
-                .select("nfl_game_id, date, time, away, home, spread, total") \
-                .eq("nfl_week", week) \
-                .order("date") \
-                .order("time") \
-                .execute()
-            
-            return data.data or []
-            
-        except Exception as e:
-            print(f"Error fetching spreads: {e}")
-            return []
+        """Get spreads from database with caching; raises DatabaseUnavailable rather than caching []"""
+        data = read(
+            supa().table("spreads")
+            .select("nfl_game_id, date, time, away, home, spread, total")
+            .eq("nfl_week", week)
+            .order("date")
+            .order("time")
+        )
+        return data.data or []
     
-    @st.cache_data(ttl=1800)  # Cache for 30 minutes
+    @cached("nfl_teams")
     def get_team_logos(_self):
         """Get all team logos as a lookup dict"""
-        try:
-            client = supa()
-            data = client.table("nfl_teams") \
-                .select("abbrev, logo_url") \
-                .execute()
-            
-            return {team['abbrev']: team['logo_url'] 
-                   for team in data.data if team.get('logo_url')}
-        except:
-            return {}
+        data = read(supa().table("nfl_teams").select("abbrev, logo_url"))
+        return {team['abbrev']: team['logo_url']
+                for team in data.data if team.get('logo_url')}
     
-def get_current_week(self):
-    """Calculate current NFL week"""
-    today = datetime.date.today()
-    season_start = datetime.date(2025, 9, 3)  # Wednesday 9/3
-    if today < season_start:
-        return 1
-    delta_days = (today - season_start).days
-    return min(18, max(1, (delta_days // 7) + 1))
-
 # Global instance
 nfl_data = NFLDataService()
 
@@ -67,128 +46,229 @@ def get_team_logo(team_abbrev: str):
     return logos.get(team_abbrev)
 
 def get_current_nfl_week():
-    """Drop-in replacement"""
-    return nfl_data.get_current_week()
+    """Drop-in replacement; see backend/season.py"""
+    return season.current_week()
 
 # Updated freeze functionality for new schema
-def fetch_odds():
-    """Fetch odds from API"""
+ODDS_API_URL = "https://api.the-odds-api.com/v4/sports/americanfootball_nfl/odds"
+
+def fetch_odds_raw():
+    """Fetch the undecoded /odds body and the request credits the Odds API reports as remaining.
+
+    Returns (body bytes, remaining); remaining is None if the header is missing.
+    """
     api_key = os.environ.get("ODDS_API_KEY")
     if not api_key:
         raise RuntimeError("Missing ODDS_API_KEY in environment")
 
-    url = "https://api.the-odds-api.com/v4/sports/americanfootball_nfl/odds"
     params = {
         "apiKey": api_key,
         "regions": "us",
         "markets": "spreads,totals",
         "oddsFormat": "american"
     }
-    r = requests.get(url, params=params, timeout=20)
+    r = requests.get(ODDS_API_URL, params=params, timeout=20)
     r.raise_for_status()
-    return r.json()
+    remaining = r.headers.get("x-requests-remaining")
+    return r.content, int(float(remaining)) if remaining is not None else None
 
-def upsert_games(week: int):
-    client = supa()
+def fetch_odds_with_quota():
+    """Fetch odds and the remaining request credits; returns (games, remaining)."""
+    body, remaining = fetch_odds_raw()
+    return json.loads(body), remaining
+
+def fetch_odds():
+    """Fetch odds from API"""
+    return fetch_odds_with_quota()[0]
+
+# Columns of the canonical per-game table; `spreads` and `games` are views
+# over it (sql/migrations/0002_canonical_games.sql).
+GAME_COLUMNS = (
+    "season_year", "nfl_week", "kickoff", "date", "start_time", "away", "home", "spread", "total",
+    "favorite", "underdog", "underdog_points", "home_line", "lock_at",
+)
+
+@cached("nfl_teams")
+def fetch_team_map():
+    """Odds API team name -> abbreviation, fetched once per process."""
+    teams = read(supa().table("nfl_teams").select("team_name, abbrev")).data or []
+    return {team["team_name"]: team["abbrev"] for team in teams}
+
+def get_nfl_week_from_date(game_date):
+    """Which NFL week a game belongs to based on its Eastern date; None outside the regular season"""
+    return season.week_of(game_date)
+
+def consensus_line(game):
+    """Most common away spread and total across bookmakers."""
+    away_team = game["away_team"]
+    game_spreads = []
+    game_totals = []
+
+    for bookmaker in game.get("bookmakers", []):
+        for market in bookmaker.get("markets", []):
+            if market["key"] == "spreads" and market["outcomes"]:
+                # Find away team spread
+                for outcome in market["outcomes"]:
+                    if outcome["name"] == away_team:
+                        game_spreads.append(float(outcome["point"]))
+                        break
+            elif market["key"] == "totals" and market["outcomes"]:
+                game_totals.append(float(market["outcomes"][0]["point"]))
+
+    spread = Counter(game_spreads).most_common(1)[0][0] if game_spreads else None
+    total = Counter(game_totals).most_common(1)[0][0] if game_totals else None
+    return spread, total
+
+def line_fields(away: str, home: str, spread: float, kickoff: datetime.datetime) -> dict:
+    """Favorite, underdog, underdog points, home line and UTC lock time for one game.
+
+    `spread` is the away team's line (away +3 = home favored by 3). A pick'em
+    has no favorite or underdog. Picks lock at kickoff.
+    """
+    if spread > 0:
+        favorite, underdog = home, away
+    elif spread < 0:
+        favorite, underdog = away, home
+    else:
+        favorite = underdog = None
+    return {
+        "favorite": favorite,
+        "underdog": underdog,
+        "underdog_points": abs(spread) if underdog else None,
+        "home_line": -spread if spread else 0.0,
+        "lock_at": kickoff.astimezone(datetime.timezone.utc).isoformat(),
+    }
+
+def game_rows_from_odds(odds_data, week: int, team_map: dict, week_of=None, errors=None):
+    """Build canonical game rows for one week, with abbreviations resolved at ingest.
+
+    `week_of` maps a game's Eastern kickoff date to its NFL week (the season
+    calendar by default); preseason and playoff games have none and are
+    skipped. Games that
+    fail to parse are skipped; their messages are appended to `errors` if given.
+    """
     eastern_tz = pytz.timezone("US/Eastern")
-    
-    # Get team abbreviation mapping
-    teams_data = client.table("nfl_teams").select("team_name, abbrev").execute()
-    team_map = {team['team_name']: team['abbrev'] for team in teams_data.data}
-    
-    odds_data = fetch_odds()
-    games_to_insert = []
-    spreads_to_insert = []
-    
+    week_of = week_of or get_nfl_week_from_date
+    rows = []
+
     for game in odds_data:
         try:
-            home_team = game["home_team"]
-            away_team = game["away_team"]
             start_time = datetime.datetime.fromisoformat(game["commence_time"].replace("Z", "+00:00"))
             eastern_time = start_time.astimezone(eastern_tz)
-            
-            # Calculate which NFL week this game belongs to based on its date
-            def get_nfl_week_from_date(game_date):
-                season_start = datetime.date(2025, 9, 3)  # Wednesday 9/3
-                if game_date < season_start:
-                    return 1
-                delta_days = (game_date - season_start).days
-                return min(18, max(1, (delta_days // 7) + 1))
-
-            game_week = get_nfl_week_from_date(eastern_time.date())
-            if game_week != week:
+            game_week = week_of(eastern_time.date())
+            if game_week is None or game_week != week:
                 continue
-            
-            # Collect all spreads and totals from all bookmakers
-            game_spreads = []
-            game_totals = []
-            
-            for bookmaker in game.get("bookmakers", []):
-                for market in bookmaker.get("markets", []):
-                    if market["key"] == "spreads" and market["outcomes"]:
-                        # Find away team spread
-                        for outcome in market["outcomes"]:
-                            if outcome["name"] == away_team:
-                                game_spreads.append(float(outcome["point"]))
-                                break
-                    elif market["key"] == "totals" and market["outcomes"]:
-                        game_totals.append(float(market["outcomes"][0]["point"]))
-
-            # Find the most common spread and total
-            spread = None
-            total = None
-
-            if game_spreads:
-                spread_counts = Counter(game_spreads)
-                spread = spread_counts.most_common(1)[0][0]  # Most frequent spread
-
-            if game_totals:
-                total_counts = Counter(game_totals)
-                total = total_counts.most_common(1)[0][0]  # Most frequent total
-            
-            if spread is not None and total is not None:
-                # Create game_id 
-                game_id = f"{2025}-{week:02d}-{team_map.get(away_team, away_team).lower()}-{team_map.get(home_team, home_team).lower()}"
-                
-                # Prepare nfl_games insert
-                games_to_insert.append({
-                    "away": team_map.get(away_team, away_team),
-                    "home": team_map.get(home_team, home_team),
-                    "season_year": 2025,
-                    "nfl_week": week,
-                    "game_id": game_id,
-                    "date": eastern_time.date().isoformat(),
-                    "start_time": eastern_time.time().isoformat(),
-                    "spread": spread,
-                    "total": total,
-                    "locked": eastern_time < datetime.datetime.now(eastern_tz)
-                })
-                
-                # Prepare spreads insert
-                spreads_to_insert.append({
-                    "nfl_game_id": game_id,
-                    "season_year": 2025,
-                    "nfl_week": week,
-                    "date": eastern_time.date().isoformat(),
-                    "time": eastern_time.time().isoformat(),
-                    "away": team_map.get(away_team, away_team),
-                    "home": team_map.get(home_team, home_team),
-                    "spread": spread,
-                    "total": total,
-                    "locked": eastern_time < datetime.datetime.now(eastern_tz)
-                })
-                
+
+            spread, total = consensus_line(game)
+            if spread is None or total is None:
+                continue
+
+            away = team_map.get(game["away_team"], game["away_team"])
+            home = team_map.get(game["home_team"], game["home_team"])
+            rows.append({
+                "game_id": game["id"],
+                "season_year": season.season_of(eastern_time.date()),
+                "nfl_week": week,
+                "kickoff": start_time.isoformat(),
+                "date": eastern_time.date().isoformat(),
+                "start_time": eastern_time.time().strftime("%H:%M:%S"),
+                "away": away,
+                "home": home,
+                "spread": spread,
+                "total": total,
+                **line_fields(away, home, spread, start_time),
+            })
         except Exception as e:
             print(f"Error processing game: {e}")
+            if errors is not None:
+                errors.append(f"Error processing game: {e}")
             continue
-    
-    # Insert into both tables
-    if games_to_insert:
-        client.table("nfl_games").upsert(games_to_insert, on_conflict="game_id").execute()
-        print(f"Upserted {len(games_to_insert)} games")
-    
-    if spreads_to_insert:
-        client.table("spreads").upsert(spreads_to_insert, on_conflict="nfl_game_id").execute()
-        print(f"Upserted {len(spreads_to_insert)} spreads")
-        
-    return len(games_to_insert)
\ No newline at end of file
+
+    return rows
+
+def _norm(value):
+    """Compare numbers as numbers and everything else as text."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+def _same_game(old, new):
+    return all(_norm(old.get(col)) == _norm(new.get(col)) for col in GAME_COLUMNS)
+
+def _upcoming(row, now: datetime.datetime) -> bool:
+    """Whether a stored game is known to kick off after `now`."""
+    if not row.get("kickoff"):
+        return False
+    return datetime.datetime.fromisoformat(str(row["kickoff"]).replace("Z", "+00:00")) > now
+
+def diff_games(rows, week: int, prune: bool = True, final: bool = False):
+    """Keyed diff of a week's rows against nfl_games.
+
+    Returns (changed rows stamped with locked_at, game ids to delete, rows
+    read from nfl_games). Games missing from `rows` are only deleted when
+    `prune` is on (partial freezes of a few games turn it off), and only if
+    they have not kicked off: /odds drops games once they start, and played
+    games must stay for picks, results and grading.
+
+    The freeze scheduler writes with `final` on, stamping line_frozen_at on
+    each of its rows; other freezes leave those games' lines alone.
+    """
+    started = datetime.datetime.now(datetime.timezone.utc)
+    now = started.isoformat()
+    existing = read(
+        supa().table("nfl_games")
+        .select("game_id, line_frozen_at, " + ", ".join(GAME_COLUMNS))
+        .eq("nfl_week", week)
+    ).data or []
+    current = {row["game_id"]: row for row in existing}
+    fresh_ids = {row["game_id"] for row in rows}
+    frozen = {game_id for game_id, row in current.items() if row.get("line_frozen_at")}
+
+    if final:
+        changed = [{**row, "locked_at": now, "line_frozen_at": now} for row in rows]
+    else:
+        changed = [{**row, "locked_at": now} for row in rows
+                   if row["game_id"] not in frozen
+                   and (row["game_id"] not in current or not _same_game(current[row["game_id"]], row))]
+    gone = [game_id for game_id, row in current.items()
+            if game_id not in fresh_ids and game_id not in frozen and _upcoming(row, started)] if prune else []
+    return changed, gone, existing
+
+def apply_game_diff(changed, gone):
+    """Upsert changed games and delete gone ones, one request each.
+
+    New rows are keyed by Odds API event id; games still stored under the
+    old constructed id (2025-01-dal-phi) are then moved onto it, picks and
+    results included (sql/migrations/0017_legacy_game_ids.sql).
+    """
+    client = supa()
+    if changed:
+        client.table("nfl_games").upsert(changed, on_conflict="game_id").execute()
+        for week in sorted({row["nfl_week"] for row in changed}):
+            client.rpc("adopt_legacy_game_ids", {"week": week}).execute()
+    if gone:
+        client.table("nfl_games").delete().in_("game_id", gone).execute()
+
+def write_games(rows, week: int, prune: bool = True, final: bool = False):
+    """Diff a week's rows against nfl_games and write only the differences.
+
+    Unchanged rows are left alone. Returns (changed, removed, unchanged) counts.
+    """
+    changed, gone, _ = diff_games(rows, week, prune, final)
+    apply_game_diff(changed, gone)
+    return len(changed), len(gone), len(rows) - len(changed)
+
+def upsert_games(week: int, source: str = "admin"):
+    """Run an instrumented freeze for `week`; returns its run report (backend/freeze.py).
+
+    Games missing from the feed are pruned only while they have not kicked
+    off, and never when the feed has no lines for the week at all.
+    """
+    from backend.freeze import run_freeze
+
+    report = run_freeze(week, source=source, prune=True)
+    print(f"Games: {report['changed']} upserted, {report['removed']} removed, {report['unchanged']} unchanged")
+    return report
@@ -0,0 +1,112 @@
+# backend/picksync.py
+import datetime
+import os
+import threading
+import time
+
+from backend.db import counters, iter_table
+
+PICK_KEY = ("user_id", "game_id", "type")
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Rows are asked for from a little before the mark: a transaction that
+# started earlier can commit after a later one, and re-reading a few rows is
+# harmless since merging is idempotent.
+OVERLAP = datetime.timedelta(seconds=int(os.getenv("PICKS_SYNC_OVERLAP", "30")))
+# Tombstones are purged after this long (sql/migrations/0010_picks_sync.sql);
+# a process that has not synced for that long could miss deletes, so it
+# reloads everything.
+TOMBSTONE_RETENTION = datetime.timedelta(days=int(os.getenv("PICKS_TOMBSTONE_DAYS", "7")))
+FULL_RESYNC = int(os.getenv("PICKS_FULL_RESYNC", "3600"))  # seconds between safety-net reloads
+
+
+def _ts(value) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+class PickSync:
+    """Per-process copy of the picks table kept current by delta reads.
+
+    refresh() asks only for picks whose updated_at is past the high-water
+    mark and for tombstones of picks deleted since then, so its cost follows
+    recent activity rather than league size.
+    """
+
+    def __init__(self, columns: str):
+        self.columns = columns
+        self._rows = {}
+        self._stamps = {}
+        self._deleted = {}
+        self._mark = EPOCH
+        self._full_at = None
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    def rows(self) -> list[dict]:
+        with self._lock:
+            return list(self._rows.values())
+
+    def refresh(self) -> list[dict]:
+        """Bring the copy up to date and return every current pick."""
+        with self._lock:
+            now = time.monotonic()
+            if (self._full_at is None or now - self._full_at > FULL_RESYNC
+                    or now - self._synced_at > TOMBSTONE_RETENTION.total_seconds()):
+                self._load_all()
+                self._full_at = now
+            else:
+                self._load_since(self._mark - OVERLAP)
+            self._synced_at = now
+            return list(self._rows.values())
+
+    def _columns(self):
+        selected = [c.strip() for c in self.columns.split(",")]
+        return ", ".join(selected + [c for c in (*PICK_KEY, "updated_at") if c not in selected])
+
+    def _merge(self, row):
+        key = tuple(row[k] for k in PICK_KEY)
+        stamp = _ts(row["updated_at"])
+        if self._stamps.get(key, EPOCH) > stamp or self._deleted.get(key, EPOCH) >= stamp:
+            return False
+        self._stamps[key] = stamp
+        self._rows[key] = {k: v for k, v in row.items() if k != "updated_at"}
+        self._mark = max(self._mark, stamp)
+        return True
+
+    def _load_all(self):
+        self._rows, self._stamps, self._deleted, self._mark = {}, {}, {}, EPOCH
+        for row in iter_table("picks", self._columns(), prefetch=True):
+            self._merge(row)
+        counters["picks_full_syncs"] += 1
+
+    def _load_since(self, since):
+        since = since.isoformat()
+        changed = 0
+        for row in iter_table("picks", self._columns(), filters=[("gt", "updated_at", since)]):
+            changed += self._merge(row)
+        deleted = 0
+        for tomb in iter_table("pick_tombstones", "user_id, game_id, type, deleted_at",
+                               filters=[("gt", "deleted_at", since)]):
+            key = tuple(tomb[k] for k in PICK_KEY)
+            stamp = _ts(tomb["deleted_at"])
+            # A pick re-made after its delete is newer than the tombstone.
+            if self._deleted.get(key, EPOCH) < stamp:
+                self._deleted[key] = stamp
+            if key in self._rows and self._stamps[key] <= stamp:
+                del self._rows[key]
+                deleted += 1
+            self._mark = max(self._mark, stamp)
+        counters["picks_delta_syncs"] += 1
+        counters["picks_delta_rows"] += changed + deleted
+
+
+_syncs = {}
+_syncs_lock = threading.Lock()
+
+
+def pick_sync(columns: str) -> PickSync:
+    """The process-wide PickSync for a column list."""
+    with _syncs_lock:
+        if columns not in _syncs:
+            _syncs[columns] = PickSync(columns)
+        return _syncs[columns]
@@ -0,0 +1,120 @@
+# backend/profiler.py
+import collections
+import contextlib
+import datetime
+import os
+import random
+import sys
+import threading
+import time
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", ".profiles")
+INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+MAX_RUNS = 50  # recent reruns kept in memory for the admin summary
+
+_recent = collections.deque(maxlen=MAX_RUNS)  # (label, seconds, Counter of collapsed stacks)
+_recent_lock = threading.Lock()
+
+
+def profiling_enabled(session_state) -> bool:
+    """Opt-in per session (admin toggle) or for a sampled share of all sessions.
+
+    PROFILE_SAMPLE_RATE=0.05 profiles about 5% of sessions; the choice is
+    made once per session so a profiled session stays profiled.
+    """
+    if session_state.get("profile_reruns"):
+        return True
+    if "profile_sampled" not in session_state:
+        rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0") or 0)
+        session_state["profile_sampled"] = random.random() < rate
+    return session_state["profile_sampled"]
+
+
+class Sampler:
+    """Samples one thread's Python stack on a timer from a helper thread.
+
+    The profiled code runs untouched; each tick costs one stack walk, so
+    overhead stays around a few percent at the default 5 ms interval.
+    """
+
+    def __init__(self, thread_id: int, interval: float = INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rerun-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            parts = []
+            while frame is not None:
+                code = frame.f_code
+                parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(parts))] += 1
+
+
+@contextlib.contextmanager
+def profile_run(label: str, enabled: bool = True):
+    """Sample the enclosed script run and save collapsed stacks to PROFILE_DIR.
+
+    Output is one `stack count` line per unique stack, the format read by
+    flamegraph.pl and speedscope.
+    """
+    if not enabled:
+        yield
+        return
+    sampler = Sampler(threading.get_ident())
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        elapsed = time.perf_counter() - started
+        with _recent_lock:
+            _recent.append((label, elapsed, sampler.stacks))
+        _write_collapsed(label, sampler.stacks)
+
+
+def _write_collapsed(label, stacks):
+    if not stacks:
+        return
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        name = f"{stamp}-{label.replace('/', '_').replace('.', '_')}.collapsed"
+        with open(os.path.join(PROFILE_DIR, name), "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+    except OSError as e:
+        print(f"Could not write profile: {e}")
+
+
+def top_functions(limit: int = 25):
+    """(top functions by cumulative and self time, recent run durations) across profiled reruns."""
+    cumulative = collections.Counter()
+    own = collections.Counter()
+    with _recent_lock:
+        runs = list(_recent)
+    for _, _, stacks in runs:
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            for fn in set(frames):
+                cumulative[fn] += count
+            own[frames[-1]] += count
+    ms = INTERVAL * 1000
+    return [
+        {"function": fn, "cumulative_ms": round(n * ms, 1), "self_ms": round(own[fn] * ms, 1)}
+        for fn, n in cumulative.most_common(limit)
+    ], [{"run": label, "seconds": round(secs, 3)} for label, secs, _ in runs]
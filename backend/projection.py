@@ -0,0 +1,213 @@
+# backend/projection.py
+import os
+from math import erf, sqrt
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend.season import REGULAR_SEASON_WEEKS
+from backend.slate import PickSlate
+
+# Historical NFL spread of final margins and totals around the closing line.
+MARGIN_SD = 13.5
+TOTAL_SD = 13.0
+PICKS_PER_WEEK = 10  # BB counts double + 5 ATS + 3 O/U
+SEASON_WEEKS = REGULAR_SEASON_WEEKS
+
+
+def _score(value):
+    """Score as a float, or None when missing (None, NaN or pandas NA)."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(value) else value
+
+
+class WeekInputs:
+    """Everything the simulator needs for one week, as dense arrays.
+
+    Lines are per game (G); picks are per entry and game (E x G). ATS sides
+    are +1 for the away team and -1 for the home team, weighted 2 for the
+    Best Bet; O/U sides are +1 over and -1 under.
+    """
+
+    __slots__ = ("entries", "spread", "total", "final_margin", "final_total",
+                 "ats_side", "ats_weight", "ou_side", "season_wins", "season_losses")
+
+    def __init__(self, games, slates, results=None, season=None):
+        results = results or {}
+        season = season or {}
+        self.entries = list(slates)
+        g, e = len(games), len(self.entries)
+        self.spread = np.array([float(x.spread or 0.0) for x in games])
+        self.total = np.array([float(x.total or 0.0) for x in games])
+        # Finished games keep their real score in every scenario (NaN = still to play).
+        self.final_margin = np.full(g, np.nan)
+        self.final_total = np.full(g, np.nan)
+        for i, game in enumerate(games):
+            res = results.get(game.game_id) or {}
+            home, away = _score(res.get("home_score")), _score(res.get("away_score"))
+            if home is not None and away is not None:
+                self.final_margin[i] = home - away
+                self.final_total[i] = home + away
+
+        self.ats_side = np.zeros((e, g), dtype=np.int8)
+        self.ats_weight = np.zeros((e, g), dtype=np.int8)
+        self.ou_side = np.zeros((e, g), dtype=np.int8)
+        for row, entry in enumerate(self.entries):
+            slate = slates[entry]
+            for idx, pick_type, sel in slate.picks():
+                side = 1 if sel == slate.games[idx].away else -1
+                if pick_type in ("BB", "ATS"):
+                    self.ats_side[row, idx] = side
+                    self.ats_weight[row, idx] = 2 if pick_type == "BB" else 1
+                elif pick_type == "OU":
+                    self.ou_side[row, idx] = 1 if sel == "O" else -1
+
+        self.season_wins = np.array([season.get(x, (0, 0))[0] for x in self.entries], dtype=np.float64)
+        self.season_losses = np.array([season.get(x, (0, 0))[1] for x in self.entries], dtype=np.float64)
+        # season_standings already counts this week's graded games, and the
+        # simulator adds the whole week on top, so take those out first.
+        done, away_cover, over = _final_signs(self)
+        if done.any():
+            wins, losses = _tally(self, away_cover[None, :], over[None, :])
+            self.season_wins = np.clip(self.season_wins - wins[0], 0, None)
+            self.season_losses = np.clip(self.season_losses - losses[0], 0, None)
+
+
+def cover_probabilities(spread, total, margin_sd=MARGIN_SD, total_sd=TOTAL_SD):
+    """P(away covers), P(home covers), P(over) and P(under) per game.
+
+    Final margins and totals are rounded normals around the line. Half-point
+    lines are 50/50; on whole-number lines the rest is the push.
+    """
+    spread = np.asarray(spread, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    phi = np.vectorize(lambda z: 0.5 * (1 + erf(z / sqrt(2))), otypes=[np.float64])
+    away = phi((np.ceil(spread) - 0.5 - spread) / margin_sd)
+    home = 1 - phi((np.floor(spread) + 0.5 - spread) / margin_sd)
+    over = 1 - phi((np.floor(total) + 0.5 - total) / total_sd)
+    under = phi((np.ceil(total) - 0.5 - total) / total_sd)
+    return away, home, over, under
+
+
+def _tally(inputs: WeekInputs, away_cover, over):
+    """(wins, losses) shaped (n, E) for outcome signs shaped (n, G).
+
+    `away_cover` is +1 when the away team covers, -1 when home does and 0
+    on a push; `over` likewise for the total.
+    """
+    # One (n, 4G) outcome matrix against (4G, E) weight matrices grades
+    # every entry's slate in every scenario with two BLAS calls.
+    outcomes = np.concatenate(
+        [away_cover > 0, away_cover < 0, over > 0, over < 0], axis=1
+    ).astype(np.float64)
+    ats = (inputs.ats_side * inputs.ats_weight).T.astype(np.float64)  # (G, E) signed weights
+    ats_away, ats_home = np.clip(ats, 0, None), np.clip(-ats, 0, None)
+    ou_over = (inputs.ou_side > 0).T.astype(np.float64)
+    ou_under = (inputs.ou_side < 0).T.astype(np.float64)
+    wins = outcomes @ np.concatenate([ats_away, ats_home, ou_over, ou_under])
+    losses = outcomes @ np.concatenate([ats_home, ats_away, ou_under, ou_over])
+    return wins, losses
+
+
+def _final_signs(inputs: WeekInputs):
+    """(done mask, away_cover, over) for the games that already have a score."""
+    done = ~np.isnan(inputs.final_margin)
+    away_cover = np.where(done, np.sign(inputs.spread - np.nan_to_num(inputs.final_margin)), 0)
+    over = np.where(done, np.sign(np.nan_to_num(inputs.final_total) - inputs.total), 0)
+    return done, away_cover, over
+
+
+def _grade(inputs: WeekInputs, n: int, rng):
+    """Simulate n scenarios; returns (wins, losses) arrays shaped (n, E)."""
+    g = len(inputs.spread)
+    p_away, p_home, p_over, p_under = cover_probabilities(inputs.spread, inputs.total)
+    # Each unplayed game covers or goes over with its line's probability;
+    # every entry sees the same outcome for a game within a scenario.
+    u = rng.random((n, g))
+    away_cover = np.where(u < p_away, 1, np.where(u >= 1 - p_home, -1, 0))
+    u = rng.random((n, g))
+    over = np.where(u < p_over, 1, np.where(u >= 1 - p_under, -1, 0))
+    done, final_cover, final_over = _final_signs(inputs)
+    away_cover[:, done] = final_cover[done]
+    over[:, done] = final_over[done]
+    return _tally(inputs, away_cover, over)
+
+
+def _win_share(wins, losses):
+    """Per-scenario share of first place (ties split), summed over scenarios."""
+    key = wins * 1000.0 - losses  # most wins, then fewest losses
+    best = key.max(axis=1, keepdims=True)
+    leaders = key == best
+    return (leaders / leaders.sum(axis=1, keepdims=True)).sum(axis=0)
+
+
+def _simulate_chunk(inputs: WeekInputs, n: int, remaining_weeks: int, seed):
+    rng = np.random.default_rng(seed)
+    wins, losses = _grade(inputs, n, rng)
+    week_share = _win_share(wins, losses)
+
+    season_wins = inputs.season_wins + wins
+    season_losses = inputs.season_losses + losses
+    if remaining_weeks > 0:
+        # Later weeks have no lines or picks yet: treat each pick as a coin
+        # flip, using the normal approximation to Binomial(picks, 0.5).
+        picks = PICKS_PER_WEEK * remaining_weeks
+        future = np.clip(np.rint(rng.normal(picks / 2, np.sqrt(picks) / 2, size=wins.shape)), 0, picks)
+        season_wins = season_wins + future
+        season_losses = season_losses + (picks - future)
+    season_share = _win_share(season_wins, season_losses)
+    return week_share, season_share, wins.mean(axis=0)
+
+
+def simulate(inputs: WeekInputs, scenarios: int = 20000, remaining_weeks: int = 0,
+             seed=None, workers: int = 0, chunk: int = 5000):
+    """Monte Carlo week and season win probabilities for every entry.
+
+    Scenarios are graded in chunks of `chunk` to bound memory; with
+    workers > 1 the chunks run in a process pool. Returns a list of dicts
+    sorted by season probability.
+    """
+    if not inputs.entries:
+        return []
+    seeds = np.random.SeedSequence(seed).spawn(max(1, -(-scenarios // chunk)))
+    sizes = [min(chunk, scenarios - i * chunk) for i in range(len(seeds))]
+
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_chunk, [inputs] * len(seeds), sizes,
+                                  [remaining_weeks] * len(seeds), seeds))
+    else:
+        parts = [_simulate_chunk(inputs, n, remaining_weeks, s) for n, s in zip(sizes, seeds)]
+
+    week = sum(p[0] for p in parts) / scenarios
+    season = sum(p[1] for p in parts) / scenarios
+    expected = sum(p[2] * n for p, n in zip(parts, sizes)) / scenarios
+    report = [
+        {"entry": entry, "week_win_pct": float(week[i]), "season_win_pct": float(season[i]),
+         "expected_wins": float(expected[i])}
+        for i, entry in enumerate(inputs.entries)
+    ]
+    return sorted(report, key=lambda r: (-r["season_win_pct"], -r["week_win_pct"]))
+
+
+def load_week_inputs(games, picks, results, users, season_rows=()):
+    """Build WeekInputs from rows already fetched by the page.
+
+    `games` are the week's spreads rows, `picks` any picks rows (other weeks
+    are ignored by the slate), `results` rows keyed by game_id, `users` a
+    user_id -> entry abbreviation map and `season_rows` season_standings.
+    """
+    game_objs = PickSlate(games).games
+    by_user = {}
+    for row in picks:
+        by_user.setdefault(row["user_id"], []).append(row)
+    slates = {abbrev: PickSlate.from_rows(game_objs, by_user.get(uid, [])) for uid, abbrev in users.items()}
+    season = {r["entry_abbreviation"]: (r.get("wins") or 0, r.get("losses") or 0) for r in season_rows}
+    return WeekInputs(game_objs, slates, results=results, season=season)
+
+
+def default_workers():
+    return int(os.getenv("PROJECTION_WORKERS", "0"))
@@ -0,0 +1,88 @@
+# backend/records.py
+import numpy as np
+import pandas as pd
+
+from backend.cache import cached
+from backend.db import read, supa
+
+COUNTERS = ["games", "ats_w", "ats_l", "ats_p", "ou_o", "ou_u", "ou_p", "margin_sum"]
+
+
+def team_contributions(games: pd.DataFrame) -> pd.DataFrame:
+    """What each scored game adds to its two teams' records, summed per (season, team).
+
+    `games` has season_year, away_team, home_team, spread, over_under,
+    away_score and home_score; the spread is the away team's line. Games
+    without a line count toward `games` only.
+    """
+    scored = games[games["away_score"].notna() & games["home_score"].notna()]
+    if scored.empty:
+        return pd.DataFrame(columns=["season_year", "team"] + COUNTERS)
+    away = scored["away_score"].astype(float).to_numpy()
+    home = scored["home_score"].astype(float).to_numpy()
+    spread = pd.to_numeric(scored["spread"], errors="coerce").to_numpy(dtype=float)
+    total = pd.to_numeric(scored["over_under"], errors="coerce").to_numpy(dtype=float)
+    season = scored["season_year"].to_numpy()
+
+    away_margin = away + spread - home
+    over = away + home - total
+    sides = []
+    for team, margin in ((scored["away_team"], away_margin), (scored["home_team"], -away_margin)):
+        sides.append(pd.DataFrame({
+            "season_year": season,
+            "team": team.to_numpy(dtype=object),
+            "games": 1,
+            "ats_w": margin > 0,
+            "ats_l": margin < 0,
+            "ats_p": margin == 0,
+            "ou_o": over > 0,
+            "ou_u": over < 0,
+            "ou_p": over == 0,
+            "margin_sum": np.nan_to_num(margin),
+        }))
+    return pd.concat(sides).groupby(["season_year", "team"], as_index=False)[COUNTERS].sum()
+
+
+def record_deltas(games: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+    """Counter changes from saving `games` over the scores in `previous` (game_id, away_score, home_score)."""
+    before = games.drop(columns=["away_score", "home_score"]).merge(
+        previous[["game_id", "away_score", "home_score"]], on="game_id", how="inner"
+    )
+    undo = team_contributions(before)
+    undo[COUNTERS] = -undo[COUNTERS]
+    delta = pd.concat([team_contributions(games), undo]).groupby(["season_year", "team"], as_index=False)[COUNTERS].sum()
+    return delta[(delta[COUNTERS] != 0).any(axis=1)]
+
+
+def update_team_records(games: pd.DataFrame, previous: pd.DataFrame) -> int:
+    """Apply the deltas in one RPC (sql/migrations/0006_team_records.sql); returns the teams touched."""
+    delta = record_deltas(games, previous)
+    if delta.empty:
+        return 0
+    rows = [
+        {
+            "season_year": int(r["season_year"]),
+            "team": r["team"],
+            **{c: int(r[c]) for c in COUNTERS if c != "margin_sum"},
+            "margin_sum": float(r["margin_sum"]),
+        }
+        for r in delta.to_dict("records")
+    ]
+    supa().rpc("apply_team_record_deltas", {"deltas": rows}).execute()
+    return len(rows)
+
+
+@cached("team_records")
+def fetch_team_records(season):
+    """{team: record label} for a season, for one dict lookup per board cell."""
+    rows = read(supa().table("team_records").select("*").eq("season_year", season)).data or []
+    return {r["team"]: record_label(r) for r in rows}
+
+
+def record_label(r) -> str:
+    """e.g. "5-3-1 ATS · 4-5 O/U · +2.5"."""
+    ats_games = r["ats_w"] + r["ats_l"] + r["ats_p"]
+    ats = f"{r['ats_w']}-{r['ats_l']}" + (f"-{r['ats_p']}" if r["ats_p"] else "")
+    ou = f"{r['ou_o']}-{r['ou_u']}" + (f"-{r['ou_p']}" if r["ou_p"] else "")
+    margin = f" · {r['margin_sum'] / ats_games:+.1f}" if ats_games else ""
+    return f"{ats} ATS · {ou} O/U{margin}"
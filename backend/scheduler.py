@@ -0,0 +1,113 @@
+# backend/scheduler.py
+import datetime
+import json
+import time
+
+CALL_COST = 2  # Odds API credits per /odds call: 2 markets x 1 region
+
+
+class FreezeGroup:
+    """Games whose lines are frozen together by one API call at `at`."""
+
+    __slots__ = ("at", "game_ids")
+
+    def __init__(self, at, game_ids):
+        self.at = at
+        self.game_ids = set(game_ids)
+
+    def __repr__(self):
+        return f"FreezeGroup({self.at.isoformat()}, {sorted(self.game_ids)})"
+
+
+def plan_freezes(kickoffs: dict, offset: datetime.timedelta, merge_window: datetime.timedelta, now):
+    """Group games by freeze time (kickoff - offset) into as few calls as the window allows.
+
+    A group fires at its earliest member's freeze time and absorbs every game
+    due within `merge_window` after it, so no game is frozen later than its
+    own target. Games already kicked off are skipped; overdue ones fire now.
+    """
+    due = sorted(
+        (max(kickoff - offset, now), game_id)
+        for game_id, kickoff in kickoffs.items()
+        if kickoff > now
+    )
+    groups = []
+    for at, game_id in due:
+        if groups and at <= groups[-1].at + merge_window:
+            groups[-1].game_ids.add(game_id)
+        else:
+            groups.append(FreezeGroup(at, [game_id]))
+    return groups
+
+
+def fit_budget(kickoffs, offset, merge_window, now, remaining=None, reserve=10,
+               cost=CALL_COST, max_window=datetime.timedelta(days=7)):
+    """Plan freezes that fit in the remaining API quota.
+
+    Widens the merge window until the calls fit; if they still don't, later
+    groups fold into the last affordable call (frozen early rather than not
+    at all). With no quota known the plan is left as is.
+    """
+    groups = plan_freezes(kickoffs, offset, merge_window, now)
+    if remaining is None:
+        return groups
+    affordable = max(0, (remaining - reserve) // cost)
+    window = merge_window
+    while len(groups) > affordable and window < max_window:
+        window = min(max_window, window * 2)
+        groups = plan_freezes(kickoffs, offset, window, now)
+    if len(groups) > affordable:
+        if affordable == 0:
+            return []
+        tail = groups[affordable - 1:]
+        merged = FreezeGroup(tail[0].at, set().union(*(g.game_ids for g in tail)))
+        groups = groups[:affordable - 1] + [merged]
+    return groups
+
+
+# ---------- Clocks ----------
+class SystemClock:
+    def now(self):
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    def sleep(self, seconds):
+        time.sleep(max(0, seconds))
+
+
+class FakeClock:
+    """Clock for test runs: sleeping just moves time forward."""
+
+    def __init__(self, start: datetime.datetime):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self._now += datetime.timedelta(seconds=max(0, seconds))
+
+
+# ---------- Recorded odds ----------
+class FixtureOdds:
+    """Replays recorded /odds responses in order, repeating the last one.
+
+    The file is either a bare list of games or {"responses": [{"remaining":
+    N, "games": [...]}, ...]}. Without recorded quota the remaining credits
+    start at `quota` and drop by CALL_COST per call.
+    """
+
+    def __init__(self, path: str, quota: int = 500):
+        with open(path) as f:
+            data = json.load(f)
+        self.responses = data["responses"] if isinstance(data, dict) else [{"games": data}]
+        self.quota = quota
+        self.calls = 0
+
+    def peek(self):
+        return self.responses[0]["games"]
+
+    def fetch(self):
+        response = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        self.quota = response.get("remaining", self.quota - CALL_COST)
+        return response["games"], self.quota
@@ -0,0 +1,159 @@
+# backend/season.py
+import datetime
+import functools
+import os
+
+import pytz
+
+from backend.cache import cached
+
+EASTERN = pytz.timezone("US/Eastern")
+REGULAR_SEASON_WEEKS = 18
+
+# Schedule definition. The opener is the Thursday after Labor Day (first
+# Monday of September) unless listed here; SEASON_OPENER=YYYY-MM-DD
+# overrides the current season. Weeks run Tuesday to Monday, Eastern, and
+# a week's week_start is its Thursday.
+OPENERS = {
+    2024: datetime.date(2024, 9, 5),
+    2025: datetime.date(2025, 9, 4),
+}
+
+
+def season_of(day: datetime.date) -> int:
+    """Season year for a date; January and February games belong to the previous season."""
+    return day.year if day.month > 2 else day.year - 1
+
+
+def season_bounds(season: int):
+    """[start, end) dates of a season as ISO strings: March through February."""
+    return datetime.date(season, 3, 1).isoformat(), datetime.date(season + 1, 3, 1).isoformat()
+
+
+def opener(season: int) -> datetime.date:
+    override = os.getenv("SEASON_OPENER")
+    if override and datetime.date.fromisoformat(override).year == season:
+        return datetime.date.fromisoformat(override)
+    if season in OPENERS:
+        return OPENERS[season]
+    labor_day = datetime.date(season, 9, 1)
+    labor_day += datetime.timedelta(days=(0 - labor_day.weekday()) % 7)
+    return labor_day + datetime.timedelta(days=3)
+
+
+def _date(value) -> datetime.date:
+    """Eastern calendar date of a date, aware/naive datetime or ISO string."""
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00")) if "T" in value \
+            else datetime.date.fromisoformat(value)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(EASTERN)
+        return value.date()
+    return value
+
+
+class SeasonCalendar:
+    """Week lookups for one season, all by arithmetic or dict access.
+
+    Built once per season from the schedule definition; `games` (rows with
+    game_id, nfl_week, kickoff) add each week's game ids and lock time, the
+    first kickoff of the week.
+    """
+
+    __slots__ = ("season", "opener", "weeks", "_tuesday", "_starts", "_by_start", "_games", "_locks")
+
+    def __init__(self, season: int, games=(), weeks: int = REGULAR_SEASON_WEEKS):
+        self.season = season
+        self.opener = opener(season)
+        self.weeks = weeks
+        self._tuesday = self.opener - datetime.timedelta(days=2)
+        self._starts = [self.opener + datetime.timedelta(weeks=w) for w in range(weeks)]
+        self._by_start = {d.isoformat(): w + 1 for w, d in enumerate(self._starts)}
+        self._games = {w: [] for w in range(1, weeks + 1)}
+        self._locks = {}
+        for g in games:
+            week = g.get("nfl_week")
+            if week not in self._games:
+                continue
+            self._games[week].append(g["game_id"])
+            if g.get("kickoff"):
+                kickoff = datetime.datetime.fromisoformat(str(g["kickoff"]).replace("Z", "+00:00"))
+                if week not in self._locks or kickoff < self._locks[week]:
+                    self._locks[week] = kickoff
+
+    def _week_number(self, when) -> int:
+        """Weeks since the opener's Tuesday, 1-based; below 1 or past `weeks` outside the regular season."""
+        return (_date(when) - self._tuesday).days // 7 + 1
+
+    def week_of(self, when):
+        """NFL week containing a date, datetime or ISO string, or None outside the regular season."""
+        week = self._week_number(when)
+        return week if 1 <= week <= self.weeks else None
+
+    def current_week(self, when) -> int:
+        """Like week_of, but week 1 before the opener and the last week after it."""
+        return min(self.weeks, max(1, self._week_number(when)))
+
+    def week_start(self, week: int) -> datetime.date:
+        """The Thursday of `week`; picks and standings are keyed by it."""
+        return self._starts[min(self.weeks, max(1, week)) - 1]
+
+    def week_for_start(self, week_start):
+        """Week number for a week_start date or ISO string, or None if it is not one."""
+        key = week_start.isoformat() if hasattr(week_start, "isoformat") else str(week_start)[:10]
+        return self._by_start.get(key)
+
+    def lock_at(self, week: int):
+        """First kickoff of the week (UTC-aware), if its games are known."""
+        return self._locks.get(week)
+
+    def game_ids(self, week: int) -> list:
+        return self._games.get(week, [])
+
+    def week(self, week: int) -> dict:
+        return {
+            "week": week,
+            "week_start": self.week_start(week),
+            "lock_at": self.lock_at(week),
+            "game_ids": self.game_ids(week),
+        }
+
+
+@functools.lru_cache(maxsize=8)
+def _calendar(season: int) -> SeasonCalendar:
+    return SeasonCalendar(season)
+
+
+def calendar(season: int = None) -> SeasonCalendar:
+    """Schedule-only calendar (no database access), built once per season."""
+    return _calendar(season or current_season())
+
+
+@cached("spreads", week_arg=None)
+def calendar_with_games(season: int = None) -> SeasonCalendar:
+    """Calendar including each week's game ids and lock times from nfl_games."""
+    from backend.db import read_all
+
+    season = season or current_season()
+    games = read_all("nfl_games", "game_id, nfl_week, kickoff", filters=[("eq", "season_year", season)])
+    return SeasonCalendar(season, games)
+
+
+def current_season(now=None) -> int:
+    return season_of(_date(now or datetime.datetime.now(datetime.timezone.utc)))
+
+
+def current_week(now=None) -> int:
+    """This week's number in the current season (week 1 before the opener, capped at the last week)."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    return calendar(current_season(now)).current_week(now)
+
+
+def week_of(when):
+    """Week of a date or timestamp in whichever season it falls in; None for preseason and playoff dates."""
+    return calendar(season_of(_date(when))).week_of(when)
+
+
+def week_start(week: int, season: int = None) -> datetime.date:
+    return calendar(season).week_start(week)
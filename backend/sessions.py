@@ -0,0 +1,213 @@
+# backend/sessions.py
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from backend.cache import registered_reader, week_cache
+
+SESSION_TTL = 14 * 24 * 3600
+ADMIN_SESSION_TTL = 12 * 3600  # admin logins expire sooner
+MIN_SECRET_LENGTH = 16
+WARM_KEY = "__warm__"          # store record listing the reader calls worth prewarming
+WARM_SAVE_INTERVAL = 60        # seconds between warm-key snapshots per process
+
+_store = None
+_store_lock = threading.Lock()
+_warm_saved_at = 0.0
+_prewarmed = False
+
+
+# ---------- Signed tokens ----------
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def sign_token(sid: str, secret: str, ttl: int = SESSION_TTL) -> str:
+    """`<payload>.<hmac>` carrying the session id and its expiry."""
+    payload = _b64(json.dumps({"sid": sid, "exp": int(time.time()) + ttl}).encode())
+    mac = hmac.new(secret.encode(), payload.encode(), hashlib.sha256).digest()
+    return f"{payload}.{_b64(mac)}"
+
+
+def verify_token(token: str, secret: str):
+    """The session id in a token, or None if it is forged, malformed or expired."""
+    try:
+        payload, mac = token.split(".", 1)
+        expected = hmac.new(secret.encode(), payload.encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _unb64(mac)):
+            return None
+        claims = json.loads(_unb64(payload))
+    except (ValueError, TypeError):
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims.get("sid")
+
+
+def new_session_id() -> str:
+    return secrets.token_urlsafe(24)
+
+
+# ---------- Stores ----------
+class SQLiteSessionStore:
+    """Sessions in a SQLite file; replicas on one host (or tests) can share it."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "create table if not exists app_sessions "
+                "(sid text primary key, data text not null, expires_at real not null)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, sid):
+        with self._connect() as conn:
+            row = conn.execute(
+                "select data from app_sessions where sid = ? and expires_at > ?", (sid, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, sid, data, ttl=SESSION_TTL):
+        with self._connect() as conn:
+            conn.execute(
+                "insert into app_sessions (sid, data, expires_at) values (?, ?, ?) "
+                "on conflict (sid) do update set data = excluded.data, expires_at = excluded.expires_at",
+                (sid, json.dumps(data, default=str), time.time() + ttl),
+            )
+
+    def delete(self, sid):
+        with self._connect() as conn:
+            conn.execute("delete from app_sessions where sid = ?", (sid,))
+
+    def purge(self):
+        with self._connect() as conn:
+            return conn.execute("delete from app_sessions where expires_at <= ?", (time.time(),)).rowcount
+
+
+class PostgresSessionStore:
+    """Sessions in Postgres (DATABASE_URL), shared by every replica."""
+
+    def __init__(self, dsn: str):
+        import psycopg
+
+        self._psycopg = psycopg
+        self.dsn = dsn
+        with self._connect() as conn:
+            conn.execute(
+                "create table if not exists app_sessions "
+                "(sid text primary key, data jsonb not null, expires_at timestamptz not null)"
+            )
+
+    def _connect(self):
+        return self._psycopg.connect(self.dsn, autocommit=True)
+
+    def get(self, sid):
+        with self._connect() as conn:
+            row = conn.execute(
+                "select data from app_sessions where sid = %s and expires_at > now()", (sid,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, sid, data, ttl=SESSION_TTL):
+        with self._connect() as conn:
+            conn.execute(
+                "insert into app_sessions (sid, data, expires_at) "
+                "values (%s, %s, now() + make_interval(secs => %s)) "
+                "on conflict (sid) do update set data = excluded.data, expires_at = excluded.expires_at",
+                (sid, json.dumps(data, default=str), ttl),
+            )
+
+    def delete(self, sid):
+        with self._connect() as conn:
+            conn.execute("delete from app_sessions where sid = %s", (sid,))
+
+    def purge(self):
+        with self._connect() as conn:
+            return conn.execute("delete from app_sessions where expires_at <= now()").rowcount
+
+
+def session_store():
+    """The process's session store, or None without a usable APP_SECRET (sessions stay per-tab).
+
+    SESSION_STORE=postgres uses DATABASE_URL; SESSION_STORE=sqlite uses the
+    SESSION_DB file. By default Postgres is used when DATABASE_URL is set.
+    """
+    global _store
+    secret = os.getenv("APP_SECRET") or ""
+    if len(secret) < MIN_SECRET_LENGTH or secret == "change_me":
+        if secret:
+            print("APP_SECRET is too short or a placeholder; shared login sessions are off.")
+        return None
+    with _store_lock:
+        if _store is None:
+            kind = os.getenv("SESSION_STORE") or ("postgres" if os.getenv("DATABASE_URL") else "sqlite")
+            if kind == "postgres":
+                _store = PostgresSessionStore(os.environ["DATABASE_URL"])
+            else:
+                _store = SQLiteSessionStore(os.getenv("SESSION_DB", ".sessions.sqlite3"))
+        return _store
+
+
+# ---------- Warm cache keys ----------
+def _plain(value):
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def save_warm_keys(store=None, force=False):
+    """Record which cached reader calls this process has warm, at most once a minute."""
+    global _warm_saved_at
+    store = store or session_store()
+    if store is None or (not force and time.monotonic() - _warm_saved_at < WARM_SAVE_INTERVAL):
+        return
+    _warm_saved_at = time.monotonic()
+    keys = sorted({
+        (module, qualname, json.dumps(params))
+        for (module, qualname, params), _ in week_cache.items()
+        if module != "__main__" and all(_plain(v) for _, v in params)
+    })
+    store.put(WARM_KEY, {"keys": keys})
+
+
+def prewarm(store=None):
+    """Once per process, replay the reader calls other replicas had warm, in the background.
+
+    The stored record only names readers; each is looked up among the
+    @cached readers this process has already defined and called with plain
+    keyword values. Names that are not registered readers (including
+    readers in the Streamlit script itself, module __main__, or in pages not
+    imported yet) are skipped; they warm on first render as before.
+    """
+    global _prewarmed
+    store = store or session_store()
+    if store is None or _prewarmed:
+        return
+    _prewarmed = True
+    record = store.get(WARM_KEY) or {}
+
+    def run():
+        for key in record.get("keys", []):
+            try:
+                module, qualname, params = key
+                fn = registered_reader(module, qualname)
+                params = json.loads(params)
+                if fn is None or not all(isinstance(p, list) and len(p) == 2 and isinstance(p[0], str)
+                                         and _plain(p[1]) for p in params):
+                    continue
+                fn(**dict(params))
+            except Exception as e:
+                print(f"Prewarm skipped {key!r:.80}: {e}")
+
+    threading.Thread(target=run, name="cache-prewarm", daemon=True).start()
@@ -0,0 +1,250 @@
+# backend/slate.py
+import datetime
+from array import array
+
+import pytz
+
+EASTERN = pytz.timezone("US/Eastern")
+
+PICK_TYPES = ("BB", "ATS", "OU", "SD", "UD")
+LIMITS = {"BB": 1, "ATS": 5, "OU": 3, "SD": 1, "UD": 1}
+
+# The picks table stores an over/under as "O/U" and the best bet as an ATS
+# row with is_double set, as Make Picks writes them and grading and the
+# standings job read them; to_rows writes the same form.
+TYPE_ALIASES = {"O/U": "OU"}
+STORED_TYPES = {"BB": "ATS", "OU": "O/U"}
+
+NONE, AWAY, HOME = 0, 1, 2
+OVER, UNDER = 1, 2
+
+
+def _field(row, *names):
+    """First present value among the column names used by the different tables."""
+    for name in names:
+        if row.get(name) is not None:
+            return row[name]
+    return None
+
+
+def _flag(value) -> bool:
+    """Truthiness that tolerates pandas NA from nullable boolean columns."""
+    try:
+        return bool(value)
+    except TypeError:
+        return False
+
+
+def game_lock_time(game) -> datetime.datetime | None:
+    """Kickoff as an aware UTC datetime; spreads store date/time in US/Eastern."""
+    lock_at = game.get("lock_at")
+    if lock_at:
+        return datetime.datetime.fromisoformat(str(lock_at).replace("Z", "+00:00"))
+    date, time = game.get("date"), _field(game, "time", "start_time")
+    if not date or not time:
+        return None
+    naive = datetime.datetime.fromisoformat(f"{date}T{time}")
+    return EASTERN.localize(naive).astimezone(pytz.UTC)
+
+
+class SlateGame:
+    __slots__ = ("game_id", "away", "home", "spread", "total", "lock_at", "underdog")
+
+    def __init__(self, row):
+        self.game_id = _field(row, "game_id", "nfl_game_id", "id")
+        self.away = _field(row, "away_team", "away")
+        self.home = _field(row, "home_team", "home")
+        spread = _field(row, "spread")
+        total = _field(row, "over_under", "total")
+        self.spread = float(spread) if spread is not None else None
+        self.total = float(total) if total is not None else None
+        self.lock_at = game_lock_time(row)
+        # (team, points) for the side getting points, as stored at ingest;
+        # rows written before those columns existed derive it from the away line.
+        underdog = _field(row, "underdog")
+        if underdog is not None:
+            self.underdog = (underdog, float(_field(row, "underdog_points")))
+        elif self.spread:
+            self.underdog = (self.away, self.spread) if self.spread > 0 else (self.home, -self.spread)
+        else:
+            self.underdog = (None, None)
+
+    def side_of(self, team):
+        if team == self.away:
+            return AWAY
+        if team == self.home:
+            return HOME
+        return NONE
+
+    def team(self, side):
+        return self.away if side == AWAY else self.home if side == HOME else None
+
+
+class PickSlate:
+    """One entry's picks for one week, held in flat arrays indexed by game.
+
+    `ats` and `ou` hold a side code per game; BB, SD and UD are single game
+    indexes (-1 when unset). All rule checks run in memory, so the grid,
+    Make Picks and scoring can validate without another database read.
+    """
+
+    __slots__ = ("games", "_index", "ats", "ou", "bb", "bb_side", "sd", "sd_side", "ud")
+
+    def __init__(self, games):
+        self.games = [g if isinstance(g, SlateGame) else SlateGame(g) for g in games]
+        self._index = {g.game_id: i for i, g in enumerate(self.games)}
+        n = len(self.games)
+        self.ats = array("b", bytes(n))
+        self.ou = array("b", bytes(n))
+        self.bb = self.bb_side = -1
+        self.sd = self.sd_side = -1
+        self.ud = -1
+
+    # ---------- Building ----------
+    @classmethod
+    def from_rows(cls, games, rows):
+        """Load a slate from `picks` rows; rows for unknown games are ignored."""
+        slate = cls(games)
+        # Ties (batch imports share one stamp) break on game and type, as in week_grid.
+        for row in sorted(rows, key=lambda r: (r.get("submitted_at") or "", str(r.get("game_id")), str(r.get("type")))):
+            idx = slate.index_of(row.get("game_id"))
+            if idx is None:
+                continue
+            pick_type = TYPE_ALIASES.get(row.get("type"), row.get("type"))
+            if pick_type == "ATS" and _flag(row.get("is_double")):
+                pick_type = "BB"
+            selection = row.get("over_under_pick") if pick_type == "OU" else row.get("selection")
+            slate.add(pick_type, idx, selection, check_limits=False)
+        return slate
+
+    def index_of(self, game_id):
+        return self._index.get(game_id)
+
+    def add(self, pick_type, idx, selection, now=None, check_limits=True):
+        """Record a pick; returns (ok, message) and leaves the slate unchanged on failure."""
+        if pick_type not in LIMITS:
+            return False, f"Unknown pick type {pick_type}."
+        game = self.games[idx]
+        if now is not None and game.lock_at and now >= game.lock_at:
+            return False, f"{game.away} @ {game.home} is locked."
+
+        if pick_type == "OU":
+            side = {"O": OVER, "U": UNDER}.get(selection, NONE)
+            if side == NONE:
+                return False, "O/U selection must be 'O' or 'U'."
+            if self.ou[idx] and self.ou[idx] != side:
+                return False, "Cannot take both the over and the under."
+            if check_limits and not self.ou[idx] and self.count("OU") >= LIMITS["OU"]:
+                return False, "Only 3 O/U picks allowed."
+            self.ou[idx] = side
+            return True, "Saved."
+
+        side = game.side_of(selection)
+        if side == NONE:
+            return False, f"{selection} is not playing in {game.away} @ {game.home}."
+
+        if pick_type == "ATS":
+            if self.ats[idx] and self.ats[idx] != side:
+                return False, "Cannot take both sides of the same game."
+            if self.bb == idx:
+                return False, "That game is already your Best Bet."
+            if check_limits and not self.ats[idx] and self.count("ATS") >= LIMITS["ATS"]:
+                return False, "Only 5 ATS picks allowed."
+            self.ats[idx] = side
+        elif pick_type == "BB":
+            if self.ats[idx]:
+                return False, "That game is already one of your ATS picks."
+            if check_limits and self.bb not in (-1, idx):
+                return False, "Only 1 Best Bet allowed."
+            self.bb, self.bb_side = idx, side
+        elif pick_type == "SD":
+            if check_limits and self.sd not in (-1, idx):
+                return False, "Only 1 Sudden Death pick allowed."
+            self.sd, self.sd_side = idx, side
+        elif pick_type == "UD":
+            if game.underdog[0] != selection:
+                return False, f"{selection} is not the underdog."
+            if check_limits and self.ud not in (-1, idx):
+                return False, "Only 1 Underdog pick allowed."
+            self.ud = idx
+        return True, "Saved."
+
+    def remove(self, pick_type, idx):
+        pick_type = TYPE_ALIASES.get(pick_type, pick_type)
+        if pick_type == "ATS":
+            self.ats[idx] = NONE
+        elif pick_type == "OU":
+            self.ou[idx] = NONE
+        elif pick_type == "BB" and self.bb == idx:
+            self.bb = self.bb_side = -1
+        elif pick_type == "SD" and self.sd == idx:
+            self.sd = self.sd_side = -1
+        elif pick_type == "UD" and self.ud == idx:
+            self.ud = -1
+
+    # ---------- Validation ----------
+    def count(self, pick_type):
+        if pick_type == "ATS":
+            return sum(1 for s in self.ats if s)
+        if pick_type == "OU":
+            return sum(1 for s in self.ou if s)
+        return int(getattr(self, pick_type.lower()) != -1)
+
+    def errors(self, now=None):
+        """Every rule the slate currently breaks (limits, conflicts, locks)."""
+        problems = []
+        for pick_type, limit in LIMITS.items():
+            if self.count(pick_type) > limit:
+                problems.append(f"Too many {pick_type} picks ({self.count(pick_type)}/{limit}).")
+        if self.bb != -1 and self.ats[self.bb]:
+            problems.append("Best Bet game is also an ATS pick.")
+        if self.ud != -1:
+            game = self.games[self.ud]
+            if game.underdog[0] is None:
+                problems.append(f"{game.away} @ {game.home} has no underdog.")
+        if now is not None:
+            for idx, pick_type, _ in self.picks():
+                lock_at = self.games[idx].lock_at
+                if lock_at and now >= lock_at:
+                    problems.append(f"{pick_type} pick on {self.games[idx].game_id} is locked.")
+        return problems
+
+    def is_valid(self, now=None):
+        return not self.errors(now)
+
+    # ---------- Export ----------
+    def picks(self):
+        """Yield (game index, pick type, selection) for every pick on the slate."""
+        if self.bb != -1:
+            yield self.bb, "BB", self.games[self.bb].team(self.bb_side)
+        for idx, side in enumerate(self.ats):
+            if side:
+                yield idx, "ATS", self.games[idx].team(side)
+        for idx, side in enumerate(self.ou):
+            if side:
+                yield idx, "OU", "O" if side == OVER else "U"
+        if self.sd != -1:
+            yield self.sd, "SD", self.games[self.sd].team(self.sd_side)
+        if self.ud != -1:
+            yield self.ud, "UD", self.games[self.ud].underdog[0]
+
+    def to_rows(self, user_id, week_start, submitted_at=None):
+        """Serialize to `picks` rows for one batched upsert."""
+        submitted_at = submitted_at or datetime.datetime.now(datetime.timezone.utc).isoformat()
+        week_start = week_start.isoformat() if hasattr(week_start, "isoformat") else week_start
+        rows = []
+        for idx, pick_type, selection in self.picks():
+            game = self.games[idx]
+            rows.append({
+                "user_id": user_id,
+                "game_id": game.game_id,
+                "type": STORED_TYPES.get(pick_type, pick_type),
+                "selection": selection,
+                "over_under_pick": selection if pick_type == "OU" else None,
+                "over_under_total": game.total if pick_type == "OU" else None,
+                "is_double": pick_type == "BB",
+                "underdog_points": game.underdog[1] if pick_type == "UD" else None,
+                "week_start": week_start,
+                "submitted_at": submitted_at,
+            })
+        return rows
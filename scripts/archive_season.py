@@ -0,0 +1,58 @@
+# scripts/archive_season.py
+"""Moves a completed season out of the hot tables into Parquet under ARCHIVE_DIR.
+
+Usage:
+  python scripts/archive_season.py 2024            # archive, verify, then delete from Supabase
+  python scripts/archive_season.py 2024 --keep     # archive only
+  python scripts/archive_season.py --list          # seasons already archived
+"""
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.archive import ARCHIVE_DIR, archive_season, archived_seasons, load_manifest
+
+load_dotenv()
+
+
+def latest_season():
+    from backend.db import supa
+
+    rows = supa().table("nfl_games").select("season_year") \
+        .order("season_year", desc=True).limit(1).execute().data
+    return rows[0]["season_year"] if rows else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("season", type=int, nargs="?", help="season year, e.g. 2024 for the 2024-25 season")
+    parser.add_argument("--keep", action="store_true", help="write the archive but leave the hot tables alone")
+    parser.add_argument("--force", action="store_true", help="allow archiving the latest season in nfl_games")
+    parser.add_argument("--list", action="store_true", help="show archived seasons and row counts")
+    args = parser.parse_args()
+
+    if args.list:
+        seasons = load_manifest()["seasons"]
+        for season in archived_seasons():
+            tables = seasons[str(season)]["tables"]
+            counts = ", ".join(f"{t}={v['rows']}" for t, v in tables.items())
+            print(f"{season}: {counts}")
+        return
+    if args.season is None:
+        parser.error("a season is required")
+    if not args.force and args.season == latest_season():
+        sys.exit(f"{args.season} is the current season; pass --force to archive it anyway.")
+
+    counts = archive_season(args.season, delete=not args.keep)
+    for table, rows in counts.items():
+        print(f"{table}: {rows} rows")
+    action = "archived" if args.keep else "archived and removed from the live tables"
+    print(f"Season {args.season} {action}; files under {ARCHIVE_DIR}/.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# scripts/bench_projection.py
+"""Throughput benchmark for backend/projection.py on a synthetic league.
+
+Usage: python scripts/bench_projection.py [entries] [scenarios] [workers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.projection import WeekInputs, simulate
+from backend.slate import PickSlate
+
+
+def synthetic_league(entries: int, games: int = 16, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    rows = [{
+        "game_id": f"g{i}",
+        "date": "2025-09-07",
+        "time": "13:00:00",
+        "away_team": f"A{i}",
+        "home_team": f"H{i}",
+        "spread": float(rng.choice([-7.0, -3.5, -3.0, 1.5, 3.0, 6.5])),
+        "over_under": float(rng.choice([41.5, 44.0, 47.5])),
+    } for i in range(games)]
+    game_objs = PickSlate(rows).games
+    slates = {}
+    for e in range(entries):
+        slate = PickSlate(game_objs)
+        order = rng.permutation(games)
+        slate.add("BB", int(order[0]), game_objs[order[0]].home)
+        for idx in order[1:6]:
+            g = game_objs[idx]
+            slate.add("ATS", int(idx), g.away if rng.random() < 0.5 else g.home)
+        for idx in order[6:9]:
+            slate.add("OU", int(idx), "O" if rng.random() < 0.5 else "U")
+        slates[f"E{e:03d}"] = slate
+    return WeekInputs(game_objs, slates)
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    scenarios = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    inputs = synthetic_league(entries)
+    start = time.perf_counter()
+    simulate(inputs, scenarios=scenarios, remaining_weeks=10, seed=1, workers=workers)
+    elapsed = time.perf_counter() - start
+    print(f"{entries} entries x {scenarios} scenarios, workers={workers}: "
+          f"{elapsed:.2f}s ({scenarios / elapsed:,.0f} scenarios/s, "
+          f"{entries * scenarios / elapsed:,.0f} slate gradings/s)")
+
+
+if __name__ == "__main__":
+    main()
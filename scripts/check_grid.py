@@ -0,0 +1,183 @@
+# scripts/check_grid.py
+"""Checks the week_grid RPC against the Python grid pivot on a local Postgres.
+
+Point DATABASE_URL at a Postgres migrated with scripts/migrate.py. With
+--seed, a random week of entries, games, picks (including conflicting and
+stale ones), results and comments is written inside a transaction that is
+rolled back afterwards, so the database is left as it was.
+
+Usage:
+  python scripts/check_grid.py --seed                # random week, then compare
+  python scripts/check_grid.py --seed --entries 200  # bigger league
+  python scripts/check_grid.py --week 3              # compare an existing week
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.grid import grid_from_rows, pivot_grid
+from backend.migrations import connect
+from backend.season import week_start
+
+load_dotenv()
+
+TEAMS = ["ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB", "HOU", "IND",
+         "JAX", "KC", "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG", "NYJ", "PHI", "PIT", "SEA",
+         "SF", "TB", "TEN", "WAS"]
+SEASON = 2025
+SEED_WEEK = 17  # far from live data
+
+
+def seed(conn, week, entries, rng):
+    """Insert one random week; the caller rolls it back."""
+    teams = rng.sample(TEAMS, 28)
+    games = []
+    kickoff = datetime.datetime.combine(week_start(week, SEASON), datetime.time(20, 15), datetime.timezone.utc)
+    for g in range(14):
+        away, home = teams[2 * g], teams[2 * g + 1]
+        spread = rng.choice([-7.5, -3.0, -1.0, 0.0, 2.5, 3.0, 6.5])
+        total = rng.choice([38.5, 44.0, 47.5])
+        # Several games share a kickoff, as on Sundays, to exercise the tie order.
+        start = kickoff + datetime.timedelta(days=0 if g == 0 else 3, hours=0 if g < 8 else 3)
+        games.append((f"check-{week}-{g}", away, home, spread, total, start))
+        conn.execute(
+            "insert into nfl_games (game_id, season_year, nfl_week, kickoff, date, start_time, away, home, spread, total, "
+            "favorite, underdog, underdog_points, home_line, lock_at) "
+            "values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            (f"check-{week}-{g}", SEASON, week, start, start.date(), start.time(), away, home, spread, total,
+             home if spread > 0 else away if spread < 0 else None,
+             away if spread > 0 else home if spread < 0 else None,
+             abs(spread) if spread else None, -spread, start),
+        )
+        if rng.random() < 0.7:
+            away_score, home_score = rng.randint(3, 38), rng.randint(3, 38)
+            cover = away_score + spread - home_score
+            points = away_score + home_score
+            conn.execute(
+                "insert into results (game_id, home_score, away_score, ml_winner, ats_winner, ou_result) "
+                "values (%s, %s, %s, %s, %s, %s)",
+                (f"check-{week}-{g}", home_score, away_score,
+                 away if away_score > home_score else home if home_score > away_score else None,
+                 away if cover > 0 else home if cover < 0 else "push",
+                 "O" if points > total else "U" if points < total else "Push"),
+            )
+
+    stamp = datetime.datetime(SEASON, 9, 1, tzinfo=datetime.timezone.utc)
+    for n in range(entries):
+        user_id = uuid.UUID(int=rng.getrandbits(128))
+        abbrev = f"{rng.choice('ABCDEFGHJKMNPRSTWxyz')}{n:03d}"
+        conn.execute("insert into users (id, name, entry_abbreviation) values (%s, %s, %s)",
+                     (user_id, f"check {n}", abbrev))
+        if rng.random() < 0.5:
+            conn.execute("insert into weekly_entries (user_id, week_start, comment) values (%s, %s, %s)",
+                         (user_id, week_start(week, SEASON), f"comment {n}"))
+        picked = set()
+        for _ in range(rng.randint(0, 16)):
+            game_id, away, home, spread, _, _ = rng.choice(games)
+            pick_type = rng.choice(["ATS", "ATS", "ATS", "BB", "OU", "O/U", "SD", "UD", "XX"])
+            is_double = pick_type == "BB" and rng.random() < 0.5
+            stored_type = "ATS" if is_double else pick_type
+            # Picks are unique per (user, game, type); conflicts come from the other types.
+            if (game_id, stored_type) in picked:
+                continue
+            picked.add((game_id, stored_type))
+            team = rng.choice([away, home, "NOPE"])
+            side = rng.choice(["O", "U", None])
+            stamp += datetime.timedelta(seconds=rng.choice([0, 1, 60]))  # 0: batch-import ties
+            conn.execute(
+                "insert into picks (user_id, game_id, type, selection, over_under_pick, is_double, week_start, submitted_at) "
+                "values (%s, %s, %s, %s, %s, %s, %s, %s)",
+                (user_id, game_id, stored_type, side if pick_type in ("OU", "O/U") else team,
+                 side if pick_type in ("OU", "O/U") else None, is_double, week_start(week, SEASON), stamp),
+            )
+
+
+def python_grid(conn, week):
+    """The Python pivot over the same tables, read the way Home reads them."""
+    def rows(sql, params=()):
+        cur = conn.execute(sql, params)
+        names = [d.name for d in cur.description]
+        return [dict(zip(names, r)) for r in cur.fetchall()]
+
+    games = rows("select game_id, season_year, date, time, away_team, home_team, spread, over_under, underdog, "
+                 "underdog_points, lock_at from spreads where nfl_week = %s order by date, time, game_id", (week,))
+    users = {r["id"]: r["entry_abbreviation"] for r in rows("select id, entry_abbreviation from users")}
+    picks = rows("select user_id, game_id, type, selection, over_under_pick, is_double, submitted_at from picks")
+    results = {r["game_id"]: r for r in rows("select * from results")}
+    comments = {}
+    if games:
+        start = week_start(week, games[0]["season_year"])
+        comments = {r["user_id"]: r["comment"] for r in
+                    rows("select user_id, comment from weekly_entries where week_start = %s", (start,))}
+    for g in games:
+        g["spread"] = float(g["spread"]) if g["spread"] is not None else None
+        g["over_under"] = float(g["over_under"]) if g["over_under"] is not None else None
+        g["underdog_points"] = float(g["underdog_points"]) if g["underdog_points"] is not None else None
+        g["lock_at"] = g["lock_at"].isoformat() if g["lock_at"] else None
+    return pivot_grid(users, picks, results, games, comments)
+
+
+def rpc_grid(conn, week):
+    cur = conn.execute("select * from week_grid(%s)", (week,))
+    names = [d.name for d in cur.description]
+    return grid_from_rows([dict(zip(names, r)) for r in cur.fetchall()])
+
+
+def compare(expected, actual, label):
+    expected = expected.astype(object).where(expected.notna(), None).reset_index(drop=True)
+    actual = actual.astype(object).where(actual.notna(), None).reset_index(drop=True)
+    if expected.shape != actual.shape:
+        print(f"{label}: {expected.shape} rows/cols in Python, {actual.shape} from the RPC")
+        return 1
+    diffs = [(i, col, expected.at[i, col], actual.at[i, col])
+             for col in expected.columns for i in range(len(expected))
+             if expected.at[i, col] != actual.at[i, col]]
+    for i, col, want, got in diffs[:20]:
+        print(f"{label} row {i} ({expected.at[i, 'Entry'] if 'Entry' in expected else i}) {col}: "
+              f"python={want!r} rpc={got!r}")
+    return len(diffs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--week", type=int, help="week to compare (default: the seeded week)")
+    parser.add_argument("--seed", action="store_true", help="insert a random week first (rolled back)")
+    parser.add_argument("--entries", type=int, default=60)
+    parser.add_argument("--random-seed", type=int, default=7)
+    parser.add_argument("--dsn", help="Postgres connection string (default: DATABASE_URL)")
+    args = parser.parse_args()
+    if not args.seed and args.week is None:
+        parser.error("pass --seed or --week")
+    week = args.week or SEED_WEEK
+
+    import psycopg
+
+    with connect(args.dsn) as conn:
+        with conn.transaction():
+            if args.seed:
+                seed(conn, week, args.entries, random.Random(args.random_seed))
+            started = time.perf_counter()
+            expected_grid, expected_status = python_grid(conn, week)
+            python_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            actual_grid, actual_status = rpc_grid(conn, week)
+            rpc_ms = (time.perf_counter() - started) * 1000
+            mismatches = compare(expected_grid, actual_grid, "cells") + compare(expected_status, actual_status, "status")
+            raise psycopg.Rollback()
+
+    print(f"Week {week}: {len(expected_grid)} entries; Python pivot {python_ms:.0f} ms, week_grid {rpc_ms:.0f} ms.")
+    if mismatches:
+        sys.exit(f"{mismatches} cells differ.")
+    print("week_grid matches the Python grid.")
+
+
+if __name__ == "__main__":
+    main()
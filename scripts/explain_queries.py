@@ -0,0 +1,120 @@
+# scripts/explain_queries.py
+"""Runs the app's hot reads with EXPLAIN against a Postgres database and flags sequential scans.
+
+Point DATABASE_URL at a local Postgres migrated with scripts/migrate.py.
+Sequential scans are switched off for the check, so any that remain mean
+no index can serve the query. Reads marked index-only are also flagged
+when the plan has to visit the table.
+
+Usage:
+  python scripts/explain_queries.py                # exit 1 if any read needs a sequential scan
+  python scripts/explain_queries.py --plans        # also print each plan
+  python scripts/explain_queries.py --analyze      # EXPLAIN ANALYZE (runs the reads)
+"""
+import argparse
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.migrations import connect
+
+load_dotenv()
+
+PARAMS = {
+    "week": 3,
+    "season": 2025,
+    "week_start": "2025-09-18",
+    "user_id": "00000000-0000-0000-0000-000000000000",
+    "game_ids": ["g1", "g2"],
+    "abbrev": "KC",
+    "since": "2025-09-18T00:00:00+00:00",
+}
+
+# (name, SQL equivalent of the app's PostgREST read, must be index-only)
+QUERIES = [
+    ("spreads for a week (Home, Make Picks)",
+     "select game_id, season_year, date, time, away_team, spread, home_team, over_under, underdog, "
+     "underdog_points, lock_at from spreads where nfl_week = %(week)s order by date, time", False),
+    ("latest week with lines (Home)",
+     "select nfl_week from spreads where nfl_week is not null order by nfl_week desc limit 1", True),
+    ("season calendar (backend/season.py)",
+     "select game_id, nfl_week, kickoff from nfl_games where season_year = %(season)s", True),
+    ("an entry's picks for a week (Make Picks)",
+     "select * from picks where user_id = %(user_id)s and week_start = %(week_start)s", False),
+    ("picks on games (grading, consensus)",
+     "select game_id, type, selection, is_double, over_under_pick from picks where game_id = any(%(game_ids)s)", True),
+    ("picks changed since the mark (picks sync)",
+     "select user_id, game_id, type, updated_at from picks where updated_at > %(since)s", False),
+    ("pick tombstones since the mark (picks sync)",
+     "select user_id, game_id, type, deleted_at from pick_tombstones where deleted_at > %(since)s", False),
+    ("consensus for a week (Board)",
+     "select * from pick_consensus where nfl_week = %(week)s", False),
+    ("weekly standings for a week (Home)",
+     "select * from weekly_standings where week_start = %(week_start)s", False),
+    ("weeks with standings (Home)",
+     "select week_start from weekly_standings order by week_start", True),
+    ("results for games (grading)",
+     "select game_id, away_score, home_score from results where game_id = any(%(game_ids)s)", False),
+    ("team logo (Make Picks)",
+     "select logo_url from nfl_teams where abbrev = %(abbrev)s", True),
+    ("entries in order (Grid)",
+     "select id, entry_abbreviation from users order by entry_abbreviation", True),
+    ("weekly comment (Make Picks)",
+     "select comment from weekly_entries where user_id = %(user_id)s and week_start = %(week_start)s", False),
+    ("team records for a season (Board)",
+     "select * from team_records where season_year = %(season)s", False),
+]
+
+
+def scans(plan):
+    """Yield (node type, relation) for every node in a JSON plan."""
+    yield plan["Node Type"], plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from scans(child)
+
+
+def explain(conn, sql, analyze=False):
+    import psycopg
+
+    options = "analyze, format json" if analyze else "format json"
+    with conn.transaction():
+        conn.execute("set local enable_seqscan = off")
+        row = conn.execute(f"explain ({options}) {sql}", PARAMS).fetchone()
+        raise psycopg.Rollback()  # leave nothing behind after EXPLAIN ANALYZE
+    plan = row[0]
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", action="store_true", help="print each plan")
+    parser.add_argument("--analyze", action="store_true", help="use EXPLAIN ANALYZE")
+    parser.add_argument("--dsn", help="Postgres connection string (default: DATABASE_URL)")
+    args = parser.parse_args()
+
+    failures = 0
+    with connect(args.dsn) as conn:
+        for name, sql, index_only in QUERIES:
+            plan = explain(conn, sql, args.analyze)
+            nodes = list(scans(plan))
+            seq = sorted({rel for node, rel in nodes if node == "Seq Scan"})
+            heap = sorted({rel for node, rel in nodes if node in ("Index Scan", "Bitmap Heap Scan")})
+            if seq:
+                failures += 1
+                print(f"FAIL  {name}: sequential scan on {', '.join(seq)}")
+            elif index_only and heap:
+                print(f"WARN  {name}: not index-only ({', '.join(heap)}); vacuum or widen the index")
+            else:
+                print(f"ok    {name}")
+            if args.plans:
+                print(json.dumps(plan, indent=2))
+    if failures:
+        sys.exit(f"{failures} of {len(QUERIES)} reads need a sequential scan.")
+
+
+if __name__ == "__main__":
+    main()
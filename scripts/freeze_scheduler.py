@@ -0,0 +1,132 @@
+# scripts/freeze_scheduler.py
+"""Freezes each game's line a set time before its own kickoff.
+
+Games kicking off close together share one Odds API call, and the plan is
+squeezed into the request credits the API reports as remaining.
+
+Usage:
+  python scripts/freeze_scheduler.py                     # run against Supabase
+  python scripts/freeze_scheduler.py --fixture scripts/fixtures/odds_sample.json \\
+      --start 2025-09-04T12:00:00Z                         # recorded odds, fake clock, dry run
+"""
+import argparse
+import datetime
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.odds import fetch_odds_with_quota, fetch_team_map, game_rows_from_odds, write_games
+from backend.scheduler import FakeClock, FixtureOdds, SystemClock, fit_budget
+from backend.season import current_week
+
+load_dotenv()
+
+OFFSET = datetime.timedelta(minutes=int(os.getenv("FREEZE_OFFSET_MINUTES", "60")))
+MERGE_WINDOW = datetime.timedelta(minutes=int(os.getenv("FREEZE_MERGE_MINUTES", "90")))
+QUOTA_RESERVE = int(os.getenv("ODDS_QUOTA_RESERVE", "10"))
+RECHECK = 6 * 3600  # seconds between schedule reloads while idle
+RETRY_MISSING = 10 * 60  # seconds before re-fetching games a freeze call had no lines for
+
+
+def parse_kickoff(value):
+    return datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def db_kickoffs(week):
+    """Kickoffs of the week's games from nfl_games, seeding the week with one call if empty."""
+    from backend.db import supa
+
+    rows = supa().table("nfl_games").select("game_id, kickoff").eq("nfl_week", week).execute().data or []
+    if not rows:
+        games, _ = fetch_odds_with_quota()
+        seeded = game_rows_from_odds(games, week, fetch_team_map())
+        write_games(seeded, week)
+        print(f"Seeded week {week} with {len(seeded)} games.")
+        rows = seeded
+    return {r["game_id"]: parse_kickoff(r["kickoff"]) for r in rows if r.get("kickoff")}
+
+
+def run(clock, fetch, write, kickoffs_for, team_map, remaining=None, stop_when_done=False):
+    """Sleep until each freeze group is due, fetch once, write that group's games.
+
+    `remaining` is the known credit balance, if any, before the first call.
+    Only games the response actually had lines for count as frozen; the
+    rest are retried after RETRY_MISSING seconds until they kick off.
+    """
+    frozen = set()
+    retry_at = {}
+    announced = None
+    while True:
+        now = clock.now()
+        week = current_week(now)
+        upcoming = {gid: k for gid, k in kickoffs_for(week).items() if gid not in frozen and k > now}
+        held = {gid: at for gid, at in retry_at.items() if gid in upcoming and at > now}
+        kickoffs = {gid: k for gid, k in upcoming.items() if gid not in held}
+        groups = fit_budget(kickoffs, OFFSET, MERGE_WINDOW, now, remaining, QUOTA_RESERVE)
+        if not groups and not held:
+            if stop_when_done:
+                return frozen
+            clock.sleep(RECHECK)
+            continue
+
+        wake = groups[0].at if groups else None
+        if held and (wake is None or min(held.values()) < wake):
+            clock.sleep(min((min(held.values()) - now).total_seconds(), RECHECK))
+            continue
+        group = groups[0]
+        wait = (group.at - now).total_seconds()
+        if wait > 0:
+            if (group.at, len(groups)) != announced:
+                announced = (group.at, len(groups))
+                print(f"{len(groups)} freezes planned; next at {group.at.isoformat()} "
+                      f"for {len(group.game_ids)} games")
+            clock.sleep(min(wait, RECHECK))
+            continue
+
+        games, remaining = fetch()
+        rows = [r for r in game_rows_from_odds(games, week, team_map) if r["game_id"] in group.game_ids]
+        write(rows, week)
+        got = {r["game_id"] for r in rows}
+        frozen |= got
+        missing = group.game_ids - got
+        for gid in missing:
+            retry_at[gid] = now + datetime.timedelta(seconds=RETRY_MISSING)
+        print(f"[{now.isoformat()}] froze {len(rows)} games; {remaining} credits left"
+              + (f"; {len(missing)} missing from the response, retrying" if missing else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", help="replay recorded odds with a fake clock and no database writes")
+    parser.add_argument("--start", help="fake clock start time (ISO 8601) for --fixture runs")
+    parser.add_argument("--quota", type=int, default=500, help="starting credits for --fixture runs")
+    args = parser.parse_args()
+
+    if args.fixture:
+        odds = FixtureOdds(args.fixture, quota=args.quota)
+        start = parse_kickoff(args.start) if args.start else datetime.datetime.now(datetime.timezone.utc)
+        kickoffs = {g["id"]: parse_kickoff(g["commence_time"]) for g in odds.peek()}
+
+        def dry_run(rows, week):
+            for r in rows:
+                print(f"  week {week}: {r['away']} @ {r['home']} {r['spread']:+g} / {r['total']:g}")
+
+        run(FakeClock(start), odds.fetch, dry_run, lambda week: kickoffs, {},
+            remaining=args.quota, stop_when_done=True)
+        print(f"Done: {odds.calls} API calls, {odds.quota} credits left.")
+        return
+
+    run(
+        SystemClock(),
+        fetch_odds_with_quota,
+        lambda rows, week: write_games(rows, week, prune=False, final=True),
+        db_kickoffs,
+        fetch_team_map(),
+    )
+
+
+if __name__ == "__main__":
+    main()
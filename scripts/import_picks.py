@@ -0,0 +1,45 @@
+# scripts/import_picks.py
+"""Imports many entries' picks for a week from CSV or JSON.
+
+CSV columns: entry (or user_id), type (BB, ATS, OU, SD, UD), selection (team,
+O or U) and optionally game_id or game (a team, or AWAY@HOME; needed for O/U).
+Each entry in the file replaces that entry's unlocked picks for the week.
+
+Usage:
+  python scripts/import_picks.py --week 3 picks.csv
+  python scripts/import_picks.py --week 3 picks.json --dry-run
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.imports import import_picks, parse_csv, parse_json
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or JSON file; - reads CSV from stdin")
+    parser.add_argument("--week", type=int, required=True, help="NFL week the picks are for")
+    parser.add_argument("--dry-run", action="store_true", help="validate and report without writing")
+    parser.add_argument("--now", help="check locks as of this time (ISO 8601) instead of now")
+    args = parser.parse_args()
+
+    text = sys.stdin.read() if args.path == "-" else open(args.path, encoding="utf-8").read()
+    rows = parse_json(text) if args.path.endswith(".json") else parse_csv(text)
+    now = datetime.datetime.fromisoformat(args.now.replace("Z", "+00:00")) if args.now else None
+
+    report = import_picks(rows, args.week, now=now, dry_run=args.dry_run)
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["rejected"] else 0)
+
+
+if __name__ == "__main__":
+    main()
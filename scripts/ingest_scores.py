@@ -0,0 +1,197 @@
+# scripts/ingest_scores.py
+"""Polls final scores and writes them to `results`, grading picks as games finish.
+
+Only games that have kicked off and have no result yet are requested. Polling
+speeds up while games are live and backs off when nothing is pending.
+
+Usage:
+  python scripts/ingest_scores.py              # run until interrupted
+  python scripts/ingest_scores.py --once       # one poll, e.g. from cron
+  python scripts/ingest_scores.py --fixture scores.json
+      # serve a local JSON file as the feed (same shape as the Odds API scores endpoint)
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import httpx
+import pandas as pd
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.db import supa
+from backend.grading import grade_results, save_results
+from backend.slate import game_lock_time
+
+load_dotenv()
+
+SCORES_API_URL = "https://api.the-odds-api.com/v4/sports/americanfootball_nfl/scores"
+SCORES_MAX_DAYS = 3        # the scores endpoint returns games completed up to this many days ago
+LOOKBACK_DAYS = 3          # how far back to look for unscored games; older ones go through the admin editor
+MIN_INTERVAL = 60          # seconds between polls while games are live
+MAX_INTERVAL = 15 * 60     # back-off ceiling while games are pending
+IDLE_SLEEP = 60 * 60       # longest sleep when nothing has kicked off
+BATCH_SIZE = 40            # event ids per feed request
+GAME_LENGTH = datetime.timedelta(hours=4)  # a pending game this recent is treated as live
+
+
+# ---------- Database ----------
+def pending_games(now: datetime.datetime):
+    """Split recent spreads rows into (kicked off without a result, next kickoff)."""
+    client = supa()
+    since = (now - datetime.timedelta(days=LOOKBACK_DAYS)).date().isoformat()
+    games = client.table("spreads") \
+        .select("game_id, season_year, date, time, away_team, home_team, spread, over_under") \
+        .gte("date", since) \
+        .order("date") \
+        .order("time") \
+        .execute().data or []
+    if not games:
+        return [], None
+
+    ids = [g["game_id"] for g in games]
+    scored = client.table("results").select("game_id").in_("game_id", ids).execute().data or []
+    done = {r["game_id"] for r in scored}
+
+    pending, next_kickoff = [], None
+    oldest = now - datetime.timedelta(days=min(LOOKBACK_DAYS, SCORES_MAX_DAYS))
+    for g in games:
+        kickoff = game_lock_time(g)
+        # The feed no longer returns games that started before `oldest`.
+        if kickoff is None or kickoff < oldest or g["game_id"] in done:
+            continue
+        if kickoff <= now:
+            pending.append(g)
+        elif next_kickoff is None or kickoff < next_kickoff:
+            next_kickoff = kickoff
+    return pending, next_kickoff
+
+
+# ---------- Feed ----------
+async def fetch_scores(http: httpx.AsyncClient, url: str, event_ids):
+    """Request the feed for the given events, BATCH_SIZE ids per concurrent call."""
+    batches = [event_ids[i:i + BATCH_SIZE] for i in range(0, len(event_ids), BATCH_SIZE)]
+
+    async def one(batch):
+        params = {"daysFrom": min(LOOKBACK_DAYS, SCORES_MAX_DAYS), "eventIds": ",".join(batch)}
+        if os.getenv("ODDS_API_KEY"):
+            params["apiKey"] = os.getenv("ODDS_API_KEY")
+        r = await http.get(url, params=params)
+        r.raise_for_status()
+        return r.json()
+
+    events = []
+    for chunk in await asyncio.gather(*(one(b) for b in batches)):
+        events.extend(chunk)
+    return events
+
+
+def final_scores(events, pending):
+    """Scores for completed events as a frame ready for grade_results()."""
+    by_id = {g["game_id"]: g for g in pending}
+    rows = []
+    for event in events:
+        game = by_id.get(event.get("id"))
+        if not game or not event.get("completed") or not event.get("scores"):
+            continue
+        points = {s["name"]: s["score"] for s in event["scores"]}
+        away, home = points.get(event["away_team"]), points.get(event["home_team"])
+        if away is None or home is None:
+            continue
+        rows.append({**game, "away_score": int(away), "home_score": int(home)})
+    return pd.DataFrame(rows)
+
+
+# ---------- Worker ----------
+async def poll_once(http, url, now=None):
+    """One poll; returns (games written, games still live, games still pending, next kickoff)."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    pending, next_kickoff = pending_games(now)
+    if not pending:
+        return 0, 0, 0, next_kickoff
+
+    events = await fetch_scores(http, url, [g["game_id"] for g in pending])
+    finished = final_scores(events, pending)
+    # Passing the games moves team_records too, as the admin editor does.
+    saved = save_results(grade_results(finished), finished) if not finished.empty else []
+    if saved:
+        print(f"Saved and graded {len(saved)} games: {', '.join(saved)}")
+
+    saved_ids = set(saved)
+    left = [g for g in pending if g["game_id"] not in saved_ids]
+    live = sum(1 for g in left if now - game_lock_time(g) < GAME_LENGTH)
+    return len(saved), live, len(left), next_kickoff
+
+
+def next_interval(interval, written, live, still_pending, next_kickoff, now):
+    """Seconds to wait before the next poll."""
+    if written or live:
+        return MIN_INTERVAL
+    if still_pending:
+        # Kicked off long ago but still unscored: back off until the feed catches up.
+        return min(MAX_INTERVAL, interval * 2)
+    if next_kickoff:
+        return max(MIN_INTERVAL, min(IDLE_SLEEP, (next_kickoff - now).total_seconds()))
+    return IDLE_SLEEP
+
+
+async def run(url, once=False):
+    interval = MIN_INTERVAL
+    async with httpx.AsyncClient(timeout=20) as http:
+        while True:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            try:
+                written, live, still_pending, next_kickoff = await poll_once(http, url, now)
+            except Exception as e:
+                print(f"Poll failed: {e}")
+                written, live, still_pending, next_kickoff = 0, 0, 1, None
+            if once:
+                return written
+            interval = next_interval(interval, written, live, still_pending, next_kickoff, now)
+            print(f"{live} live, {still_pending} pending; next poll in {int(interval)}s")
+            await asyncio.sleep(interval)
+
+
+# ---------- Local feed ----------
+def serve_fixture(path: str, port: int = 0) -> str:
+    """Serve a JSON file on localhost for every GET; returns the base URL."""
+    with open(path) as f:
+        body = json.dumps(json.load(f)).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/scores"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="poll once and exit")
+    parser.add_argument("--fixture", help="serve this JSON file as the scores feed")
+    parser.add_argument("--feed-url", default=os.getenv("SCORES_FEED_URL", SCORES_API_URL))
+    args = parser.parse_args()
+
+    url = serve_fixture(args.fixture) if args.fixture else args.feed_url
+    if url == SCORES_API_URL and not os.getenv("ODDS_API_KEY"):
+        raise ValueError("Missing ODDS_API_KEY! Add it to your .env or use --fixture.")
+    asyncio.run(run(url, once=args.once))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# scripts/migrate.py
+"""Applies the numbered SQL files in sql/migrations to DATABASE_URL, in order, once each.
+
+Usage:
+  python scripts/migrate.py                  # apply everything pending
+  python scripts/migrate.py --to 0009        # apply pending migrations up to 0009
+  python scripts/migrate.py --status         # applied and pending versions
+  python scripts/migrate.py --baseline 0001  # mark the base schema applied (existing database)
+"""
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.migrations import applied, baseline, connect, migrate, migration_files
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--to", help="last version to apply, e.g. 0009")
+    parser.add_argument("--status", action="store_true", help="list migrations and whether each is applied")
+    parser.add_argument("--baseline", metavar="VERSION", help="record migrations up to VERSION as applied without running them")
+    parser.add_argument("--dsn", help="Postgres connection string (default: DATABASE_URL)")
+    args = parser.parse_args()
+
+    with connect(args.dsn) as conn:
+        if args.status:
+            done = applied(conn)
+            for version, name, _ in migration_files():
+                print(f"{version} {name}: {'applied' if version in done else 'pending'}")
+            return
+        if args.baseline:
+            versions = baseline(conn, args.baseline)
+            print(f"Recorded {len(versions)} migrations as applied.")
+            return
+        versions = migrate(conn, args.to)
+        print(f"{len(versions)} migrations applied." if versions else "Schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+-- sql/migrations/0001_base_schema.sql
+-- The tables the app reads and writes, as they stood before the numbered
+-- changes that follow. On an existing database this is already in place:
+-- record it with `python scripts/migrate.py --baseline 0001` instead of
+-- running it, then apply 0002 onwards. `games` is the legacy odds table that 0002 folds into
+-- nfl_games; weekly_standings and season_standings are filled by the
+-- standings job outside this repo.
+
+create table if not exists users (
+  id uuid primary key,
+  name text,
+  email text,
+  entry_abbreviation text,
+  is_admin boolean not null default false,
+  created_at timestamptz not null default now()
+);
+
+create table if not exists nfl_teams (
+  id serial primary key,
+  team_name text not null unique,
+  abbrev text not null unique,
+  logo_url text
+);
+
+create table if not exists nfl_games (
+  game_id text primary key,
+  season_year smallint not null,
+  nfl_week smallint,
+  date date,
+  start_time time,
+  away text not null,
+  home text not null,
+  spread real,
+  total real
+);
+
+create table if not exists games (
+  id text primary key,
+  year int,
+  nfl_week int,
+  time text,
+  away_team text,
+  home_team text,
+  spread real,
+  over_under real,
+  locked_at text
+);
+
+create table if not exists picks (
+  id bigserial primary key,
+  user_id uuid not null references users (id) on delete cascade,
+  game_id text not null,
+  type text not null,
+  selection text,
+  over_under_pick text,
+  over_under_total real,
+  is_double boolean not null default false,
+  underdog_points real,
+  week_start date not null,
+  submitted_at timestamptz not null default now(),
+  correct boolean
+);
+
+create table if not exists results (
+  game_id text primary key,
+  home_score int,
+  away_score int,
+  ml_winner text,
+  ats_winner text,
+  ou_result text
+);
+
+create table if not exists weekly_entries (
+  user_id uuid not null references users (id) on delete cascade,
+  week_start date not null,
+  comment text,
+  submitted_at timestamptz not null default now(),
+  primary key (user_id, week_start)
+);
+
+create table if not exists weekly_standings (
+  week_start date not null,
+  entry_abbreviation text not null,
+  rk int,
+  wins int not null default 0,
+  losses int not null default 0,
+  pushes int not null default 0,
+  ats_wins int not null default 0,
+  ou_wins int not null default 0,
+  sd_wins int not null default 0,
+  ud_points real not null default 0,
+  primary key (week_start, entry_abbreviation)
+);
+
+create table if not exists season_standings (
+  entry_abbreviation text primary key,
+  rk int,
+  wins int not null default 0,
+  losses int not null default 0,
+  pushes int not null default 0,
+  win_pct real,
+  ats_wins int not null default 0,
+  ou_wins int not null default 0,
+  ud_points real not null default 0,
+  sd_picks int not null default 0
+);
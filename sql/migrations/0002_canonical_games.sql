@@ -0,0 +1,66 @@
+-- sql/migrations/0002_canonical_games.sql
+-- nfl_games is the one table the odds freeze writes. `spreads` and `games`
+-- become read-only views over it that keep the column names the pages
+-- already query (away_team/away, over_under/total, ...).
+--
+-- Views that referenced the old tables follow the rename; 0004_pick_consensus
+-- and 0011_change_feed (re)create them against the views.
+
+alter table nfl_games add column if not exists kickoff timestamptz;
+alter table nfl_games add column if not exists locked_at timestamptz;
+
+-- Carry over games that only exist in the legacy tables, with team names
+-- resolved to abbreviations once here instead of on every freeze.
+insert into nfl_games (game_id, season_year, nfl_week, kickoff, date, start_time, away, home, spread, total, locked_at)
+select
+  g.id,
+  g.year,
+  g.nfl_week,
+  g.time::timestamptz,
+  (g.time::timestamptz at time zone 'US/Eastern')::date,
+  (g.time::timestamptz at time zone 'US/Eastern')::time,
+  coalesce(ta.abbrev, g.away_team),
+  coalesce(th.abbrev, g.home_team),
+  g.spread,
+  g.over_under,
+  g.locked_at::timestamptz
+from games g
+left join nfl_teams ta on ta.team_name = g.away_team
+left join nfl_teams th on th.team_name = g.home_team
+on conflict (game_id) do nothing;
+
+alter table if exists spreads rename to spreads_legacy;
+alter table if exists games rename to games_legacy;
+
+create or replace view spreads as
+select
+  game_id,
+  game_id as nfl_game_id,
+  season_year,
+  nfl_week,
+  kickoff,
+  date,
+  start_time as time,
+  away as away_team,
+  home as home_team,
+  away,
+  home,
+  spread,
+  total as over_under,
+  total,
+  locked_at
+from nfl_games;
+
+create or replace view games as
+select
+  game_id as id,
+  season_year as year,
+  nfl_week,
+  kickoff as time,
+  date,
+  away as away_team,
+  home as home_team,
+  spread,
+  total as over_under,
+  locked_at
+from nfl_games;
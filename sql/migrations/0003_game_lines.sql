@@ -0,0 +1,45 @@
+-- sql/migrations/0003_game_lines.sql
+-- Line fields derived once at ingest (backend/odds.py line_fields) so the
+-- app reads them instead of re-deriving per render. `spread` stays the away
+-- team's line; home_line is its negation. Run after 0002_canonical_games.sql.
+
+alter table nfl_games
+  add column if not exists favorite text,
+  add column if not exists underdog text,
+  add column if not exists underdog_points real,
+  add column if not exists home_line real,
+  add column if not exists lock_at timestamptz;
+
+-- Backfill rows frozen before these columns existed.
+update nfl_games set
+  favorite = case when spread > 0 then home when spread < 0 then away end,
+  underdog = case when spread > 0 then away when spread < 0 then home end,
+  underdog_points = case when spread <> 0 then abs(spread) end,
+  home_line = -spread,
+  lock_at = kickoff
+where lock_at is null and spread is not null;
+
+-- New columns go last so `create or replace` keeps the existing ones.
+create or replace view spreads as
+select
+  game_id,
+  game_id as nfl_game_id,
+  season_year,
+  nfl_week,
+  kickoff,
+  date,
+  start_time as time,
+  away as away_team,
+  home as home_team,
+  away,
+  home,
+  spread,
+  total as over_under,
+  total,
+  locked_at,
+  favorite,
+  underdog,
+  underdog_points,
+  home_line,
+  lock_at
+from nfl_games;
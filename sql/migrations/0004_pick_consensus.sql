@@ -0,0 +1,23 @@
+-- sql/migrations/0004_pick_consensus.sql
+-- One row per (week, game) with how the pool split on it. The Home board
+-- reads a week's rows in a single request (backend/consensus.py) instead of
+-- scanning every pick per render.
+
+create or replace view pick_consensus as
+select
+  s.nfl_week,
+  s.game_id,
+  s.away_team,
+  s.home_team,
+  count(*) filter (where p.type = 'ATS' and not coalesce(p.is_double, false) and p.selection = s.away_team) as ats_away,
+  count(*) filter (where p.type = 'ATS' and not coalesce(p.is_double, false) and p.selection = s.home_team) as ats_home,
+  count(*) filter (where (p.type = 'BB' or (p.type = 'ATS' and p.is_double)) and p.selection = s.away_team) as bb_away,
+  count(*) filter (where (p.type = 'BB' or (p.type = 'ATS' and p.is_double)) and p.selection = s.home_team) as bb_home,
+  count(*) filter (where p.type in ('OU', 'O/U') and p.over_under_pick = 'O') as ou_over,
+  count(*) filter (where p.type in ('OU', 'O/U') and p.over_under_pick = 'U') as ou_under,
+  count(*) filter (where p.type = 'SD' and p.selection = s.away_team) as sd_away,
+  count(*) filter (where p.type = 'SD' and p.selection = s.home_team) as sd_home,
+  count(*) filter (where p.type = 'UD') as ud
+from spreads s
+left join picks p on p.game_id = s.game_id
+group by s.nfl_week, s.game_id, s.away_team, s.home_team;
@@ -0,0 +1,25 @@
+-- sql/migrations/0005_grade_picks.sql
+-- Grades every pick on the given games against `results` in one statement.
+-- Called once per batch of saved results (backend/grading.py); pushes and
+-- ties leave `correct` null.
+
+create or replace function grade_picks(game_ids text[]) returns integer
+language sql as $$
+  with graded as (
+    update picks p
+    set correct = case
+      when p.type in ('ATS', 'BB') then
+        case when r.ats_winner = 'push' then null else p.selection = r.ats_winner end
+      when p.type in ('OU', 'O/U') then
+        case when r.ou_result = 'Push' then null else p.over_under_pick = r.ou_result end
+      -- Sudden Death survives a tie; Underdog must win outright.
+      when p.type = 'SD' then r.ml_winner is null or p.selection = r.ml_winner
+      when p.type = 'UD' then p.selection = r.ml_winner
+    end
+    from results r
+    where r.game_id = p.game_id
+      and p.game_id = any(game_ids)
+    returning 1
+  )
+  select count(*)::int from graded;
+$$;
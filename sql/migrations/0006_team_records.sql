@@ -0,0 +1,78 @@
+-- sql/migrations/0006_team_records.sql
+-- Season ATS and O/U records per team, one small row per (season, team).
+-- backend/records.py adds per-save deltas through apply_team_record_deltas,
+-- so re-saving a corrected score moves the counts instead of rescanning the
+-- season. rebuild_team_records recomputes a season from scratch (backfill).
+-- 0011_change_feed adds its notify trigger so the board hears about updates.
+
+create table if not exists team_records (
+  season_year smallint not null,
+  team text not null,
+  games smallint not null default 0,
+  ats_w smallint not null default 0,
+  ats_l smallint not null default 0,
+  ats_p smallint not null default 0,
+  ou_o smallint not null default 0,
+  ou_u smallint not null default 0,
+  ou_p smallint not null default 0,
+  margin_sum real not null default 0,  -- points against the line, summed over ATS games
+  primary key (season_year, team)
+);
+
+create or replace function apply_team_record_deltas(deltas jsonb) returns integer
+language sql as $$
+  with d as (
+    select * from jsonb_to_recordset(deltas) as x(
+      season_year smallint, team text, games int,
+      ats_w int, ats_l int, ats_p int, ou_o int, ou_u int, ou_p int, margin_sum real
+    )
+  ), applied as (
+    insert into team_records as t
+      (season_year, team, games, ats_w, ats_l, ats_p, ou_o, ou_u, ou_p, margin_sum)
+    select season_year, team, games, ats_w, ats_l, ats_p, ou_o, ou_u, ou_p, margin_sum from d
+    on conflict (season_year, team) do update set
+      games = t.games + excluded.games,
+      ats_w = t.ats_w + excluded.ats_w,
+      ats_l = t.ats_l + excluded.ats_l,
+      ats_p = t.ats_p + excluded.ats_p,
+      ou_o = t.ou_o + excluded.ou_o,
+      ou_u = t.ou_u + excluded.ou_u,
+      ou_p = t.ou_p + excluded.ou_p,
+      margin_sum = t.margin_sum + excluded.margin_sum
+    returning 1
+  )
+  select count(*)::int from applied;
+$$;
+
+create or replace function rebuild_team_records(season int) returns integer
+language sql as $$
+  delete from team_records where season_year = season;
+  with sides as (
+    select s.season_year, s.away_team as team,
+           r.away_score + s.spread - r.home_score as margin,
+           r.away_score + r.home_score - s.over_under as over
+    from results r join spreads s on s.game_id = r.game_id
+    where s.season_year = season
+    union all
+    select s.season_year, s.home_team,
+           r.home_score - s.spread - r.away_score,
+           r.away_score + r.home_score - s.over_under
+    from results r join spreads s on s.game_id = r.game_id
+    where s.season_year = season
+  ), rebuilt as (
+    insert into team_records
+      (season_year, team, games, ats_w, ats_l, ats_p, ou_o, ou_u, ou_p, margin_sum)
+    select season_year, team, count(*),
+           count(*) filter (where margin > 0),
+           count(*) filter (where margin < 0),
+           count(*) filter (where margin = 0),
+           count(*) filter (where over > 0),
+           count(*) filter (where over < 0),
+           count(*) filter (where over = 0),
+           coalesce(sum(margin), 0)
+    from sides
+    group by season_year, team
+    returning 1
+  )
+  select count(*)::int from rebuilt;
+$$;
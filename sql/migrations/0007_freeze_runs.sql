@@ -0,0 +1,19 @@
+-- sql/migrations/0007_freeze_runs.sql
+-- One row per odds freeze with per-stage timings (backend/freeze.py).
+-- Written only when FREEZE_RUNS_TABLE=1; otherwise reports stay as JSON files.
+
+create table if not exists freeze_runs (
+  id bigserial primary key,
+  started_at timestamptz not null,
+  week int not null,
+  source text not null,
+  total_ms real not null,
+  quota_remaining int,
+  changed int not null default 0,
+  removed int not null default 0,
+  unchanged int not null default 0,
+  stages jsonb not null,
+  errors jsonb not null default '[]'
+);
+
+create index if not exists freeze_runs_started_at on freeze_runs (started_at desc);
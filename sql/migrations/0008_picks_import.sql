@@ -0,0 +1,15 @@
+-- sql/migrations/0008_picks_import.sql
+-- Bulk pick imports (backend/imports.py) and Make Picks' save_pick upsert
+-- on (user_id, game_id, type). The rules already allow one pick of each
+-- type per game, but save_pick used to insert a new row on every rerun, so
+-- existing databases hold duplicates: keep the most recent row of each
+-- (latest submitted_at, then highest id) before creating the index.
+
+delete from picks p
+using picks newer
+where newer.user_id = p.user_id
+  and newer.game_id = p.game_id
+  and newer.type = p.type
+  and (newer.submitted_at, newer.id) > (p.submitted_at, p.id);
+
+create unique index if not exists picks_user_game_type on picks (user_id, game_id, type);
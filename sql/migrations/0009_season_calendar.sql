@@ -0,0 +1,71 @@
+-- sql/migrations/0009_season_calendar.sql
+-- Week starts follow backend/season.py: week N of a season starts on the
+-- opener (the Thursday after Labor Day) plus N-1 weeks. Make Picks used to
+-- stamp the Thursday of ISO week N of the calendar year instead, so week 1
+-- picks landed in January; this moves those rows onto the season calendar.
+-- Keep season_opener in step with backend/season.py OPENERS.
+
+create or replace function season_opener(season int)
+returns date
+language sql immutable
+as $$
+  select (make_date(season, 9, 1)
+          + ((8 - extract(isodow from make_date(season, 9, 1))::int) % 7)  -- Labor Day
+          + 3)::date;
+$$;
+
+create or replace function season_week_start(season int, week int)
+returns date
+language sql immutable
+as $$
+  select season_opener(season) + 7 * (week - 1);
+$$;
+
+-- Season of a timestamp, as season_of in backend/season.py: January and
+-- February (Eastern) belong to the previous season.
+create or replace function season_of(ts timestamptz)
+returns int
+language sql immutable
+as $$
+  select extract(year from ts at time zone 'America/New_York')::int
+         - case when extract(month from ts at time zone 'America/New_York') <= 2 then 1 else 0 end;
+$$;
+
+-- An ISO-week stamp is a Thursday whose ISO week number is the NFL week it
+-- meant, in whatever calendar year the pick was made; the season comes from
+-- submitted_at, since a week 18 pick made in January belongs to the season
+-- that opened the September before. Rows already inside their season's
+-- weeks (opener through week 22) are left alone.
+
+-- weekly_standings is written outside this repo from picks.week_start and
+-- has no submitted_at; rows written before this migration carry the same
+-- ISO dates, so each takes the season of the picks stamped with its date.
+-- This runs first, while picks still hold the old dates.
+update weekly_standings ws
+set week_start = m.new_start
+from (
+  select distinct on (p.week_start)
+         p.week_start as old_start,
+         season_week_start(season_of(p.submitted_at), extract(week from p.week_start)::int) as new_start
+  from picks p
+  where extract(isodow from p.week_start) = 4
+    and extract(week from p.week_start) <= 22
+    and p.week_start not between season_opener(season_of(p.submitted_at))
+                             and season_week_start(season_of(p.submitted_at), 22)
+  order by p.week_start, p.submitted_at
+) m
+where ws.week_start = m.old_start;
+
+update picks
+set week_start = season_week_start(season_of(submitted_at), extract(week from week_start)::int)
+where extract(isodow from week_start) = 4
+  and extract(week from week_start) <= 22
+  and week_start not between season_opener(season_of(submitted_at))
+                         and season_week_start(season_of(submitted_at), 22);
+
+update weekly_entries
+set week_start = season_week_start(season_of(submitted_at), extract(week from week_start)::int)
+where extract(isodow from week_start) = 4
+  and extract(week from week_start) <= 22
+  and week_start not between season_opener(season_of(submitted_at))
+                         and season_week_start(season_of(submitted_at), 22);
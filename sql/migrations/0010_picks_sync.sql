@@ -0,0 +1,71 @@
+-- sql/migrations/0010_picks_sync.sql
+-- Delta sync of picks (backend/picksync.py). Each process keeps the picks
+-- it has seen and asks only for rows changed since its high-water mark.
+--
+-- submitted_at is stamped by the client and grading updates `correct`
+-- without touching it, so changes are tracked by a server-side updated_at
+-- that every insert and update moves. Deletes leave a tombstone in
+-- pick_tombstones; picks itself keeps hard deletes, so the standings
+-- writer and the pick_consensus view need no extra filter.
+-- Run after 0008_picks_import.sql.
+
+alter table picks add column if not exists updated_at timestamptz;
+update picks set updated_at = coalesce(submitted_at, now()) where updated_at is null;
+alter table picks alter column updated_at set default now();
+alter table picks alter column updated_at set not null;
+
+create index if not exists picks_updated_at on picks (updated_at);
+
+create or replace function picks_touch() returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists picks_touch on picks;
+create trigger picks_touch
+  before insert or update on picks
+  for each row execute function picks_touch();
+
+create table if not exists pick_tombstones (
+  id bigint generated always as identity primary key,
+  user_id text not null,
+  game_id text not null,
+  type text not null,
+  deleted_at timestamptz not null default now()
+);
+
+create index if not exists pick_tombstones_deleted_at on pick_tombstones (deleted_at);
+
+create or replace function picks_tombstone() returns trigger
+language plpgsql
+as $$
+begin
+  -- An update that moves a pick to another key removes the old key.
+  if tg_op = 'DELETE'
+     or (old.user_id, old.game_id, old.type) is distinct from (new.user_id, new.game_id, new.type) then
+    insert into pick_tombstones (user_id, game_id, type) values (old.user_id, old.game_id, old.type);
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists picks_tombstone on picks;
+create trigger picks_tombstone
+  after delete or update on picks
+  for each row execute function picks_tombstone();
+
+-- Tombstones only need to outlive the longest gap between syncs; processes
+-- that have not synced for this long reload every pick (PICKS_TOMBSTONE_DAYS).
+-- Schedule it daily, e.g. select cron.schedule('purge-pick-tombstones', '0 9 * * *',
+-- 'select purge_pick_tombstones()');
+create or replace function purge_pick_tombstones(keep interval default interval '7 days')
+returns integer
+language sql
+as $$
+  with gone as (delete from pick_tombstones where deleted_at < now() - keep returning 1)
+  select count(*)::int from gone;
+$$;
@@ -0,0 +1,43 @@
+-- sql/migrations/0011_change_feed.sql
+-- Publishes a NOTIFY on `pool_changes` for every write to the tables the app
+-- caches, so backend/changefeed.py can invalidate just the affected week.
+
+create or replace function pool_notify_change() returns trigger
+language plpgsql as $$
+declare
+  rec jsonb := to_jsonb(coalesce(NEW, OLD));
+  wk int := (rec->>'nfl_week')::int;
+  -- spreads is a view over nfl_games; the app caches it under that name.
+  tbl text := case TG_TABLE_NAME when 'nfl_games' then 'spreads' else TG_TABLE_NAME end;
+begin
+  if wk is null and rec ? 'game_id' then
+    select s.nfl_week into wk from spreads s where s.game_id = rec->>'game_id' limit 1;
+  end if;
+  perform pg_notify('pool_changes', json_build_object(
+    'table', tbl,
+    'op', TG_OP,
+    'week', wk,
+    'week_start', rec->>'week_start'
+  )::text);
+  return null;
+end;
+$$;
+
+do $$
+declare
+  t text;
+begin
+  -- Only base tables take triggers; spreads is watched through nfl_games.
+  for t in
+    select c.relname from pg_class c
+    join pg_namespace n on n.oid = c.relnamespace
+    where n.nspname = 'public' and c.relkind = 'r'
+      and c.relname = any(array['nfl_games', 'spreads', 'picks', 'results', 'weekly_standings', 'season_standings', 'team_records'])
+  loop
+    execute format('drop trigger if exists %I_notify_change on %I', t, t);
+    execute format(
+      'create trigger %I_notify_change after insert or update or delete on %I '
+      'for each row execute function pool_notify_change()', t, t);
+  end loop;
+end;
+$$;
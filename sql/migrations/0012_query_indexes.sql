@@ -0,0 +1,39 @@
+-- sql/migrations/0012_query_indexes.sql
+-- One index per hot read, with its columns in the order the query filters
+-- and sorts. INCLUDE columns make the week-level reads index-only once the
+-- table is vacuumed. scripts/explain_queries.py runs these reads with
+-- EXPLAIN and fails on any sequential scan.
+
+-- spreads (view over nfl_games): .eq("nfl_week", w).order("date").order("time"),
+-- and the latest week with .order("nfl_week", desc=True).limit(1).
+create index if not exists nfl_games_week_date_time on nfl_games (nfl_week, date, start_time);
+
+-- Season calendar and archive: game ids and kickoffs by season_year.
+create index if not exists nfl_games_season_week on nfl_games (season_year, nfl_week) include (game_id, kickoff);
+
+-- Make Picks: one entry's picks and comment for a week.
+create index if not exists picks_user_week on picks (user_id, week_start);
+
+-- pick_consensus and grade_picks join picks on game_id; the board's
+-- consensus counts read only these columns.
+create index if not exists picks_game on picks (game_id) include (type, selection, is_double, over_under_pick);
+
+-- Archive and standings: a season's picks by week_start range.
+create index if not exists picks_week_start on picks (week_start);
+
+-- Board: nfl_teams by abbrev (logos) and by Odds API name (ingest).
+create unique index if not exists nfl_teams_abbrev_logo on nfl_teams (abbrev) include (logo_url);
+create unique index if not exists nfl_teams_name_abbrev on nfl_teams (team_name) include (abbrev);
+
+-- Grid: entries in abbreviation order.
+create index if not exists users_entry_abbreviation on users (entry_abbreviation) include (id);
+
+-- Already covered by primary keys: results (game_id), weekly_standings
+-- (week_start, entry_abbreviation), weekly_entries (user_id, week_start),
+-- team_records (season_year, team); picks (updated_at) and
+-- pick_tombstones (deleted_at) come with 0010_picks_sync.
+
+analyze nfl_games;
+analyze picks;
+analyze nfl_teams;
+analyze users;
@@ -0,0 +1,159 @@
+-- sql/migrations/0013_week_grid.sql
+-- The Home Grid for one week in one RPC: a row per entry with the picked
+-- team or O/U side in each cell, the weekly comment, and `status`, one
+-- character per cell (BB, ATS 1-5, O/U 1-3, SD, UD): W, L, P (push) or
+-- '-' for an empty or ungraded cell, graded as in grade_picks.
+--
+-- Picks are replayed in submitted_at order with the same conflict rules as
+-- PickSlate.from_rows (backend/slate.py), so the cells match the Python
+-- pivot in backend/grid.py; scripts/check_grid.py compares the two.
+
+create or replace function week_grid(week int)
+returns table (
+  entry text,
+  bb text, ats_1 text, ats_2 text, ats_3 text, ats_4 text, ats_5 text,
+  ou_1 text, ou_2 text, ou_3 text, sd text, ud text,
+  comment text,
+  status text
+)
+language plpgsql stable
+as $$
+#variable_conflict use_column
+declare
+  g_ids text[]; g_away text[]; g_home text[]; g_dog text[];
+  r_has boolean[]; r_ats text[]; r_ou text[]; r_ml text[];
+  n int;
+  ws date;
+  u record;
+  p record;
+  ats text[]; ou text[];
+  bb_i int; bb_t text; sd_i int; sd_t text; ud_i int;
+  cells text[]; cell_game int[];
+  i int; c int; k int;
+  typ text; sel text; outcome text; code text; codes text;
+begin
+  -- The week's games in board order, with the underdog as SlateGame derives it.
+  select array_agg(s.game_id order by s.date, s.time, s.game_id),
+         array_agg(s.away_team order by s.date, s.time, s.game_id),
+         array_agg(s.home_team order by s.date, s.time, s.game_id),
+         array_agg(coalesce(s.underdog, case when s.spread > 0 then s.away_team
+                                             when s.spread < 0 then s.home_team end)
+                   order by s.date, s.time, s.game_id),
+         season_week_start(max(s.season_year), week)
+    into g_ids, g_away, g_home, g_dog, ws
+  from spreads s
+  where s.nfl_week = week;
+  n := coalesce(array_length(g_ids, 1), 0);
+
+  select array_agg(r.game_id is not null order by g.ord),
+         array_agg(r.ats_winner order by g.ord),
+         array_agg(r.ou_result order by g.ord),
+         array_agg(r.ml_winner order by g.ord)
+    into r_has, r_ats, r_ou, r_ml
+  from unnest(g_ids) with ordinality as g(game_id, ord)
+  left join results r on r.game_id = g.game_id;
+
+  -- collate "C" sorts like Python's sorted() (entries here, pick ties above).
+  for u in
+    select us.id, us.entry_abbreviation
+    from users us
+    where coalesce(us.entry_abbreviation, '') <> ''
+    order by us.entry_abbreviation collate "C", us.id
+  loop
+    ats := array_fill(null::text, array[greatest(n, 1)]);
+    ou := array_fill(null::text, array[greatest(n, 1)]);
+    bb_i := null; bb_t := null; sd_i := null; sd_t := null; ud_i := null;
+
+    for p in
+      select pk.game_id, pk.type, pk.selection, pk.over_under_pick, pk.is_double
+      from picks pk
+      where pk.user_id = u.id and pk.game_id = any(g_ids)
+      order by pk.submitted_at, pk.game_id collate "C", pk.type collate "C"
+    loop
+      i := array_position(g_ids, p.game_id);
+      typ := case when p.type = 'O/U' then 'OU'
+                  when p.type = 'ATS' and coalesce(p.is_double, false) then 'BB'
+                  else p.type end;
+      if typ = 'OU' then
+        sel := p.over_under_pick;
+        -- The first side taken on a game sticks.
+        if sel in ('O', 'U') and (ou[i] is null or ou[i] = sel) then
+          ou[i] := sel;
+        end if;
+        continue;
+      end if;
+
+      sel := p.selection;
+      if sel is distinct from g_away[i] and sel is distinct from g_home[i] then
+        continue;
+      end if;
+      if typ = 'ATS' then
+        if (ats[i] is null or ats[i] = sel) and bb_i is distinct from i then
+          ats[i] := sel;
+        end if;
+      elsif typ = 'BB' then
+        if ats[i] is null then
+          bb_i := i; bb_t := sel;
+        end if;
+      elsif typ = 'SD' then
+        sd_i := i; sd_t := sel;
+      elsif typ = 'UD' then
+        if g_dog[i] = sel then
+          ud_i := i;
+        end if;
+      end if;
+    end loop;
+
+    -- Cells 1 BB, 2-6 ATS, 7-9 O/U, 10 SD, 11 UD, each with its game index.
+    cells := array_fill(null::text, array[11]);
+    cell_game := array_fill(null::int, array[11]);
+    cells[1] := bb_t; cell_game[1] := bb_i;
+    k := 0;
+    for i in 1..n loop
+      if ats[i] is not null then
+        k := k + 1;
+        if k <= 5 then cells[1 + k] := ats[i]; cell_game[1 + k] := i; end if;
+      end if;
+    end loop;
+    k := 0;
+    for i in 1..n loop
+      if ou[i] is not null then
+        k := k + 1;
+        if k <= 3 then cells[6 + k] := ou[i]; cell_game[6 + k] := i; end if;
+      end if;
+    end loop;
+    cells[10] := sd_t; cell_game[10] := sd_i;
+    if ud_i is not null then cells[11] := g_dog[ud_i]; cell_game[11] := ud_i; end if;
+
+    codes := '';
+    for c in 1..11 loop
+      i := cell_game[c];
+      code := '-';
+      if cells[c] is not null and r_has[i] then
+        if c = 10 then
+          -- Sudden Death survives a tie; Underdog must win outright.
+          code := case when r_ml[i] is null or r_ml[i] = cells[c] then 'W' else 'L' end;
+        elsif c = 11 then
+          code := case when r_ml[i] is null then '-' when r_ml[i] = cells[c] then 'W' else 'L' end;
+        else
+          outcome := case when c between 7 and 9 then r_ou[i] else r_ats[i] end;
+          code := case when outcome is null then '-'
+                       when outcome in ('push', 'Push') then 'P'
+                       when outcome = cells[c] then 'W' else 'L' end;
+        end if;
+      end if;
+      codes := codes || code;
+    end loop;
+
+    entry := u.entry_abbreviation;
+    bb := cells[1];
+    ats_1 := cells[2]; ats_2 := cells[3]; ats_3 := cells[4]; ats_4 := cells[5]; ats_5 := cells[6];
+    ou_1 := cells[7]; ou_2 := cells[8]; ou_3 := cells[9];
+    sd := cells[10];
+    ud := cells[11];
+    comment := (select we.comment from weekly_entries we where we.user_id = u.id and we.week_start = ws);
+    status := codes;
+    return next;
+  end loop;
+end;
+$$;
@@ -0,0 +1,8 @@
+-- sql/migrations/0014_users_change_feed.sql
+-- New and renamed entries show up in the Grid and Projections, which cache
+-- the users table, as soon as they are written (pool_notify_change is in
+-- 0011_change_feed.sql).
+
+drop trigger if exists users_notify_change on users;
+create trigger users_notify_change after insert or update or delete on users
+for each row execute function pool_notify_change();
@@ -0,0 +1,6 @@
+-- sql/migrations/0015_line_frozen_at.sql
+-- Set when scripts/freeze_scheduler.py freezes a game's line shortly
+-- before kickoff. Full freezes (admin button, cron) skip games that have
+-- it, so they no longer overwrite or prune the scheduler's lines.
+
+alter table nfl_games add column if not exists line_frozen_at timestamptz;
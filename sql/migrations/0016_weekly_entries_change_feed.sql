@@ -0,0 +1,8 @@
+-- sql/migrations/0016_weekly_entries_change_feed.sql
+-- Weekly comments are a Grid column, so saving one drops that week's cached
+-- grid (pool_notify_change is in 0011_change_feed.sql; the event carries
+-- week_start only and backend/changefeed.py maps it to the week number).
+
+drop trigger if exists weekly_entries_notify_change on weekly_entries;
+create trigger weekly_entries_notify_change after insert or update or delete on weekly_entries
+for each row execute function pool_notify_change();
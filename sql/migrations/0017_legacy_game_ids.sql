@@ -0,0 +1,52 @@
+-- sql/migrations/0017_legacy_game_ids.sql
+-- The freeze used to key nfl_games by a constructed id (2025-01-dal-phi);
+-- it now uses the Odds API event id, which the score ingest and the freeze
+-- scheduler match on. When the feed brings a game that is still stored
+-- under its constructed id, adopt_legacy_game_ids moves its picks and
+-- result onto the event id and drops the legacy row, so the game is not
+-- listed twice. backend/odds.py apply_game_diff calls it after each write;
+-- past games the feed no longer lists keep their constructed ids.
+
+-- Legacy rows predate kickoff; derive it so pruning can tell played games.
+update nfl_games
+set kickoff = (date + start_time) at time zone 'US/Eastern'
+where kickoff is null and date is not null and start_time is not null;
+
+create or replace function adopt_legacy_game_ids(week int default null)
+returns integer
+language plpgsql as $$
+declare
+  m record;
+  moved int := 0;
+begin
+  for m in
+    select l.game_id as old_id, n.game_id as new_id
+    from nfl_games l
+    join nfl_games n
+      on n.season_year = l.season_year and n.nfl_week = l.nfl_week
+     and upper(n.away) = upper(l.away) and upper(n.home) = upper(l.home)
+     and n.game_id !~ '^[0-9]{4}-[0-9]{2}-[a-z]+-[a-z]+$'
+    where l.game_id ~ '^[0-9]{4}-[0-9]{2}-[a-z]+-[a-z]+$'
+      and (adopt_legacy_game_ids.week is null or l.nfl_week = adopt_legacy_game_ids.week)
+  loop
+    -- A pick already made on the event id wins over the legacy one.
+    delete from picks p
+    using picks q
+    where p.game_id = m.old_id and q.game_id = m.new_id
+      and q.user_id = p.user_id and q.type = p.type;
+    update picks set game_id = m.new_id where game_id = m.old_id;
+
+    if exists (select 1 from results r where r.game_id = m.new_id) then
+      delete from results where game_id = m.old_id;
+    else
+      update results set game_id = m.new_id where game_id = m.old_id;
+    end if;
+
+    delete from nfl_games where game_id = m.old_id;
+    moved := moved + 1;
+  end loop;
+  return moved;
+end;
+$$;
+
+select adopt_legacy_game_ids();
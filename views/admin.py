@@ -1,8 +1,22 @@
 import os
 import pandas as pd
 import streamlit as st
-from backend.odds import fetch_odds, upsert_games
-from backend.db import supa
+from backend.odds import upsert_games
+from backend.cache import stats as cache_stats
+from backend.db import read, read_health, supa
+from backend.changefeed import change_feed
+from backend.export import export_season
+from backend.freeze import recent_runs, stage_trends
+from backend.frames import cached_frames, memory_report
+from backend.profiler import PROFILE_DIR, top_functions
+from backend.season import current_season, current_week
+from backend.grading import grade_results, merge_scores, parse_scores_csv, save_results, validate_scores
+
+def discard_export():
+    """Delete the temp zip from the last Build Export; its bytes are already handed to the download."""
+    export = st.session_state.pop("export", None)
+    if export and os.path.exists(export["path"]):
+        os.remove(export["path"])
 
 def render():
     st.title("Admin")
@@ -13,23 +27,24 @@ def render():
 
     client = supa()
 
-    year = int(os.environ.get("DEFAULT_YEAR", "2025"))
-    week = st.number_input("NFL Week", min_value=1, max_value=22, value=int(os.environ.get("NFL_WEEK", "1")))
+    year = int(os.environ.get("DEFAULT_YEAR", current_season()))
+    week = st.number_input("NFL Week", min_value=1, max_value=22, value=int(os.environ.get("NFL_WEEK", current_week())))
 
     st.subheader("Odds Control")
     if st.button("Fetch & Freeze Odds (now)"):
-        data = fetch_odds()
-        upsert_games(year, int(week), data, freeze=True)
-        st.success("Frozen odds inserted into Supabase.")
+        report = upsert_games(int(week))
+        st.success(f"Froze week {int(week)}: {report['changed']} changed, {report['removed']} removed, "
+                   f"{report['unchanged']} unchanged in {report['total_ms']:.0f} ms.")
+        st.dataframe(pd.DataFrame(report["stages"]), hide_index=True, use_container_width=True)
+        for err in report["errors"]:
+            st.warning(err)
 
         # Preview what was just inserted
-        games = client.table("games") \
-            .select("date, time, away_team, home_team, spread, over_under") \
-            .eq("year", year) \
-            .eq("nfl_week", int(week)) \
-            .order("date") \
-            .order("time") \
-            .execute().data
+        games = read(client.table("spreads")
+                     .select("date, time, away_team, home_team, spread, over_under, favorite, underdog, underdog_points, home_line")
+                     .eq("nfl_week", int(week))
+                     .order("date")
+                     .order("time")).data
 
         if games:
             st.subheader("This Week's Games (from DB)")
@@ -42,66 +57,122 @@ def render():
 
     st.divider()
 
-    st.subheader("Results Editor (MVP)")
+    st.subheader("Season Export")
+    fmt = st.radio("Format", ["csv", "parquet"], horizontal=True, key="export_fmt")
+    if st.button("Build Export"):
+        discard_export()
+        with st.spinner("Exporting picks, results, spreads and standings..."):
+            path, counts = export_season(fmt)
+        st.session_state["export"] = {"path": path, "fmt": fmt}
+        st.caption(", ".join(f"{t}: {n} rows" for t, n in counts.items()))
+    export = st.session_state.get("export")
+    if export and os.path.exists(export["path"]):
+        with open(export["path"], "rb") as f:
+            st.download_button(
+                "Download Export",
+                f,
+                file_name=f"nfl_pool_{year}_{export['fmt']}.zip",
+                mime="application/zip",
+                on_click=discard_export,
+            )
+
+    st.divider()
+
+    st.subheader("Freeze Runs")
+    trends = stage_trends(recent_runs())
+    if trends.empty:
+        st.caption("No freeze runs recorded yet.")
+    else:
+        stage_cols = [c for c in trends.columns if c.endswith("_ms") and c != "total_ms"]
+        st.bar_chart(trends.set_index("started_at")[stage_cols])
+        st.dataframe(trends.iloc[::-1], hide_index=True, use_container_width=True)
+
+    st.divider()
+
+    st.subheader("Rerun Profiler")
+    st.toggle("Profile my session's reruns", key="profile_reruns")
+    functions, runs = top_functions()
+    if functions:
+        st.caption(f"{len(runs)} recent profiled reruns; collapsed stacks saved under {PROFILE_DIR}/")
+        st.dataframe(pd.DataFrame(functions), hide_index=True, use_container_width=True)
+    else:
+        st.caption("No profiled reruns yet.")
+
+    st.divider()
+
+    st.subheader("Database Health")
+    health = {**read_health(), **cache_stats}
+    st.dataframe(pd.DataFrame([health]), hide_index=True, use_container_width=True)
+
+    st.divider()
+
+    st.subheader("Shared Data Memory")
+    sessions = st.number_input("Concurrent sessions", min_value=1, value=300, step=50)
+    report = memory_report(cached_frames(), int(sessions))
+    if report.empty:
+        st.caption("No shared frames cached yet; open the Home tab first.")
+    else:
+        st.dataframe(report, hide_index=True, use_container_width=True)
+
+    st.divider()
+
+    st.subheader("Results Editor")
     client = supa()
-    games = client.table("games").select("*").eq("year", year).eq("nfl_week", int(week)).execute().data
+    games = read(client.table("spreads")
+                 .select("game_id, season_year, date, time, away_team, home_team, spread, over_under")
+                 .eq("nfl_week", int(week))
+                 .order("date")
+                 .order("time")).data
     if not games:
         st.info("No games found for this week.")
         return
 
-    # Pick a game to score
-    game_map = {f'{g["away_team"]} @ {g["home_team"]} ({g["date"]})': g for g in games}
-    picked = st.selectbox("Select game", list(game_map.keys()))
-    g = game_map[picked]
-
-    col1, col2 = st.columns(2)
-    with col1:
-        away_score = st.number_input(
-            f'{g["away_team"]} score',
-            min_value=0,
-            step=1,
-            key=f"away_{g['id']}_{g['away_team']}"
+    # Prefill with any results already saved for the week
+    games_df = pd.DataFrame(games)
+    saved = read(client.table("results")
+                 .select("game_id, away_score, home_score")
+                 .in_("game_id", games_df["game_id"].tolist())).data
+    saved_df = pd.DataFrame(saved, columns=["game_id", "away_score", "home_score"])
+    games_df = games_df.merge(saved_df, on="game_id", how="left")
+
+    entry_mode = st.radio("Entry", ["Table", "Paste CSV"], horizontal=True, key="results_entry_mode")
+    if entry_mode == "Table":
+        edited = st.data_editor(
+            games_df,
+            hide_index=True,
+            use_container_width=True,
+            disabled=["game_id", "date", "time", "away_team", "home_team", "spread", "over_under"],
+            column_config={
+                "season_year": None,
+                "away_score": st.column_config.NumberColumn("Away Score", min_value=0, step=1),
+                "home_score": st.column_config.NumberColumn("Home Score", min_value=0, step=1),
+            },
+            key=f"results_editor_{week}",
         )
-    with col2:
-        home_score = st.number_input(
-            f'{g["home_team"]} score',
-            min_value=0,
-            step=1,
-            key=f"home_{g['id']}_{g['home_team']}"
+    else:
+        pasted = st.text_area(
+            "Paste scores (away_team,home_team,away_score,home_score or game_id,away_score,home_score)",
+            key="results_csv",
         )
-
-    if st.button("Save Result"):
-        # Compute basic O/U and ATS winners (MVP logic)
-        total = int(away_score) + int(home_score)
-        ou_res = "Push"
-        if g.get("over_under") is not None:
-            if total > float(g["over_under"]):
-                ou_res = "O"
-            elif total < float(g["over_under"]):
-                ou_res = "U"
-
-        ml_winner = None
-        if away_score > home_score:
-            ml_winner = g["away_team"]
-        elif home_score > away_score:
-            ml_winner = g["home_team"]
-
-        ats_winner = "push"
-        if g.get("spread") is not None:
-            # MVP note: we don't assume which side the spread favors; a full solution should store favorite & line
-            # For display only; proper ATS calc will be in scoring.py later.
-            ats_winner = "home/away (calc in scoring)"
-
-        # Upsert into results
-        client.table("results").upsert({
-            "game_id": g["id"],
-            "home_score": int(home_score),
-            "away_score": int(away_score),
-            "ml_winner": ml_winner,
-            "ats_winner": ats_winner,
-            "ou_result": ou_res
-        }).execute()
-
-        st.success("Result saved (MVP). Scoring/leaderboards next.")
-        st.rerun()
-
+        edited = games_df
+        if pasted.strip():
+            try:
+                edited = merge_scores(games_df, parse_scores_csv(pasted))
+            except ValueError as e:
+                st.error(str(e))
+            st.dataframe(edited, hide_index=True, use_container_width=True)
+
+    if st.button("Save All Results"):
+        errors = validate_scores(edited)
+        if errors:
+            for err in errors:
+                st.error(err)
+            return
+        results = grade_results(edited)
+        if results.empty:
+            st.info("No scores entered.")
+            return
+        save_results(results, edited)
+        change_feed().publish("results", week=int(week))
+        change_feed().publish("team_records")
+        st.success(f"Saved and graded {len(results)} games.")
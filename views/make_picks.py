@@ -1,8 +1,12 @@
-from backend.odds import fetch_spreads, get_team_logo, get_current_nfl_week
+from backend.odds import fetch_spreads, get_team_logo
 import os
 import datetime
 import streamlit as st
 from supabase import create_client
+from backend.changefeed import change_feed
+from backend.db import read
+from backend.season import calendar, current_week
+from backend.slate import PickSlate
 
 # Connect to Supabase
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -10,23 +14,16 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # ----------------- Helpers -----------------
-def get_current_nfl_week():
-    today = datetime.datetime.utcnow().date()
-    season_start = datetime.date(2025, 9, 4)  # kickoff
-    delta_days = (today - season_start).days
-    return max(1, delta_days // 7 + 1)
-
 def fetch_spreads(week):
-    data = supabase.table("spreads") \
-        .select("game_id, date, time, away_team, home_team, spread, over_under") \
-        .eq("nfl_week", week) \
-        .order("date") \
-        .order("time") \
-        .execute()
+    data = read(supabase.table("spreads")
+                .select("game_id, date, time, away_team, home_team, spread, over_under, underdog, underdog_points, lock_at")
+                .eq("nfl_week", week)
+                .order("date")
+                .order("time"))
     return data.data or []
 
 def get_team_logo(team_abbrev):
-    row = supabase.table("nfl_teams").select("logo_url").eq("abbrev", team_abbrev).execute()
+    row = read(supabase.table("nfl_teams").select("logo_url").eq("abbrev", team_abbrev))
     if row.data and row.data[0]["logo_url"]:
         return row.data[0]["logo_url"]
     return None
@@ -34,7 +31,7 @@ def get_team_logo(team_abbrev):
 def save_pick(user_id, game_id, pick_type, selection, week,
               over_under_pick=None, is_double=False, underdog_points=None,
               over_under_total=None):
-    week_start = datetime.date.fromisocalendar(datetime.date.today().year, week, 4)
+    week_start = calendar().week_start(week)
     supabase.table("picks").upsert({
         "user_id": user_id,
         "game_id": game_id,
@@ -46,7 +43,8 @@ def save_pick(user_id, game_id, pick_type, selection, week,
         "underdog_points": underdog_points,
         "week_start": week_start.isoformat(),
         "submitted_at": datetime.datetime.now(datetime.timezone.utc).isoformat()
-    }).execute()
+    }, on_conflict="user_id,game_id,type").execute()
+    change_feed().publish("picks", week=week, week_start=week_start.isoformat())
 
 def delete_pick(user_id, game_id, pick_type, selection=None):
     q = supabase.table("picks").delete() \
@@ -56,6 +54,14 @@ def delete_pick(user_id, game_id, pick_type, selection=None):
     if selection:
         q = q.eq("selection", selection)
     q.execute()
+    change_feed().publish("picks", op="DELETE")
+
+def allow_pick(slate, pick_type, idx, selection, now):
+    """Check a toggle against the pick rules before it is written."""
+    ok, msg = slate.add(pick_type, idx, selection, now=now)
+    if not ok:
+        st.warning(msg)
+    return ok
 
 # ----------------- UI -----------------
 def render():
@@ -81,8 +87,8 @@ def render():
     user_id = st.session_state["user"]["id"]
 
     # Week selector
-    current_week = get_current_nfl_week()
-    weeks = [w for w in [current_week, current_week - 1] if w >= 1]
+    this_week = current_week()
+    weeks = [w for w in [this_week, this_week - 1] if w >= 1]
     week = st.selectbox("Select Week", weeks, index=0, key="makepicks_week_selector")
 
     spreads = fetch_spreads(week)
@@ -90,11 +96,10 @@ def render():
         st.warning("No games found for this week.")
         return
 
-    picks = supabase.table("picks").select(
-        "*, games(away_abbrev, home_abbrev)"
-    ).eq("user_id", user_id) \
-     .eq("week_start", datetime.date.fromisocalendar(datetime.date.today().year, week, 4)) \
-     .execute().data
+    picks = read(supabase.table("picks").select("*").eq("user_id", user_id)
+                 .eq("week_start", calendar().week_start(week).isoformat())).data
+    slate = PickSlate.from_rows(spreads, picks)
+    now = datetime.datetime.now(datetime.timezone.utc)
 
     # Summary
     st.subheader("Your Picks Summary")
@@ -109,8 +114,9 @@ def render():
                     if p["type"] == "O/U":
                         ou_pick = p.get("over_under_pick", "")
                         total = p.get("over_under_total", "")
-                        away = p.get("games", {}).get("away_abbrev", "?")
-                        home = p.get("games", {}).get("home_abbrev", "?")
+                        idx = slate.index_of(p["game_id"])
+                        away = slate.games[idx].away if idx is not None else "?"
+                        home = slate.games[idx].home if idx is not None else "?"
                         st.markdown(
                             f"<div style='text-align:center'>{away} {home} {ou_pick} {total}</div>",
                             unsafe_allow_html=True
@@ -118,7 +124,7 @@ def render():
             else:
                 logos = []
                 for p in picks:
-                    if (pick_type == "BB" and p["is_double"]) or (p["type"] == pick_type):
+                    if (p["is_double"] if pick_type == "BB" else p["type"] == pick_type and not p["is_double"]):
                         logo = get_team_logo(p["selection"])
                         if logo:
                             logos.append(f"<img src='{logo}' style='height:24px; margin-right:4px;'/>")
@@ -136,10 +142,10 @@ def render():
     """, unsafe_allow_html=True)
 
     # Game rows
-    for game in spreads:
+    for idx, game in enumerate(spreads):
         game_id = game["game_id"]
-        game_dt = datetime.datetime.fromisoformat(f"{game['date']}T{game['time']}")
-        is_locked = datetime.datetime.now(datetime.timezone.utc) > game_dt.astimezone(datetime.timezone.utc)
+        lock_at = slate.games[idx].lock_at
+        is_locked = lock_at is not None and now >= lock_at
 
         cols = st.columns([1, 2, 1, 2, 2, 1, 1])
 
@@ -147,9 +153,10 @@ def render():
         with cols[0]:
             bb_key = f"bb_{game_id}"
             bb_selected = st.toggle("⭐", key=bb_key)
-            if bb_selected:
+            if bb_selected and allow_pick(slate, "BB", idx, game["home_team"], now):
                 save_pick(user_id, game_id, "ATS", game["home_team"], week, is_double=True)
-            else:
+            elif not bb_selected and slate.bb == idx:
+                slate.remove("BB", idx)
                 delete_pick(user_id, game_id, "ATS", game["home_team"])
 
         if is_locked:
@@ -163,9 +170,10 @@ def render():
         with cols[1]:
             away_key = f"away_{game_id}"
             away_selected = st.toggle(game["away_team"], key=away_key)
-            if away_selected:
+            if away_selected and allow_pick(slate, "ATS", idx, game["away_team"], now):
                 save_pick(user_id, game_id, "ATS", game["away_team"], week)
-            else:
+            elif not away_selected and slate.ats[idx] == 1:
+                slate.remove("ATS", idx)
                 delete_pick(user_id, game_id, "ATS", game["away_team"])
 
         # Spread
@@ -176,9 +184,10 @@ def render():
         with cols[3]:
             home_key = f"home_{game_id}"
             home_selected = st.toggle(game["home_team"], key=home_key)
-            if home_selected:
+            if home_selected and allow_pick(slate, "ATS", idx, game["home_team"], now):
                 save_pick(user_id, game_id, "ATS", game["home_team"], week)
-            else:
+            elif not home_selected and slate.ats[idx] == 2:
+                slate.remove("ATS", idx)
                 delete_pick(user_id, game_id, "ATS", game["home_team"])
 
         # O/U toggles
@@ -187,54 +196,47 @@ def render():
             with ou_cols[0]:
                 over_key = f"over_{game_id}"
                 over_selected = st.toggle(f"O {game['over_under']}", key=over_key)
-                if over_selected:
+                if over_selected and allow_pick(slate, "OU", idx, "O", now):
                     save_pick(user_id, game_id, "O/U", "O", week, over_under_pick="O", over_under_total=game["over_under"])
-                else:
+                elif not over_selected and slate.ou[idx] == 1:
+                    slate.remove("OU", idx)
                     delete_pick(user_id, game_id, "O/U", "O")
             with ou_cols[1]:
                 under_key = f"under_{game_id}"
                 under_selected = st.toggle(f"U {game['over_under']}", key=under_key)
-                if under_selected:
+                if under_selected and allow_pick(slate, "OU", idx, "U", now):
                     save_pick(user_id, game_id, "O/U", "U", week, over_under_pick="U", over_under_total=game["over_under"])
-                else:
+                elif not under_selected and slate.ou[idx] == 2:
+                    slate.remove("OU", idx)
                     delete_pick(user_id, game_id, "O/U", "U")
 
         # SD toggle
         with cols[5]:
             sd_key = f"sd_{game_id}"
             sd_selected = st.toggle("💀", key=sd_key)
-            if sd_selected:
+            if sd_selected and allow_pick(slate, "SD", idx, game["home_team"], now):
                 save_pick(user_id, game_id, "SD", game["home_team"], week)
-            else:
+            elif not sd_selected and slate.sd == idx:
+                slate.remove("SD", idx)
                 delete_pick(user_id, game_id, "SD", game["home_team"])
 
         # UD toggle
         with cols[6]:
-            underdog = None
-            underdog_points = None
-            try:
-                spread_val = float(game["spread"])
-                if spread_val > 0:
-                    underdog = game["away_team"]
-                    underdog_points = spread_val
-                elif spread_val < 0:
-                    underdog = game["home_team"]
-                    underdog_points = abs(spread_val)
-            except:
-                pass
+            underdog, underdog_points = slate.games[idx].underdog
             if underdog:
                 ud_key = f"ud_{game_id}"
                 ud_selected = st.toggle("🐶", key=ud_key)
-                if ud_selected:
+                if ud_selected and allow_pick(slate, "UD", idx, underdog, now):
                     save_pick(user_id, game_id, "UD", underdog, week, underdog_points=underdog_points)
-                else:
+                elif not ud_selected and slate.ud == idx:
+                    slate.remove("UD", idx)
                     delete_pick(user_id, game_id, "UD", underdog)
 
     # Weekly Comment
     st.divider()
     st.subheader("Weekly Comment")
-    week_start = datetime.date.fromisocalendar(datetime.date.today().year, week, 4)
-    existing = supabase.table("weekly_entries").select("comment").eq("user_id", user_id).eq("week_start", week_start).execute().data
+    week_start = calendar().week_start(week)
+    existing = read(supabase.table("weekly_entries").select("comment").eq("user_id", user_id).eq("week_start", week_start.isoformat())).data
     existing_comment = existing[0]["comment"] if existing else ""
     comment = st.text_area("Add a comment for this week", value=existing_comment, key="weekly_comment")
     if st.button("Save Comment"):
@@ -244,4 +246,5 @@ def render():
             "comment": comment,
             "submitted_at": datetime.datetime.now(datetime.timezone.utc).isoformat()
         }).execute()
+        change_feed().publish("weekly_entries", week=week, week_start=week_start.isoformat())
         st.success("Comment saved!")
@@ -1,4 +1,6 @@
 import streamlit as st
+from backend.auth import save_session
+from backend.changefeed import change_feed
 from backend.db import supa
 
 def render():
@@ -26,6 +28,7 @@ def render():
             updates["email"] = email
 
         client.table("users").update(updates).eq("id", user["id"]).execute()
+        change_feed().publish("users")
 
         # TODO: update password via supabase.auth.update_user (needs a logged-in session token)
         if new_pw:
@@ -34,4 +37,5 @@ def render():
         # Refresh session user
         row = client.table("users").select("*").eq("id", user["id"]).single().execute().data
         st.session_state["user"] = row
+        save_session()
         st.success("Profile updated.")
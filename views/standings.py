@@ -1,21 +1,42 @@
 import streamlit as st
 import pandas as pd
-from supabase import create_client
-import os
+from backend.cache import cached
+from backend.archive import archived_seasons, read_archive
+from backend.db import read_all
 
-# Initialize Supabase client
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+@cached("season_standings")
+def fetch_season_standings():
+    return read_all(
+        "season_standings",
+        "rk, entry_abbreviation, wins, losses, pushes, win_pct, ats_wins, ou_wins, ud_points, sd_picks",
+    )
+
+
+@cached("weekly_standings")
+def fetch_weekly_standings():
+    return read_all(
+        "weekly_standings",
+        "week_start, rk, entry_abbreviation, wins, losses, pushes, ats_wins, ou_wins, sd_wins, ud_points",
+    )
 
 
 def render():
     st.title("Standings")
 
+    # Past seasons are read from the Parquet archive, not the live tables
+    seasons = archived_seasons()
+    season = "Current"
+    if seasons:
+        season = st.selectbox("Season", ["Current"] + seasons, key="standings_season_selector")
+
     # --- Season Standings ---
-    season_res = supabase.table("season_standings").select("*").execute()
-    season_data = season_res.data or []
-    season_df = pd.DataFrame(season_data)
+    if season == "Current":
+        season_df = pd.DataFrame(fetch_season_standings())
+        weekly_df = pd.DataFrame(fetch_weekly_standings())
+    else:
+        season_df = read_archive("season_standings", season)
+        weekly_df = read_archive("weekly_standings", season)
 
     st.subheader("Season Standings")
 
@@ -36,10 +57,6 @@ def render():
         )
 
     # --- Weekly Standings ---
-    weekly_res = supabase.table("weekly_standings").select("*").execute()
-    weekly_data = weekly_res.data or []
-    weekly_df = pd.DataFrame(weekly_data)
-
     st.subheader("Weekly Standings")
 
     if weekly_df.empty:
@@ -62,3 +79,18 @@ def render():
             hide_index=True,
             use_container_width=True,
         )
+
+    # --- Archived picks ---
+    if season != "Current":
+        st.subheader("Picks")
+        picks_df = read_archive("picks", season)
+        if picks_df.empty:
+            st.info("No picks archived for this season.")
+        else:
+            weeks = sorted(picks_df["week_start"].astype(str).unique(), reverse=True)
+            picked_week = st.selectbox("Week", weeks, key="archive_picks_week")
+            st.dataframe(
+                picks_df[picks_df["week_start"].astype(str) == picked_week],
+                hide_index=True,
+                use_container_width=True,
+            )